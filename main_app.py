@@ -5,23 +5,24 @@
 # Potens.dev API 키가 만료되어 Gemini API 키로 교체하기 위해 수정되었습니다.
 
 import streamlit as st
-import pandas as pd
-import streamlit.components.v1 as components
 import os
 from dotenv import load_dotenv
-from loguru import logger # 로깅을 위해 필요
 
-# --- 페이지 함수 임포트 (modules 디렉토리에서 직접 임포트) ---
-from modules.landing_page import landing_page
-from modules.trend_analysis_page import trend_analysis_page
-from modules.document_analysis_page import document_analysis_page
-from modules.report_automation_page import report_automation_page # 새로 추가: 보고서 자동화 페이지
+# --- 페이지 함수는 해당 페이지로 처음 이동할 때 임포트 ---
+# 문서 분석(langchain, 임베딩 모델, FAISS), 트렌드 분석(konlpy/JVM, altair) 등 페이지마다 무거운 의존성이 달라
+# 앱 시작 시 모두 임포트하면 랜딩 페이지만 보는 경우에도 시작 시간과 워커당 메모리가 크게 늘어납니다.
+# 한 번 임포트된 모듈은 sys.modules에 캐시되므로 이후 rerun에서는 비용이 없습니다.
 
 
 # --- 환경 변수 로드 (앱 시작 시 한 번만) ---
 load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY") # Potens API 키 대신 Gemini API 키를 로드하도록 변경
 
+# EMBEDDING_WARMUP=1이면 문서 분석용 임베딩 모델을 백그라운드에서 미리 로드 (프로세스당 한 번, 앱 시작은 막지 않음)
+# embedding_models는 임포트 시 EMBEDDING_* 환경 변수를 읽으므로 load_dotenv() 뒤에 임포트
+from modules import embedding_models
+embedding_models.start_background_warmup()
+
 
 # --- 메인 애플리케이션 라우팅 ---
 def main_app():
@@ -40,12 +41,16 @@ def main_app():
 
     # 라우팅 로직 (로그인 검사 없이 바로 페이지 호출)
     if st.session_state.page == "landing":
+        from modules.landing_page import landing_page
         landing_page() # modules/landing_page.py의 함수 호출
     elif st.session_state.page == "trend":
+        from modules.trend_analysis_page import trend_analysis_page
         trend_analysis_page() # modules/trend_analysis_page.py의 함수 호출
     elif st.session_state.page == "document":
+        from modules.document_analysis_page import document_analysis_page
         document_analysis_page() # modules/document_analysis_page.py의 함수 호출
     elif st.session_state.page == "automation": # 새로 추가: 자동화 페이지 라우팅
+        from modules.report_automation_page import report_automation_page
         report_automation_page() # modules/report_automation_page.py의 함수 호출
     else:
         st.session_state.page = "landing" # 알 수 없는 페이지 상태일 경우 랜딩 페이지로 리다이렉트
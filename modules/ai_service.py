@@ -1,13 +1,12 @@
 # modules/ai_service.py
 
+import hashlib
 import json
 import re
 import time
 from typing import List, Dict, Any
-import streamlit as st # Streamlit의 st.error, st.warning 등을 사용하기 위해 임시로 import.
-                        # 실제 프로덕션에서는 이 로깅 부분을 다른 방식으로 처리하는 것이 좋습니다.
+from loguru import logger
 from modules import database_manager # database_manager 모듈 임포트
-from datetime import datetime # datetime 모듈 임포트 (중간 요약 배치 ID 생성에 사용)
 
 def call_gemini_api_raw(prompt_message: str, api_key: str, response_schema=None, model: str = "gemini-2.5-flash-preview-05-20") -> dict:
     """
@@ -88,10 +87,10 @@ def retry_ai_call(prompt: str, api_key: str, response_schema=None, max_retries:
         else:
             error_msg = response_dict.get("error", "알 수 없는 오류")
             if attempt < max_retries - 1:
-                st.warning(f"🚨 AI 호출 실패 (시도 {attempt + 1}/{max_retries}): {error_msg}. {delay_seconds}초 후 재시도합니다.")
+                logger.warning(f"AI 호출 실패 (시도 {attempt + 1}/{max_retries}): {error_msg}. {delay_seconds}초 후 재시도합니다.")
                 time.sleep(delay_seconds)
             else:
-                st.error(f"🚨 AI 호출 최종 실패: {error_msg}. 더 이상 재시도하지 않습니다.")
+                logger.error(f"AI 호출 최종 실패: {error_msg}. 더 이상 재시도하지 않습니다.")
                 return {"error": f"AI 호출 최종 실패: {error_msg}"}
     return {"error": "AI 응답을 가져오는 데 최종 실패했습니다. 나중에 다시 시도해주세요."}
 
@@ -144,10 +143,13 @@ def get_relevant_keywords(trending_keywords_data: list[dict], perspective: str,
     else:
         return [] # 오류 발생 시 빈 리스트 반환
 
-def _summarize_text_batch(texts: list[str], api_key: str, batch_size: int = 3, level: int = 1, current_batch_prefix: str = "") -> list[str]:
+BATCH_SUMMARY_FAILURE_PREFIX = "배치 요약 실패"
+
+def _summarize_text_batch(texts: list[str], api_key: str, batch_size: int = 3, level: int = 1, current_batch_prefix: str = "", run_id: str | None = None) -> list[str]:
     """
     텍스트 리스트를 배치 단위로 나누어 요약하고, 그 요약문들을 반환합니다.
     필요시 재귀적으로 요약을 수행하여 최종적으로 하나의 요약문 리스트를 만듭니다.
+    run_id가 주어지면 같은 실행에서 같은 입력으로 이미 저장된 배치 요약은 AI를 다시 호출하지 않고 재사용합니다.
     """
     if not texts:
         return []
@@ -156,57 +158,59 @@ def _summarize_text_batch(texts: list[str], api_key: str, batch_size: int = 3, l
     # 너무 길면 AI가 처리하지 못하므로 적절히 조절
     MAX_INPUT_LENGTH_FOR_BATCH_SUMMARIZATION = 10000 # 한 번의 AI 호출에 들어갈 텍스트의 최대 길이
 
-    summarized_batches = []
-    batch_counter = 0
-
     # 텍스트를 배치 크기 또는 최대 입력 길이에 맞춰 그룹화
+    batches = []
     current_batch_texts = []
     current_batch_length = 0
-
-    for i, text in enumerate(texts):
+    for text in texts:
         # 현재 텍스트를 추가했을 때 배치 길이가 너무 길어지면 새 배치 시작
         if current_batch_length + len(text) > MAX_INPUT_LENGTH_FOR_BATCH_SUMMARIZATION or len(current_batch_texts) >= batch_size:
             if current_batch_texts:
-                batch_counter += 1
-                batch_id = f"{current_batch_prefix}level{level}_batch{batch_counter}"
-                combined_batch_text = "\n\n---\n\n".join(current_batch_texts)
-
-                prompt = f"다음 텍스트들을 종합하여 간결하게 요약해 주세요. 주요 내용만 포함해 주세요.\n\n텍스트:\n{combined_batch_text}"
-                response_dict = retry_ai_call(prompt, api_key=api_key, max_retries=2, delay_seconds=10)
-                batch_summary = clean_ai_response_text(response_dict.get("text", f"배치 요약 실패 (레벨 {level}, 배치 {batch_counter})"))
-                summarized_batches.append(batch_summary)
-                database_manager.save_intermediate_summary(batch_summary, batch_id, level) # 중간 요약 저장
-
-                current_batch_texts = []
-                current_batch_length = 0
-                time.sleep(1) # AI 호출 간 딜레이
-
+                batches.append(current_batch_texts)
+            current_batch_texts = []
+            current_batch_length = 0
         current_batch_texts.append(text)
         current_batch_length += len(text)
+    if current_batch_texts: # 마지막 남은 배치
+        batches.append(current_batch_texts)
 
-    # 마지막 남은 배치 처리
-    if current_batch_texts:
-        batch_counter += 1
+    summarized_batches = []
+    for batch_counter, batch_texts in enumerate(batches, start=1):
         batch_id = f"{current_batch_prefix}level{level}_batch{batch_counter}"
-        combined_batch_text = "\n\n---\n\n".join(current_batch_texts)
+        combined_batch_text = "\n\n---\n\n".join(batch_texts)
+        input_hash = hashlib.sha256(combined_batch_text.encode('utf-8')).hexdigest()
+
+        if run_id is not None:
+            stored_summary = database_manager.get_intermediate_summary(run_id, batch_id, input_hash)
+            if stored_summary is not None: # 이전 실행에서 이미 요약된 배치
+                summarized_batches.append(stored_summary)
+                continue
+
         prompt = f"다음 텍스트들을 종합하여 간결하게 요약해 주세요. 주요 내용만 포함해 주세요.\n\n텍스트:\n{combined_batch_text}"
         response_dict = retry_ai_call(prompt, api_key=api_key, max_retries=2, delay_seconds=10)
-        batch_summary = clean_ai_response_text(response_dict.get("text", f"배치 요약 실패 (레벨 {level}, 배치 {batch_counter})"))
+        if "text" in response_dict:
+            batch_summary = clean_ai_response_text(response_dict["text"])
+            database_manager.save_intermediate_summary(batch_summary, batch_id, level, run_id, input_hash) # 중간 요약 저장
+        else:
+            batch_summary = f"{BATCH_SUMMARY_FAILURE_PREFIX} (레벨 {level}, 배치 {batch_counter})" # 실패한 배치는 저장하지 않아 다음 실행에서 다시 시도
         summarized_batches.append(batch_summary)
-        database_manager.save_intermediate_summary(batch_summary, batch_id, level) # 중간 요약 저장
+        if batch_counter < len(batches):
+            time.sleep(1) # AI 호출 간 딜레이
 
     # 요약된 배치가 여전히 많으면 다음 계층으로 재귀 호출
     # 최종 요약은 하나의 텍스트로 나와야 하므로, 1개 초과 시 재귀
     if len(summarized_batches) > 1:
-        st.info(f"⏳ {level}차 요약 완료. {len(summarized_batches)}개의 요약문이 생성되었습니다. 다음 계층 요약 시작...")
-        return _summarize_text_batch(summarized_batches, api_key, batch_size, level + 1, current_batch_prefix)
+        logger.info(f"{level}차 요약 완료. {len(summarized_batches)}개의 요약문이 생성되었습니다. 다음 계층 요약 시작...")
+        return _summarize_text_batch(summarized_batches, api_key, batch_size, level + 1, current_batch_prefix, run_id)
     else:
         return summarized_batches # 최종 요약문 리스트 (1개)
 
-def get_overall_trend_summary(summarized_articles: list[dict], api_key: str, max_attempts: int = 2, delay_seconds: int = 15) -> str:
+def get_overall_trend_summary(summarized_articles: list[dict], api_key: str, max_attempts: int = 2, delay_seconds: int = 15, run_id: str | None = None) -> str:
     """
     AI가 요약된 기사들을 바탕으로 전반적인 뉴스 트렌드를 요약합니다.
     계층적 요약 방식을 사용합니다.
+    run_id: 중간 요약을 저장할 실행 ID. 실패한 실행을 같은 run_id로 다시 호출하면 저장된 계층 요약부터 이어서 진행합니다.
+            없으면 새 ID를 생성합니다.
     """
     if not summarized_articles:
         return "요약된 기사가 없어 뉴스 트렌드를 요약할 수 없습니다."
@@ -217,19 +221,23 @@ def get_overall_trend_summary(summarized_articles: list[dict], api_key: str, max
         for art in summarized_articles
     ]
 
-    # 임시 DB 테이블 초기화 (새로운 전체 요약 시작 시)
-    database_manager.clear_intermediate_summaries()
+    if run_id is None:
+        run_id = database_manager.generate_run_id("summary")
+    # 다른 실행의 중간 요약은 건드리지 않고, 오래되어 이어서 실행될 일이 없는 요약만 정리
+    database_manager.purge_expired_intermediate_summaries()
 
-    st.info("⏳ 뉴스 트렌드 계층적 요약 시작...")
+    logger.info("뉴스 트렌드 계층적 요약 시작...")
     # 계층적 요약 실행 (배치 크기 3개로 시작)
-    final_summaries_list = _summarize_text_batch(initial_summaries, api_key, batch_size=3, level=1, current_batch_prefix=datetime.now().strftime('%Y%m%d%H%M%S_'))
+    final_summaries_list = _summarize_text_batch(initial_summaries, api_key, batch_size=3, level=1, run_id=run_id)
 
     # 최종 요약문이 하나로 나와야 함
-    if final_summaries_list and len(final_summaries_list) == 1:
+    if final_summaries_list and len(final_summaries_list) == 1 and not final_summaries_list[0].startswith(BATCH_SUMMARY_FAILURE_PREFIX):
         final_trend_summary = final_summaries_list[0]
-        st.success("✅ 뉴스 트렌드 계층적 요약 완료!")
+        database_manager.clear_intermediate_summaries(run_id) # 완료된 실행의 중간 요약 정리
+        logger.info("뉴스 트렌드 계층적 요약 완료!")
         return final_trend_summary
     else:
+        # 저장된 중간 요약은 남겨 두어 같은 run_id로 다시 실행하면 이어서 진행
         return "뉴스 트렌드 요약에 실패했습니다. 최종 요약문이 생성되지 않았습니다."
 
 
@@ -254,6 +262,59 @@ def get_insurance_implications_from_ai(trend_summary_text: str, api_key: str, ma
     else:
         return response_dict.get("error", "알 수 없는 오류")
 
+# 특약 구성 항목 (섹션 제목 -> 질문)
+ENDORSEMENT_SECTIONS = {
+    "1. 특약의 명칭": "자동차 보험 표준약관을 참고하여 특약의 **명칭**을 작성해줘.",
+    "2. 특약의 목적": "이 특약의 **목적**을 설명해줘.",
+    "3. 보장 범위": "**보장 범위**에 대해 상세히 작성해줘.",
+    "4. 보험금 지급 조건": "**보험금 지급 조건**을 구체적으로 작성해줘.",
+    "5. 보험료 산정 방식": "**보험료 산정 방식**을 설명해줘.",
+    "6. 면책 사항": "**면책 사항**에 해당하는 내용을 작성해줘.",
+    "7. 특약의 적용 기간": "**적용 기간**을 명시해줘.",
+    "8. 기타 특별 조건": "**기타 특별 조건**이 있다면 제안해줘.",
+    "9. 운전가능자 제한": "**운전자 연령과 범위**에 따른 특별 약관을 제안해줘.",
+    "10. 보험료 할인": "**보험료 할인**에 해당하는 특별 약관을 작성해줘.",
+    "11. 보장 확대": "**법률비용 및 다른 자동차 운전**에 해당하는 특별 약관을 작성해줘"
+}
+
+def build_endorsement_prompt(title: str, question: str, reference_text: str) -> str:
+    """특약의 한 섹션을 생성하기 위한 프롬프트를 만듭니다. reference_text는 표준약관 문서 또는 트렌드 보고서 내용입니다."""
+    return f"""
+너는 자동차 보험을 설계하고 있는 보험사 직원이야.
+다음 조건에 따라 자동차 보험 특약의 '{title}'을 3~5줄 정도로 작성해줘.
+
+[기획 목적]
+- 이 특약은 보험 상품 기획 초기 단계에서 트렌드 조사 및 방향성 도출에 도움 되는 목적으로 작성돼야 해.
+- 새로운 기술(예: 블랙박스, 자율주행 등)이나 최근 사회적 이슈(예: 고령 운전자 증가 등)를 반영해도 좋아.
+- 표준약관 표현 방식을 따라줘.
+
+[표준약관 내용]
+{reference_text}
+
+[질문]
+{question}
+
+[답변]
+"""
+
+def generate_endorsement_sections(reference_text: str, api_key: str, progress_callback=None) -> dict[str, str]:
+    """
+    ENDORSEMENT_SECTIONS의 각 섹션을 순서대로 생성합니다.
+    progress_callback(title, index, total): 각 섹션 생성 직전에 호출되는 진행 상황 콜백 (선택 사항)
+    반환 값: {섹션 제목: 생성된 내용}
+    """
+    sections = {}
+    for index, (title, question) in enumerate(ENDORSEMENT_SECTIONS.items()):
+        if progress_callback:
+            progress_callback(title, index, len(ENDORSEMENT_SECTIONS))
+        response_dict = retry_ai_call(build_endorsement_prompt(title, question, reference_text), api_key)
+        sections[title] = clean_ai_response_text(response_dict.get("text", response_dict.get("error", "AI 응답 실패.")))
+    return sections
+
+def format_endorsement_text(sections: dict[str, str]) -> str:
+    """생성된 특약 섹션들을 다운로드/첨부용 텍스트로 합칩니다."""
+    return "".join(f"#### {title}\n{content.strip()}\n\n" for title, content in sections.items())
+
 def clean_prettified_report_text(text: str) -> str:
     """
     AI가 포맷한 보고서 텍스트에서 불필요한 AI 서두/맺음말 문구만 제거하고,
@@ -0,0 +1,531 @@
+# modules/analysis_pipeline.py
+# 뉴스 트렌드 분석 전체 흐름(크롤링 → 트렌드 분석 → AI 키워드 선별 → 기사 요약 → 계층 요약 → 보험 인사이트 → 포맷팅 → 보고서)을
+# 단계별 체크포인트와 함께 실행합니다. 새로고침이나 오류로 중단된 실행은 같은 조건으로 다시 실행하면 마지막 완료 단계부터 이어서 진행합니다.
+# 화면(Streamlit)에 의존하지 않으므로 각 페이지, 예약 작업, CLI가 모두 같은 함수를 사용합니다. 진행 상황은 progress_callback으로 전달합니다.
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from loguru import logger
+
+from modules import ai_service
+from modules import data_exporter
+from modules import database_manager
+from modules import email_sender
+from modules import news_crawler
+from modules import trend_analyzer
+
+DEFAULT_PERSPECTIVE = "차량보험사의 보험개발자"
+# 트렌드 점수 방식 (trend_analyzer.SCORING_METHODS). 기사 수가 날마다 달라도 비교할 수 있도록 정규화한 로그 우도비를 기본으로 사용
+DEFAULT_TREND_SCORING = os.getenv("TREND_SCORING", "loglik")
+TOP_KEYWORD_COUNT = 3 # 기사 요약 대상 선정에 사용하는 상위 키워드 수
+RUN_HEARTBEAT_SECONDS = 60 # 실행 중임을 DB에 알리는 간격 (database_manager.PIPELINE_RUN_LEASE_MINUTES 동안 소식이 없으면 중단된 실행으로 봄)
+
+# AI 호출 실패 시 ai_service 함수들이 반환하는 메시지의 시작 부분. 이 결과는 체크포인트로 저장하지 않아 다음 실행에서 다시 시도합니다.
+AI_FAILURE_PREFIXES = (
+    "AI 호출 최종 실패",
+    "AI 응답을 가져오는 데 최종 실패",
+    "Gemini API",
+    "Gemini AI 호출",
+    "알 수 없는 오류",
+    "뉴스 트렌드 요약에 실패",
+    "요약된 기사가 없어",
+    "트렌드 요약문이 없어",
+    "AI를 통한 보고서 포맷팅 실패",
+)
+
+
+def is_ai_failure(text: str) -> bool:
+    """ai_service 함수의 반환 문자열이 실패 메시지인지 확인합니다."""
+    return not text or text.startswith(AI_FAILURE_PREFIXES)
+
+
+def build_run_params(keyword: str, total_search_days: int, recent_trend_days: int, max_naver_search_pages_per_day: int,
+                     end_date: datetime | None = None, profile_id: int | None = None, perspective: str = DEFAULT_PERSPECTIVE,
+                     scoring: str = DEFAULT_TREND_SCORING) -> dict:
+    """
+    분석 실행 조건을 만듭니다. 같은 조건(같은 날짜 포함)의 미완료 실행이 있으면 그 실행을 이어서 진행합니다.
+    end_date: 검색 기간의 마지막 날 (기본값: 오늘)
+    scoring: 트렌드 점수 방식 ("ratio", "loglik", "zscore". trend_analyzer.analyze_keyword_trends 참고)
+    """
+    end_date = end_date or datetime.now()
+    return {
+        "keyword": keyword,
+        "total_search_days": total_search_days,
+        "recent_trend_days": recent_trend_days,
+        "max_naver_search_pages_per_day": max_naver_search_pages_per_day,
+        "end_date": end_date.strftime('%Y-%m-%d'),
+        "profile_id": profile_id,
+        "perspective": perspective,
+        "scoring": scoring,
+    }
+
+
+def _encode_articles(articles: list[dict]) -> list[dict]:
+    return [{**article, "날짜": article["날짜"].isoformat() if isinstance(article.get("날짜"), datetime) else article.get("날짜")}
+            for article in articles]
+
+
+def _decode_articles(articles: list[dict]) -> list[dict]:
+    return [{**article, "날짜": datetime.fromisoformat(article["날짜"]) if article.get("날짜") else None}
+            for article in articles]
+
+
+class _RunCheckpoints:
+    """한 실행의 단계별 체크포인트를 읽고 씁니다."""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.stages = {stage: json.loads(payload) for stage, payload in database_manager.get_pipeline_checkpoints(run_id).items()}
+        self.resumed_stages = [] # 이번 실행에서 체크포인트로 건너뛴 단계
+
+    def get(self, stage: str):
+        return self.stages.get(stage)
+
+    def save(self, stage: str, value):
+        self.stages[stage] = value
+        database_manager.save_pipeline_checkpoint(self.run_id, stage, json.dumps(value, ensure_ascii=False))
+
+    def run(self, stage: str, compute, done=lambda value: True):
+        """단계 결과가 저장되어 있으면 재사용하고, 없으면 compute()를 실행합니다. done(결과)가 참일 때만 저장합니다."""
+        if stage in self.stages:
+            self.resumed_stages.append(stage)
+            return self.stages[stage]
+        value = compute()
+        if done(value):
+            self.save(stage, value)
+        return value
+
+
+def _crawl(params: dict, checkpoints: _RunCheckpoints, report, failed_days: list[str]) -> list[dict]:
+    """
+    검색 기간의 기사 메타데이터를 하루 단위로 수집하고, 날짜별로 체크포인트를 저장합니다.
+    요청 오류로 일부만 수집된 날은 체크포인트를 저장하지 않고 failed_days에 추가합니다. (다음 실행에서 그날을 다시 수집)
+    """
+    end_date = datetime.strptime(params["end_date"], '%Y-%m-%d')
+    total_days = params["total_search_days"]
+    search_start_date = end_date - timedelta(days=total_days - 1)
+    session = news_crawler.create_session()
+    rate_limiter = news_crawler.RateLimiter()
+
+    all_articles = []
+    for i in range(total_days):
+        current_search_date = search_start_date + timedelta(days=i)
+        formatted_search_date = current_search_date.strftime('%Y-%m-%d')
+        stage = f"crawl:{formatted_search_date}"
+        if checkpoints.get(stage) is not None:
+            checkpoints.resumed_stages.append(stage)
+            daily_articles = _decode_articles(checkpoints.get(stage))
+        else:
+            crawl_errors = []
+            daily_articles = news_crawler.crawl_naver_news_metadata(
+                params["keyword"],
+                current_search_date,
+                params["max_naver_search_pages_per_day"],
+                session=session,
+                rate_limiter=rate_limiter,
+                errors=crawl_errors
+            )
+            # 하루치 기사를 한 번의 트랜잭션으로 저장
+            database_manager.insert_articles_bulk(
+                (
+                    {
+                        "제목": article["제목"],
+                        "링크": article["링크"],
+                        "날짜": article["날짜"].strftime('%Y-%m-%d'),
+                        "내용": article["내용"]
+                    }
+                    for article in daily_articles
+                ),
+                keyword=params["keyword"],
+                profile_id=params.get("profile_id")
+            )
+            if crawl_errors:
+                failed_days.append(formatted_search_date)
+                report("crawl", f"{formatted_search_date} 기사 수집 중 오류가 발생해 일부만 수집했습니다: {crawl_errors[0]}", None, "warning")
+            else:
+                checkpoints.save(stage, _encode_articles(daily_articles))
+        all_articles.extend(daily_articles)
+        report("crawl", f"뉴스 메타데이터 수집 중... ({formatted_search_date}, {len(all_articles)}개 기사 처리 완료)", (i + 1) / total_days)
+    return all_articles
+
+
+def _select_keywords(trending_keywords: list[dict], params: dict, api_key: str) -> dict:
+    relevant_keywords = ai_service.get_relevant_keywords(trending_keywords, params["perspective"], api_key)
+    if relevant_keywords:
+        # 트렌드 분석 결과의 순서(빈도 비율 방식은 최근 언급량순, 점수 방식은 점수순)를 그대로 유지
+        filtered = [kw_data for kw_data in trending_keywords if kw_data['keyword'] in relevant_keywords]
+    else:
+        filtered = trending_keywords
+    return {"ai_selected": bool(relevant_keywords), "displayed": filtered[:TOP_KEYWORD_COUNT]}
+
+
+def _articles_for_summary(articles: list[dict], displayed_keywords: list[dict], params: dict) -> list[dict]:
+    """최근 기간의 기사 중 선별된 키워드를 포함하는 기사를 링크 기준으로 중복 없이 고릅니다."""
+    end_date = datetime.strptime(params["end_date"], '%Y-%m-%d')
+    recent_start = end_date - timedelta(days=params["recent_trend_days"])
+    target_keywords = {kw['keyword'] for kw in displayed_keywords}
+    selected = []
+    seen_links = set()
+    for article in articles:
+        if not article.get("날짜") or article["날짜"] < recent_start or article["링크"] in seen_links:
+            continue
+        if target_keywords.intersection(trend_analyzer.article_ngrams(article, trend_analyzer.DEFAULT_NGRAM_RANGE)):
+            selected.append(article)
+            seen_links.add(article["링크"])
+    return selected
+
+
+def _summarize_articles(articles: list[dict], api_key: str, checkpoints: _RunCheckpoints, report, failed_links: list[str]) -> list[dict]:
+    """기사별 AI 요약을 만들고, 성공한 요약은 기사마다 체크포인트에 누적 저장합니다. 요약에 실패한 기사 링크는 failed_links에 추가합니다."""
+    stored = checkpoints.get("article_summaries") or {}
+    if stored:
+        checkpoints.resumed_stages.append("article_summaries")
+    summarized_articles = []
+    for i, article in enumerate(articles):
+        article_date_str = article["날짜"].strftime('%Y-%m-%d')
+        content = stored.get(article["링크"])
+        if content is None:
+            ai_processed_content = ai_service.get_article_summary(
+                article["제목"],
+                article["링크"],
+                article_date_str,
+                article["내용"],
+                api_key,
+                max_attempts=2
+            )
+            if is_ai_failure(ai_processed_content):
+                failed_links.append(article["링크"])
+                content = f"본문 요약 실패 (AI 오류): {ai_processed_content}"
+                report("article_summaries", f"AI 요약 실패: {content}", None, "error")
+            else:
+                content = ai_service.clean_ai_response_text(ai_processed_content)
+                stored[article["링크"]] = content
+                checkpoints.save("article_summaries", stored)
+        summarized_articles.append({"제목": article["제목"], "링크": article["링크"], "날짜": article_date_str, "내용": content})
+        report("article_summaries", f"AI가 트렌드 기사를 요약 중... ({i + 1}/{len(articles)} 완료)", (i + 1) / len(articles))
+    return summarized_articles
+
+
+def build_report(displayed_keywords: list[dict], summarized_articles: list[dict], trend_summary: str, insurance_info: str,
+                 formatted_trend_summary: str = "", formatted_insurance_info: str = "") -> str:
+    """AI가 포맷한 각 섹션과 직접 구성한 부록(키워드 산출 근거, 반영된 기사 리스트)을 합쳐 최종 보고서를 만듭니다."""
+    final_prettified_report = ""
+    final_prettified_report += "# 뉴스 트렌드 분석 및 보험 상품 개발 인사이트\n\n"
+    final_prettified_report += "## 개요\n\n"
+    final_prettified_report += "이 보고서는 최근 뉴스 트렌드를 분석하고, 이를 바탕으로 자동차 보험 상품 개발에 필요한 주요 인사이트를 제공합니다.\n\n"
+
+    if formatted_trend_summary:
+        final_prettified_report += "## 뉴스 트렌드 요약\n"
+        final_prettified_report += formatted_trend_summary + "\n\n"
+    else:
+        final_prettified_report += "## 뉴스 트렌드 요약 (생성 실패)\n"
+        final_prettified_report += trend_summary + "\n\n"
+
+    if formatted_insurance_info:
+        final_prettified_report += "## 자동차 보험 산업 관련 주요 사실 및 법적 책임\n"
+        final_prettified_report += formatted_insurance_info + "\n\n"
+    else:
+        final_prettified_report += "## 자동차 보험 산업 관련 주요 사실 및 법적 책임 (생성 실패)\n"
+        final_prettified_report += insurance_info + "\n\n"
+
+    # --- 부록 섹션 추가 (AI 포맷팅 없이 직접 구성) ---
+    final_prettified_report += "---\n\n"
+    final_prettified_report += "## 부록\n\n"
+
+    final_prettified_report += "### 키워드 산출 근거\n"
+    if displayed_keywords:
+        for kw_data in displayed_keywords:
+            surge_ratio_display = (f'''{kw_data.get('surge_ratio'):.2f}x''' if kw_data.get('surge_ratio') != float('inf') else '새로운 트렌드')
+            final_prettified_report += (
+                f"- **키워드**: {kw_data['keyword']}\n"
+                f"  - 최근 언급량: {kw_data['recent_freq']}회\n"
+                f"  - 이전 언급량: {kw_data['past_freq']}회\n"
+                f"  - 증가율: {surge_ratio_display}\n"
+                + (f"  - 트렌드 점수: {kw_data['score']:.2f}\n" if 'score' in kw_data else "")
+                + "\n"
+            )
+    else:
+        final_prettified_report += "키워드 산출 근거 데이터가 없습니다.\n\n"
+
+    final_prettified_report += "### 반영된 기사 리스트\n"
+    if summarized_articles:
+        for i, article in enumerate(summarized_articles):
+            final_prettified_report += (
+                f"{i+1}. **제목**: {article['제목']}\n"
+                f"   **날짜**: {article['날짜']}\n"
+                f"   **링크**: {article['링크']}\n"
+                f"   **요약 내용**: {article['내용'][:150]}...\n\n"
+            )
+    else:
+        final_prettified_report += "반영된 기사 리스트가 없습니다.\n\n"
+    return final_prettified_report
+
+
+def run_trend_analysis(params: dict, api_key: str, run_id: str | None = None, resume: bool = True, progress_callback=None) -> dict:
+    """
+    뉴스 트렌드 분석 전체 흐름을 단계별 체크포인트와 함께 실행합니다.
+    Args:
+        params (dict): build_run_params()로 만든 실행 조건.
+        api_key (str): Gemini API 키.
+        run_id (str, optional): 이어서 실행할 실행 ID. 없으면 resume=True일 때 같은 조건의 미완료 실행을 찾고, 없으면 새로 만듭니다.
+        resume (bool): 같은 조건의 미완료 실행을 이어서 진행할지 여부.
+        progress_callback (callable, optional): progress_callback(stage, message, fraction, level) 형태의 진행 상황 콜백.
+            fraction은 0~1 사이 진행률 또는 None, level은 "info" / "success" / "warning" / "error".
+    Returns:
+        dict: run_id, resumed_stages, trending_keywords, displayed_keywords, ai_selected_keywords, summarized_articles,
+              trend_summary, insurance_info, formatted_trend_summary, formatted_insurance_info, report,
+              failed_stages (AI 호출이 실패한 단계), completed (실패한 단계 없이 끝났는지 여부)
+        실패한 단계가 있는 실행은 failed 상태로 남아, 같은 조건으로 다시 실행하면 실패한 단계부터 이어서 진행합니다.
+    """
+    last_heartbeat = time.monotonic()
+
+    def report(stage, message, fraction=None, level="info"):
+        nonlocal last_heartbeat
+        if time.monotonic() - last_heartbeat >= RUN_HEARTBEAT_SECONDS:
+            database_manager.touch_pipeline_run(run_id) # 체크포인트 없이 오래 걸리는 단계에서도 실행 중임을 알림
+            last_heartbeat = time.monotonic()
+        if progress_callback:
+            progress_callback(stage, message, fraction, level)
+
+    params_json = json.dumps(params, ensure_ascii=False, sort_keys=True)
+    database_manager.purge_expired_pipeline_runs()
+    if run_id is None and resume:
+        # 실패했거나 실행하던 프로세스가 사라진 실행만 가져옴 (다른 세션이 실행 중인 run_id는 공유하지 않음)
+        run_id = database_manager.claim_resumable_pipeline_run(params_json)
+    if run_id is None:
+        run_id = database_manager.generate_run_id("trend")
+    database_manager.create_pipeline_run(run_id, params_json)
+    database_manager.update_pipeline_run_status(run_id, "running")
+    checkpoints = _RunCheckpoints(run_id)
+
+    result = {
+        "run_id": run_id,
+        "resumed_stages": checkpoints.resumed_stages,
+        "trending_keywords": [],
+        "displayed_keywords": [],
+        "ai_selected_keywords": False,
+        "summarized_articles": [],
+        "trend_summary": "",
+        "insurance_info": "",
+        "formatted_trend_summary": "",
+        "formatted_insurance_info": "",
+        "report": "",
+        "failed_stages": [],
+        "completed": False,
+    }
+
+    def stage_succeeded(value):
+        # 앞 단계가 실패한 경우 다시 실행하면 입력이 달라지므로, 뒤 단계 결과도 저장하지 않음
+        return not is_ai_failure(value) and not result["failed_stages"]
+
+    try:
+        # --- 1. 뉴스 메타데이터 수집 ---
+        report("crawl", "네이버 뉴스 메타데이터 수집 중...")
+        failed_crawl_days = []
+        articles = _crawl(params, checkpoints, report, failed_crawl_days)
+        if failed_crawl_days:
+            result["failed_stages"].append("crawl")
+            report("crawl", f"총 {len(articles)}개의 뉴스 메타데이터를 수집했습니다. (수집 오류가 있던 날짜 {len(failed_crawl_days)}일은 다시 실행하면 새로 수집)", None, "warning")
+        else:
+            report("crawl", f"총 {len(articles)}개의 뉴스 메타데이터를 수집했습니다.", None, "success")
+
+        # --- 2. 키워드 트렌드 분석 ---
+        report("trends", "키워드 트렌드 분석 중...")
+        trending_keywords = checkpoints.run("trends", lambda: trend_analyzer.analyze_keyword_trends(
+            articles,
+            recent_days_period=params["recent_trend_days"],
+            total_days_period=params["total_search_days"],
+            ngram_range=trend_analyzer.DEFAULT_NGRAM_RANGE,
+            scoring=params.get("scoring", "ratio"), # scoring이 없던 이전 실행 조건은 기존 방식
+            reference_date=datetime.strptime(params["end_date"], '%Y-%m-%d') # 다른 날 이어서 실행해도 검색 기간 기준으로 나눔
+        ), done=lambda value: not result["failed_stages"]) # 일부 날짜만 수집된 기사로 만든 결과는 저장하지 않음
+        result["trending_keywords"] = trending_keywords
+        if not trending_keywords:
+            report("trends", "선택된 기간 내에 유의미한 트렌드 키워드가 없습니다.")
+            result["completed"] = not result["failed_stages"]
+            return result
+
+        # --- 3. AI가 관점에 맞는 키워드 선별 ---
+        report("keywords", "AI가 보험 개발자 관점에서 유의미한 키워드를 선별 중...")
+        keyword_selection = checkpoints.run("keywords", lambda: _select_keywords(trending_keywords, params, api_key),
+                                            done=lambda value: value["ai_selected"])
+        result["displayed_keywords"] = keyword_selection["displayed"]
+        result["ai_selected_keywords"] = keyword_selection["ai_selected"]
+        if keyword_selection["ai_selected"]:
+            report("keywords", f"AI가 선별한 보험 개발자 관점의 유의미한 키워드 ({len(result['displayed_keywords'])}개): {[kw['keyword'] for kw in result['displayed_keywords']]}")
+        else:
+            report("keywords", "AI가 보험 개발자 관점에서 유의미한 키워드를 선별하지 못했습니다. 모든 트렌드 키워드를 표시합니다.", None, "warning")
+
+        # --- 4. 트렌드 기사 본문 요약 ---
+        articles_for_summary = _articles_for_summary(articles, result["displayed_keywords"], params)
+        if not articles_for_summary:
+            report("article_summaries", "선별된 트렌드 키워드를 포함하는 최근 기사가 없거나, AI 요약 대상 기사가 없습니다.")
+            result["completed"] = not result["failed_stages"]
+            return result
+        report("article_summaries", "트렌드 기사 본문 요약 중 (Gemini AI 호출)...")
+        failed_links = []
+        result["summarized_articles"] = _summarize_articles(articles_for_summary, api_key, checkpoints, report, failed_links)
+        if failed_links:
+            result["failed_stages"].append("article_summaries")
+        report("article_summaries", f"총 {len(result['summarized_articles'])}개의 트렌드 기사 요약을 완료했습니다.", None, "success")
+
+        # --- 5. 계층적 트렌드 요약 (중간 요약도 같은 run_id로 저장되어 이어서 진행) ---
+        report("trend_summary", "AI가 뉴스 트렌드를 요약 중...")
+        result["trend_summary"] = checkpoints.run("trend_summary", lambda: ai_service.clean_ai_response_text(
+            ai_service.get_overall_trend_summary(result["summarized_articles"], api_key, run_id=run_id)
+        ), done=stage_succeeded)
+        if is_ai_failure(result["trend_summary"]):
+            result["failed_stages"].append("trend_summary")
+            report("trend_summary", f"AI 트렌드 요약 실패: {result['trend_summary']}", None, "error")
+        else:
+            report("trend_summary", "AI 뉴스 트렌드 요약 완료!", None, "success")
+
+        # --- 6. 자동차 보험 산업 인사이트 ---
+        report("insurance_info", "AI가 자동차 보험 산업 관련 정보를 분석 중...")
+        result["insurance_info"] = checkpoints.run("insurance_info", lambda: ai_service.clean_ai_response_text(
+            ai_service.get_insurance_implications_from_ai(result["trend_summary"], api_key)
+        ), done=stage_succeeded)
+        if is_ai_failure(result["insurance_info"]):
+            result["failed_stages"].append("insurance_info")
+            report("insurance_info", f"AI 자동차 보험 산업 관련 정보 분석 실패: {result['insurance_info']}", None, "error")
+        else:
+            report("insurance_info", "AI 자동차 보험 산업 관련 정보 분석 완료!", None, "success")
+
+        # --- 7. 섹션별 마크다운 포맷팅 (실패 시 원본 텍스트 사용) ---
+        for source_key, stage, label in (("trend_summary", "formatted_trend_summary", "뉴스 트렌드 요약"),
+                                         ("insurance_info", "formatted_insurance_info", "자동차 보험 산업 관련 정보")):
+            report(stage, f"AI가 {label} 보고서를 포맷팅 중...")
+            formatted = checkpoints.run(stage, lambda: ai_service.format_text_with_markdown(result[source_key], api_key),
+                                        done=stage_succeeded)
+            if is_ai_failure(formatted):
+                result["failed_stages"].append(stage)
+                report(stage, f"AI {label} 포맷팅에 실패했습니다. 원본 텍스트가 사용됩니다.", None, "warning")
+                formatted = result[source_key]
+            else:
+                report(stage, f"AI {label} 보고서 포맷팅 완료!", None, "success")
+            result[stage] = formatted
+
+        # --- 8. 최종 보고서 결합 ---
+        result["report"] = build_report(
+            result["displayed_keywords"],
+            result["summarized_articles"],
+            result["trend_summary"],
+            result["insurance_info"],
+            result["formatted_trend_summary"],
+            result["formatted_insurance_info"]
+        )
+        result["completed"] = not result["failed_stages"]
+        return result
+    finally:
+        database_manager.update_pipeline_run_status(run_id, "completed" if result["completed"] else "failed")
+
+
+def load_email_config() -> dict | None:
+    """환경 변수(SENDER_EMAIL, SENDER_PASSWORD, SMTP_SERVER, SMTP_PORT)에서 이메일 설정을 읽습니다. 설정이 없거나 잘못되었으면 None."""
+    sender_email = os.getenv("SENDER_EMAIL")
+    sender_password = os.getenv("SENDER_PASSWORD")
+    smtp_server = os.getenv("SMTP_SERVER")
+    smtp_port = os.getenv("SMTP_PORT")
+    if not all([sender_email, sender_password, smtp_server, smtp_port]):
+        return None
+    try:
+        smtp_port = int(smtp_port)
+    except ValueError:
+        logger.error("SMTP_PORT는 유효한 숫자여야 합니다.")
+        return None
+    return {"sender_email": sender_email, "sender_password": sender_password, "smtp_server": smtp_server, "smtp_port": smtp_port}
+
+
+def run_profile_report(profile: dict, api_key: str, recipient_emails: list[str] | None = None, email_config: dict | None = None,
+                       with_endorsement: bool = True, email_subject_prefix: str = "예약된 ", progress_callback=None) -> dict:
+    """
+    검색 프로필 하나에 대해 run_report를 실행합니다. (예약 작업에서 사용)
+    Args:
+        profile (dict): database_manager.get_search_profiles()의 프로필.
+        나머지 인자와 반환 값은 run_report와 같습니다.
+    """
+    params = build_run_params(
+        profile['keyword'],
+        profile['total_search_days'],
+        profile['recent_trend_days'],
+        profile['max_naver_search_pages_per_day'],
+        profile_id=profile['id']
+    )
+    return run_report(params, api_key, recipient_emails, email_config, with_endorsement, email_subject_prefix,
+                      progress_callback=progress_callback)
+
+
+def run_report(params: dict, api_key: str, recipient_emails: list[str] | None = None, email_config: dict | None = None,
+               with_endorsement: bool = True, email_subject_prefix: str = "", run_id: str | None = None, resume: bool = True,
+               progress_callback=None) -> dict:
+    """
+    분석 → 보고서(엑셀) → 특약 생성 → 이메일 전송까지 실행합니다. (예약 작업, CLI 등 화면 없이 실행하는 경로에서 사용)
+    Args:
+        params (dict): build_run_params()로 만든 실행 조건.
+        recipient_emails (list[str], optional): 수신자 목록. 없거나 email_config가 없으면 이메일을 보내지 않습니다.
+        email_config (dict, optional): load_email_config() 형식의 SMTP 설정.
+        with_endorsement (bool): 보고서 내용을 바탕으로 특약을 생성할지 여부.
+        run_id, resume: run_trend_analysis에 그대로 전달합니다.
+        progress_callback (callable, optional): run_trend_analysis와 같은 형식의 진행 상황 콜백.
+    Returns:
+        dict: {"analysis": run_trend_analysis 결과, "report_excel": bytes 또는 None, "endorsement_text": str 또는 None,
+               "report_sent": bool, "endorsement_sent": bool}
+    """
+    def report(stage, message, fraction=None, level="info"):
+        if progress_callback:
+            progress_callback(stage, message, fraction, level)
+
+    analysis = run_trend_analysis(params, api_key, run_id=run_id, resume=resume, progress_callback=progress_callback)
+    outcome = {"analysis": analysis, "report_excel": None, "endorsement_text": None, "report_sent": False, "endorsement_sent": False}
+
+    if analysis["report"]:
+        report("report", "보고서 엑셀 파일 생성 중...")
+        outcome["report_excel"] = data_exporter.export_ai_report_to_excel(analysis["report"], sheet_name='AI_Insights_Report').getvalue()
+
+        if with_endorsement:
+            report("endorsement", "새로 생성된 보고서 내용을 기반으로 특약을 동적으로 생성 중...")
+            sections = ai_service.generate_endorsement_sections(
+                analysis["report"],
+                api_key,
+                progress_callback=lambda title, index, total: report("endorsement", f"{title} 생성 중...", index / total)
+            )
+            outcome["endorsement_text"] = ai_service.format_endorsement_text(sections)
+            database_manager.save_generated_endorsement(outcome["endorsement_text"])
+            report("endorsement", "특약 동적 생성 완료!", None, "success")
+    else:
+        report("report", "새로 생성된 보고서 내용이 없어 보고서 첨부와 특약 생성을 건너뜁니다.", None, "warning")
+
+    if not recipient_emails or not email_config:
+        return outcome
+
+    report("email", f"{len(recipient_emails)}명에게 이메일 전송 중...")
+    today_str = datetime.now().strftime('%Y%m%d')
+    if outcome["report_excel"]:
+        outcome["report_sent"] = email_sender.send_email_with_multiple_attachments(
+            receiver_emails=recipient_emails,
+            subject=f"{email_subject_prefix}뉴스 트렌드 분석 보고서 - {today_str}",
+            body=analysis["report"],
+            attachments=[{
+                "data": outcome["report_excel"],
+                "filename": data_exporter.generate_filename("ai_insights_report", "xlsx"),
+                "mime_type": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            }],
+            report_format="markdown",
+            **email_config
+        )
+    if outcome["endorsement_text"]:
+        outcome["endorsement_sent"] = email_sender.send_email_with_multiple_attachments(
+            receiver_emails=recipient_emails,
+            subject=f"{email_subject_prefix}보험 특약 - {today_str}",
+            body="요청하신 보험 특약 내용입니다. 첨부 파일을 확인해주세요.",
+            attachments=[{
+                "data": outcome["endorsement_text"].encode('utf-8'),
+                "filename": data_exporter.generate_filename("생성된_보험_특약", "txt"),
+                "mime_type": "text/plain"
+            }],
+            report_format="plain",
+            **email_config
+        )
+    return outcome
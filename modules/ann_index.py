@@ -0,0 +1,210 @@
+# modules/ann_index.py
+# 문서 검색용 FAISS 색인 종류(flat / HNSW / IVF-Flat / IVF-PQ)를 만들고 비교합니다.
+# 청크가 적을 때는 정확한 flat 색인이 가장 빠르고 정확하지만, 약관 전체처럼 청크가 많아지면
+# 근사 최근접 이웃(ANN) 색인이 검색 시간(HNSW, IVF)과 벡터당 메모리(IVF-PQ)를 크게 줄입니다.
+# VECTOR_INDEX_TYPE 환경 변수로 색인 종류를 고정할 수 있으며, 기본값 auto는 청크 수에 따라 고릅니다.
+# 벤치마크: python -m modules.cli index-benchmark --vectors 50000
+
+import math
+import os
+import time
+from loguru import logger
+
+INDEX_TYPES = ("flat", "hnsw", "ivf_flat", "ivf_pq")
+VECTOR_INDEX_TYPE = os.getenv("VECTOR_INDEX_TYPE", "auto")
+
+# 자동 선택 기준 (청크 수)
+HNSW_MIN_VECTORS = 20_000 # 이보다 적으면 flat 검색도 수 ms 이내
+IVF_MIN_VECTORS = 300_000 # HNSW 그래프 메모리(벡터당 약 M*2*4바이트 추가)와 구축 시간이 부담되는 규모
+IVF_PQ_MIN_VECTORS = 2_000_000 # float32 원본 벡터(768차원 기준 벡터당 3KB)를 메모리에 둘 수 없는 규모
+
+HNSW_M = 32 # 노드당 연결 수
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 64
+IVF_NPROBE = 16 # 검색할 클러스터 수 (클수록 정확하지만 느림)
+IVF_TRAINING_POINTS_PER_LIST = 39 # FAISS가 권장하는 클러스터당 최소 학습 벡터 수
+IVF_MAX_TRAINING_POINTS_PER_LIST = 256 # 학습 시간을 줄이기 위해 이보다 많으면 표본만 사용
+PQ_BITS = 8 # 부분 벡터당 코드 비트 수 (코드북 256개)
+
+
+def choose_index_type(vector_count: int) -> str:
+    """청크(벡터) 수에 맞는 색인 종류를 고릅니다."""
+    if vector_count >= IVF_PQ_MIN_VECTORS:
+        return "ivf_pq"
+    if vector_count >= IVF_MIN_VECTORS:
+        return "ivf_flat"
+    if vector_count >= HNSW_MIN_VECTORS:
+        return "hnsw"
+    return "flat"
+
+
+def resolve_index_type(vector_count: int, index_type: str | None = None) -> str:
+    """설정된 색인 종류(auto면 청크 수로 선택)를 반환합니다. IVF 계열은 학습할 벡터가 부족하면 한 단계 단순한 색인으로 바꿉니다."""
+    index_type = index_type or VECTOR_INDEX_TYPE
+    if index_type == "auto":
+        index_type = choose_index_type(vector_count)
+    if index_type not in INDEX_TYPES:
+        logger.warning(f"알 수 없는 색인 종류입니다: {index_type}. flat 색인을 사용합니다.")
+        return "flat"
+    if index_type == "ivf_pq" and vector_count < 2 ** PQ_BITS * IVF_TRAINING_POINTS_PER_LIST:
+        index_type = "ivf_flat"
+    if index_type == "ivf_flat" and vector_count < 16 * IVF_TRAINING_POINTS_PER_LIST:
+        index_type = "hnsw"
+    return index_type
+
+
+def _ivf_list_count(vector_count: int) -> int:
+    """IVF 클러스터 수: 약 4*sqrt(N), 클러스터당 학습 벡터가 부족하지 않도록 제한"""
+    return max(1, min(int(4 * math.sqrt(vector_count)), vector_count // IVF_TRAINING_POINTS_PER_LIST, 65536))
+
+
+def _pq_subquantizers(dim: int) -> int:
+    """PQ 부분 벡터 수: 차원을 나누어떨어지게 하는 값 중 부분 벡터당 8~16차원이 되는 값"""
+    for m in (96, 64, 48, 32, 24, 16, 8, 4, 2, 1):
+        if dim % m == 0 and dim // m >= 8:
+            return m
+    return 1
+
+
+def build_index(vectors, index_type: str):
+    """
+    float32 벡터 배열(N x D)로 FAISS 색인을 만들고 (색인, 정보) 를 반환합니다. IVF 계열은 먼저 학습(클러스터링)합니다.
+    정보: {"index_type", "train_seconds", "add_seconds", ...색인별 파라미터}
+    langchain FAISS의 기본값과 같은 L2 거리를 사용합니다. (정규화된 임베딩에서는 코사인 유사도와 순위가 같음)
+    """
+    import faiss
+    import numpy as np
+
+    vectors = np.ascontiguousarray(vectors, dtype="float32")
+    vector_count, dim = vectors.shape
+    info = {"index_type": index_type, "train_seconds": 0.0}
+
+    if index_type == "flat":
+        index = faiss.IndexFlatL2(dim)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, HNSW_M)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        index.hnsw.efSearch = HNSW_EF_SEARCH
+        info.update(m=HNSW_M, ef_search=HNSW_EF_SEARCH)
+    elif index_type in ("ivf_flat", "ivf_pq"):
+        nlist = _ivf_list_count(vector_count)
+        quantizer = faiss.IndexFlatL2(dim)
+        if index_type == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, dim, nlist)
+        else:
+            pq_m = _pq_subquantizers(dim)
+            index = faiss.IndexIVFPQ(quantizer, dim, nlist, pq_m, PQ_BITS)
+            info.update(pq_m=pq_m, pq_bits=PQ_BITS)
+        index.nprobe = min(IVF_NPROBE, nlist)
+        info.update(nlist=nlist, nprobe=index.nprobe)
+
+        training_size = min(vector_count, nlist * IVF_MAX_TRAINING_POINTS_PER_LIST)
+        if index_type == "ivf_pq":
+            training_size = max(training_size, min(vector_count, 2 ** PQ_BITS * IVF_TRAINING_POINTS_PER_LIST))
+        training_vectors = vectors
+        if training_size < vector_count:
+            training_vectors = vectors[np.random.default_rng(0).choice(vector_count, training_size, replace=False)]
+        started = time.perf_counter()
+        index.train(training_vectors)
+        info["train_seconds"] = time.perf_counter() - started
+    else:
+        raise ValueError(f"알 수 없는 색인 종류입니다: {index_type}")
+
+    started = time.perf_counter()
+    index.add(vectors)
+    info["add_seconds"] = time.perf_counter() - started
+    return index, info
+
+
+def index_memory_bytes(index) -> int:
+    """색인을 직렬화한 크기(바이트)를 반환합니다. (메모리 사용량의 근사치)"""
+    import faiss
+    return int(faiss.serialize_index(index).size)
+
+
+def rebuild_store(store, index_type: str):
+    """
+    langchain FAISS 저장소(flat 색인)의 벡터로 지정한 종류의 색인을 새로 만들어, 같은 문서 저장소를 쓰는 검색용 FAISS 저장소를 반환합니다.
+    임베딩을 다시 계산하지 않고 flat 색인에 저장된 벡터를 그대로 사용합니다.
+    """
+    from langchain.vectorstores import FAISS
+
+    vectors = store.index.reconstruct_n(0, store.index.ntotal)
+    index, info = build_index(vectors, index_type)
+    logger.info(f"검색 색인 생성: {index_type}, 벡터 {store.index.ntotal}개 (학습 {info['train_seconds']:.2f}초, 추가 {info['add_seconds']:.2f}초)")
+    return FAISS(store.embedding_function, index, store.docstore, dict(store.index_to_docstore_id))
+
+
+def extend_store(search_store, store) -> int:
+    """
+    rebuild_store로 만든 검색용 저장소에, 그 뒤 flat 저장소 끝에 추가된 벡터만 더하고 추가한 벡터 수를 반환합니다.
+    HNSW는 그래프에 노드를 끼워 넣고 IVF는 학습된 클러스터에 배정하므로 다시 학습하지 않습니다.
+    flat 저장소에서 벡터를 삭제하면 위치가 바뀌므로, 삭제 뒤에는 rebuild_store로 새로 만들어야 합니다.
+    """
+    start = search_store.index.ntotal
+    count = store.index.ntotal - start
+    if count > 0:
+        search_store.index.add(store.index.reconstruct_n(start, count))
+        search_store.index_to_docstore_id.update({i: store.index_to_docstore_id[i] for i in range(start, start + count)})
+    return count
+
+
+def _synthetic_vectors(vector_count: int, dim: int, cluster_count: int = 100, seed: int = 0):
+    """문서 임베딩처럼 주제별로 모여 있는 정규화된 무작위 벡터를 만듭니다."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((cluster_count, dim)).astype("float32")
+    vectors = centers[rng.integers(0, cluster_count, vector_count)] + 0.6 * rng.standard_normal((vector_count, dim)).astype("float32")
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def benchmark_index_types(vectors=None, vector_count: int = 50_000, dim: int = 768, query_count: int = 200, k: int = 10,
+                          index_types: tuple[str, ...] = INDEX_TYPES) -> list[dict]:
+    """
+    색인 종류별로 구축 시간, 벡터당 메모리, 질의 지연 시간, flat 색인 대비 recall@k를 측정합니다.
+    vectors를 주지 않으면 vector_count x dim 크기의 합성 벡터를 사용합니다.
+    질의는 저장된 벡터에 작은 잡음을 더해 만들며, 정답은 flat(정확한) 검색 결과입니다.
+    """
+    import numpy as np
+
+    vectors = _synthetic_vectors(vector_count, dim) if vectors is None else np.ascontiguousarray(vectors, dtype="float32")
+    vector_count = len(vectors)
+    rng = np.random.default_rng(1)
+    queries = vectors[rng.choice(vector_count, min(query_count, vector_count), replace=False)]
+    queries = queries + 0.05 * rng.standard_normal(queries.shape).astype("float32")
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+    k = min(k, vector_count)
+
+    results = []
+    ground_truth = None
+    for index_type in ("flat",) + tuple(t for t in index_types if t != "flat"):
+        effective_type = resolve_index_type(vector_count, index_type)
+        if effective_type != index_type:
+            logger.warning(f"벡터 {vector_count}개로는 {index_type} 색인을 학습할 수 없어 건너뜁니다.")
+            continue
+        index, info = build_index(vectors, index_type)
+        latencies = []
+        found = []
+        for query in queries:
+            started = time.perf_counter()
+            _, ids = index.search(query.reshape(1, -1), k)
+            latencies.append(time.perf_counter() - started)
+            found.append(ids[0])
+        found = np.array(found)
+        if ground_truth is None:
+            ground_truth = found
+        recall = float(np.mean([len(set(f) & set(g)) / k for f, g in zip(found, ground_truth)]))
+        memory_bytes = index_memory_bytes(index)
+        results.append({ # flat은 기준선으로 항상 포함
+            **info,
+            "vectors": vector_count,
+            "build_seconds": info["train_seconds"] + info["add_seconds"],
+            "bytes_per_vector": memory_bytes / vector_count,
+            "memory_mb": memory_bytes / (1024 * 1024),
+            "query_ms_avg": 1000 * sum(latencies) / len(latencies),
+            "query_ms_p95": 1000 * sorted(latencies)[int(0.95 * (len(latencies) - 1))],
+            "recall_at_k": recall,
+            "k": k
+        })
+    return results
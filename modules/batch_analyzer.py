@@ -0,0 +1,75 @@
+# modules/batch_analyzer.py
+# 여러 검색 프리셋(프로필)을 한 번의 크롤링 패스로 일괄 분석합니다.
+# 야간 예약 작업처럼 여러 프리셋을 연속 실행하는 경우에 사용합니다.
+
+from modules import analysis_pipeline
+from modules import database_manager
+from modules import news_crawler
+from modules import trend_analyzer
+
+
+def run_batch_trend_analysis(profiles: list[dict] | None = None, max_workers: int = 4, requests_per_second: float = 2.0,
+                             ngram_range: tuple[int, int] = trend_analyzer.DEFAULT_NGRAM_RANGE, save_to_db: bool = True,
+                             scoring: str = analysis_pipeline.DEFAULT_TREND_SCORING) -> dict[int, dict]:
+    """
+    여러 검색 프로필을 동시에 크롤링하고 프로필별 키워드 트렌드를 분석합니다.
+    - 크롤링은 HTTP 세션과 속도 제한을 공유합니다. (news_crawler.crawl_profiles_concurrently)
+    - 여러 검색어에 동시에 걸린 기사는 링크 기준으로 한 번만 토큰화하고, 한 번만 DB에 저장합니다.
+    Args:
+        profiles (list[dict], optional): 분석할 프로필 목록. 없으면 database_manager.get_search_profiles()의 전체 프로필.
+        max_workers (int): 동시에 실행할 크롤링 스레드 수.
+        requests_per_second (float): 모든 프로필이 공유하는 초당 최대 요청 수.
+        ngram_range (tuple[int, int]): 트렌드 분석에 사용할 n-gram 범위.
+        save_to_db (bool): 수집한 기사를 articles 테이블에 저장할지 여부.
+        scoring (str): 트렌드 점수 방식 (trend_analyzer.SCORING_METHODS, 기본값은 단일 실행과 같은 TREND_SCORING 설정).
+    Returns:
+        dict[int, dict]: 프로필 ID -> {"profile": dict, "articles": list[dict], "trending_keywords": list[dict]}
+    """
+    if profiles is None:
+        profiles = database_manager.get_search_profiles()
+    if not profiles:
+        return {}
+
+    articles_by_profile = news_crawler.crawl_profiles_concurrently(profiles, max_workers=max_workers, requests_per_second=requests_per_second)
+
+    if save_to_db:
+        # 여러 프로필에 중복 수집된 기사는 처음 수집한 프로필 기준으로 한 번만 저장
+        saved_links = set()
+        for profile in profiles:
+            new_articles = [
+                article for article in articles_by_profile.get(profile['id'], [])
+                if article["링크"] not in saved_links
+            ]
+            saved_links.update(article["링크"] for article in new_articles)
+            database_manager.insert_articles_bulk(
+                (
+                    {
+                        "제목": article["제목"],
+                        "링크": article["링크"],
+                        "날짜": article["날짜"].strftime('%Y-%m-%d'),
+                        "내용": article["내용"]
+                    }
+                    for article in new_articles
+                ),
+                keyword=profile['keyword'],
+                profile_id=profile['id']
+            )
+
+    # 링크 -> 구간별 토큰 목록 캐시: 여러 프로필에 중복으로 수집된 기사는 한 번만 토큰화
+    token_cache = {}
+    results = {}
+    for profile in profiles:
+        articles = articles_by_profile.get(profile['id'], [])
+        results[profile['id']] = {
+            "profile": profile,
+            "articles": articles,
+            "trending_keywords": trend_analyzer.analyze_keyword_trends(
+                articles,
+                recent_days_period=profile['recent_trend_days'],
+                total_days_period=profile['total_search_days'],
+                ngram_range=ngram_range,
+                scoring=scoring,
+                token_cache=token_cache
+            )
+        }
+    return results
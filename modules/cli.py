@@ -0,0 +1,476 @@
+# modules/cli.py
+# 브라우저 없이 뉴스 트렌드 보고서를 생성하는 명령줄 진입점입니다. (cron, 컨테이너 배치 작업 등에서 사용)
+# 실행 예:
+#   python -m modules.cli run --profile 전기차 --output-dir artifacts --email a@example.com,b@example.com
+#   python -m modules.cli run --keyword 자율주행 --total-days 7 --recent-days 2 --max-pages 2
+#   python -m modules.cli profiles
+#   python -m modules.cli batch --profile 전기차 --profile 자율주행 --workers 4
+#   python -m modules.cli import-budget --budget-ms 2500
+#   python -m modules.cli index-benchmark --vectors 50000 --dim 768
+#   python -m modules.cli chunk-benchmark --file 표준약관.pdf
+#   python -m modules.cli extract-benchmark --file a.pdf --file b.pptx --workers 4
+#   python -m modules.cli trend-benchmark --articles 50000
+# Streamlit을 임포트하지 않으므로 웹 앱보다 빠르게 시작합니다.
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+from dotenv import load_dotenv
+
+from modules import analysis_pipeline
+from modules import data_exporter
+from modules import database_manager
+from modules import trend_analyzer
+
+DEFAULT_TOTAL_SEARCH_DAYS = 30 # 트렌드 분석 페이지의 기본값("1달")과 같음
+DEFAULT_RECENT_TREND_DAYS = 2
+DEFAULT_MAX_PAGES = 1
+DEFAULT_OUTPUT_DIR = "artifacts"
+
+# 웹 앱 첫 화면(랜딩 페이지)을 띄울 때 임포트되면 안 되는 무거운 모듈 (해당 페이지를 처음 열 때 임포트됨)
+HEAVY_MODULES = (
+    "langchain", "langchain_community", "tiktoken", "faiss", "sentence_transformers",
+    "torch", "transformers", "konlpy", "jpype", "altair"
+)
+DEFAULT_IMPORT_BUDGET_MS = 2500
+INDEX_TYPE_CHOICES = ("flat", "hnsw", "ivf_flat", "ivf_pq") # ann_index.INDEX_TYPES (도움말 표시용, 파서 생성 시 faiss를 임포트하지 않기 위해 따로 둠)
+IMPORT_BUDGET_TARGET = "import main_app, modules.landing_page" # 앱 시작 시 실제로 임포트되는 모듈
+
+
+class StageTimer:
+    """run_trend_analysis/run_report의 progress_callback으로 전달되어, 단계가 바뀔 때마다 이전 단계의 소요 시간을 기록합니다."""
+
+    def __init__(self, verbose: bool = True):
+        self.verbose = verbose
+        self.timings = {} # {단계: 소요 시간(초)}. 같은 단계가 여러 번 보고되면 합산
+        self._stage = None
+        self._started = None
+
+    def __call__(self, stage, message, fraction=None, level="info"):
+        if stage != self._stage:
+            self._close()
+            self._stage, self._started = stage, time.perf_counter()
+        if self.verbose and fraction is None: # 진행률 갱신은 출력하지 않음
+            print(f"[{level.upper()}] [{stage}] {message}", file=sys.stderr)
+
+    def _close(self):
+        if self._stage is not None:
+            self.timings[self._stage] = self.timings.get(self._stage, 0.0) + time.perf_counter() - self._started
+            self._stage = None
+
+    def finish(self) -> dict:
+        self._close()
+        return self.timings
+
+
+def _find_profile(name: str) -> dict | None:
+    """프리셋 이름으로 검색 프로필을 찾습니다. 이름이 같은 프리셋이 없으면 검색 키워드가 같은 프리셋을 찾습니다."""
+    profiles = database_manager.get_search_profiles()
+    for profile in profiles:
+        if profile['profile_name'] == name:
+            return profile
+    for profile in profiles:
+        if profile['keyword'] == name:
+            return profile
+    return None
+
+
+def _write_artifacts(output_dir: str, params: dict, outcome: dict) -> list[str]:
+    """실행 결과를 output_dir에 파일로 저장하고 저장한 파일 경로 목록을 반환합니다."""
+    os.makedirs(output_dir, exist_ok=True)
+    analysis = outcome["analysis"]
+    written = []
+
+    def write(filename, data, mode="w"):
+        path = os.path.join(output_dir, filename)
+        with open(path, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+            f.write(data)
+        written.append(path)
+
+    if analysis["report"]:
+        write("report.md", analysis["report"])
+    if outcome["report_excel"]:
+        write("report.xlsx", outcome["report_excel"], "wb")
+    if outcome["endorsement_text"]:
+        write("endorsement.txt", outcome["endorsement_text"])
+    write("trend_keywords.json", json.dumps({
+        "trending_keywords": analysis["trending_keywords"],
+        "displayed_keywords": analysis["displayed_keywords"],
+        "ai_selected_keywords": analysis["ai_selected_keywords"]
+    }, ensure_ascii=False, indent=2, default=str))
+    write("summarized_articles.json", json.dumps(analysis["summarized_articles"], ensure_ascii=False, indent=2, default=str))
+
+    end_date = datetime.strptime(params["end_date"], '%Y-%m-%d')
+    start_date = end_date - timedelta(days=params["total_search_days"] - 1)
+    articles = database_manager.get_articles_by_date_range(start_date, end_date, keyword=params["keyword"])
+    write("articles.txt", data_exporter.export_articles_to_txt(articles))
+    return written
+
+
+def run_command(args) -> int:
+    load_dotenv()
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        print("오류: 환경 변수 GEMINI_API_KEY가 설정되지 않았습니다.", file=sys.stderr)
+        return 1
+    database_manager.init_db()
+
+    profile_id = None
+    keyword, total_days, recent_days, max_pages = args.keyword, args.total_days, args.recent_days, args.max_pages
+    if args.profile:
+        profile = _find_profile(args.profile)
+        if not profile:
+            print(f"오류: '{args.profile}' 프리셋을 찾을 수 없습니다. 'python -m modules.cli profiles'로 목록을 확인하세요.", file=sys.stderr)
+            return 1
+        profile_id = profile['id']
+        # 명령줄에서 지정한 값이 프리셋 값보다 우선
+        keyword = profile['keyword']
+        total_days = total_days or profile['total_search_days']
+        recent_days = recent_days or profile['recent_trend_days']
+        max_pages = max_pages or profile['max_naver_search_pages_per_day']
+    total_days = total_days or DEFAULT_TOTAL_SEARCH_DAYS
+    recent_days = recent_days or DEFAULT_RECENT_TREND_DAYS
+    max_pages = max_pages or DEFAULT_MAX_PAGES
+    if recent_days >= total_days:
+        print("오류: --recent-days는 --total-days보다 작아야 합니다.", file=sys.stderr)
+        return 1
+    end_date = None
+    if args.end_date:
+        try:
+            end_date = datetime.strptime(args.end_date, '%Y-%m-%d')
+        except ValueError:
+            print(f"오류: --end-date는 YYYY-MM-DD 형식이어야 합니다: {args.end_date}", file=sys.stderr)
+            return 1
+        if end_date.date() > datetime.now().date():
+            print("오류: --end-date는 오늘 이후일 수 없습니다.", file=sys.stderr)
+            return 1
+
+    recipient_emails = [e.strip() for e in (args.email or "").split(',') if e.strip()]
+    email_config = None
+    if recipient_emails:
+        email_config = analysis_pipeline.load_email_config()
+        if not email_config:
+            print("오류: 이메일을 보내려면 SENDER_EMAIL, SENDER_PASSWORD, SMTP_SERVER, SMTP_PORT를 설정해야 합니다.", file=sys.stderr)
+            return 1
+
+    params = analysis_pipeline.build_run_params(keyword, total_days, recent_days, max_pages,
+                                                end_date=end_date, profile_id=profile_id, perspective=args.perspective, scoring=args.scoring)
+    timer = StageTimer(verbose=not args.quiet)
+    started = time.perf_counter()
+    outcome = analysis_pipeline.run_report(
+        params,
+        api_key,
+        recipient_emails=recipient_emails,
+        email_config=email_config,
+        with_endorsement=not args.no_endorsement,
+        run_id=args.run_id,
+        resume=not args.no_resume,
+        progress_callback=timer
+    )
+    timings = timer.finish()
+    total_seconds = time.perf_counter() - started
+    analysis = outcome["analysis"]
+
+    output_dir = os.path.join(args.output_dir, f"{keyword}_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    written = _write_artifacts(output_dir, params, outcome)
+    summary = {
+        "run_id": analysis["run_id"],
+        "params": params,
+        "completed": analysis["completed"],
+        "failed_stages": analysis["failed_stages"],
+        "resumed_stages": analysis["resumed_stages"],
+        "report_sent": outcome["report_sent"],
+        "endorsement_sent": outcome["endorsement_sent"],
+        "stage_seconds": {stage: round(seconds, 3) for stage, seconds in timings.items()},
+        "total_seconds": round(total_seconds, 3)
+    }
+    summary_path = os.path.join(output_dir, "run.json")
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    written.append(summary_path)
+
+    print(f"\n실행 ID: {analysis['run_id']}" + (f" (이어서 실행한 단계: {', '.join(analysis['resumed_stages'])})" if analysis['resumed_stages'] else ""))
+    print("단계별 소요 시간:")
+    for stage, seconds in timings.items():
+        print(f"  {stage:<26} {seconds:8.2f}s")
+    print(f"  {'합계':<26} {total_seconds:8.2f}s")
+    if recipient_emails:
+        print(f"이메일 전송: 보고서 {'성공' if outcome['report_sent'] else '실패'}, 특약 {'성공' if outcome['endorsement_sent'] else '실패/생략'}")
+    print("저장된 파일:")
+    for path in written:
+        print(f"  {path}")
+    if not analysis["completed"]:
+        print(f"경고: 일부 단계가 실패했습니다 ({', '.join(analysis['failed_stages'])}). 같은 조건으로 다시 실행하면 실패한 단계부터 이어서 진행합니다.", file=sys.stderr)
+        return 2
+    return 0
+
+
+def profiles_command(args) -> int:
+    database_manager.init_db()
+    profiles = database_manager.get_search_profiles()
+    if not profiles:
+        print("저장된 검색 프리셋이 없습니다.")
+        return 0
+    for profile in profiles:
+        print(f"{profile['profile_name']}\t키워드={profile['keyword']}\t기간={profile['total_search_days']}일\t"
+              f"최근={profile['recent_trend_days']}일\t페이지={profile['max_naver_search_pages_per_day']}")
+    return 0
+
+
+def batch_command(args) -> int:
+    """여러 검색 프리셋을 한 번의 크롤링 패스로 수집하고 프리셋별 트렌드 키워드를 출력합니다. (AI 단계 없이 트렌드 분석까지만 실행)"""
+    from modules import batch_analyzer
+
+    database_manager.init_db()
+    if args.profile:
+        profiles = []
+        for name in args.profile:
+            profile = _find_profile(name)
+            if not profile:
+                print(f"오류: '{name}' 프리셋을 찾을 수 없습니다. 'python -m modules.cli profiles'로 목록을 확인하세요.", file=sys.stderr)
+                return 1
+            profiles.append(profile)
+    else:
+        profiles = database_manager.get_search_profiles()
+    if not profiles:
+        print("저장된 검색 프리셋이 없습니다.")
+        return 0
+
+    started = time.perf_counter()
+    results = batch_analyzer.run_batch_trend_analysis(profiles, max_workers=args.workers, requests_per_second=args.rps,
+                                                      save_to_db=not args.no_save, scoring=args.scoring)
+    print(f"프리셋 {len(results)}개 일괄 분석 완료 ({time.perf_counter() - started:.1f}s)")
+    for result in results.values():
+        profile = result["profile"]
+        keywords = result["trending_keywords"][:args.top]
+        print(f"\n[{profile['profile_name']}] 키워드={profile['keyword']}, 기사 {len(result['articles'])}개, 트렌드 키워드 {len(result['trending_keywords'])}개")
+        for kw in keywords:
+            score = f", 점수 {kw['score']:.2f}" if 'score' in kw else ""
+            print(f"  {kw['keyword']}\t최근 {kw['recent_freq']}회 / 이전 {kw['past_freq']}회{score}")
+    return 0
+
+
+def _measure_imports(statement: str) -> dict[str, tuple[int, int]]:
+    """
+    새 파이썬 프로세스에서 python -X importtime으로 statement를 실행하고 {모듈 이름: (자체 시간 us, 누적 시간 us)}를 반환합니다.
+    (이미 임포트된 모듈이 섞이지 않도록 현재 프로세스가 아닌 별도 프로세스에서 측정)
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=project_root, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"종료 코드 {result.returncode}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        # 형식: "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue # 머리글 행
+        timings[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return timings
+
+
+def import_budget_command(args) -> int:
+    """앱 시작 시 임포트 시간이 예산을 넘거나 무거운 모듈이 임포트되면 실패(종료 코드 1)합니다. (CI에서 시작 시간 회귀 확인용)"""
+    try:
+        timings = _measure_imports(args.statement)
+    except RuntimeError as e:
+        print(f"오류: 임포트 시간 측정 실패 - {e}", file=sys.stderr)
+        return 1
+    total_ms = sum(self_us for self_us, _ in timings.values()) / 1000
+    heavy = sorted(name for name in timings if name.split(".")[0] in HEAVY_MODULES)
+
+    print(f"'{args.statement}' 임포트 시간: {total_ms:.1f}ms (예산 {args.budget_ms}ms), 모듈 {len(timings)}개")
+    print("누적 시간이 긴 모듈:")
+    for name, (_, cumulative_us) in sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:args.top]:
+        print(f"  {name:<40} {cumulative_us / 1000:8.1f}ms")
+
+    failed = False
+    if heavy:
+        print(f"실패: 시작 시 임포트되면 안 되는 모듈이 임포트되었습니다: {', '.join(heavy)}", file=sys.stderr)
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"실패: 임포트 시간 {total_ms:.1f}ms가 예산 {args.budget_ms}ms를 넘었습니다.", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+def index_benchmark_command(args) -> int:
+    """문서 검색 색인 종류별(flat/HNSW/IVF-Flat/IVF-PQ) 구축 시간, 메모리, 질의 지연 시간, recall@k를 비교합니다."""
+    from modules import ann_index # numpy/faiss는 이 명령에서만 필요
+
+    vectors = None
+    if args.from_cache:
+        import numpy as np
+
+        database_manager.init_db()
+        stored = database_manager.get_cached_embedding_vectors(limit=args.vectors)
+        if not stored:
+            print("오류: 저장된 문서 임베딩이 없습니다. 문서 분석 페이지에서 문서를 먼저 처리하세요.", file=sys.stderr)
+            return 1
+        vectors = np.vstack([np.frombuffer(vector, dtype="float32") for vector in stored])
+        print(f"저장된 문서 임베딩 {len(vectors)}개로 측정합니다. ({vectors.shape[1]}차원)")
+    results = ann_index.benchmark_index_types(
+        vectors, vector_count=args.vectors, dim=args.dim, query_count=args.queries, k=args.k,
+        index_types=tuple(t.strip() for t in args.types.split(",") if t.strip())
+    )
+
+    print(f"{'색인':<10} {'구축(s)':>9} {'학습(s)':>9} {'바이트/벡터':>11} {'메모리(MB)':>11} {'평균(ms)':>9} {'p95(ms)':>9} {f'recall@{args.k}':>10}")
+    for result in results:
+        print(f"{result['index_type']:<10} {result['build_seconds']:9.2f} {result['train_seconds']:9.2f} {result['bytes_per_vector']:11.0f} "
+              f"{result['memory_mb']:11.1f} {result['query_ms_avg']:9.3f} {result['query_ms_p95']:9.3f} {result['recall_at_k']:10.3f}")
+    if results:
+        print(f"벡터 {results[0]['vectors']}개 기준 자동 선택: {ann_index.choose_index_type(results[0]['vectors'])}")
+    return 0
+
+
+class _LocalFile:
+    """로컬 파일을 Streamlit 업로드 파일처럼(name, getvalue) 다루기 위한 래퍼"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = os.path.basename(path)
+
+    @property
+    def size(self) -> int:
+        return os.path.getsize(self.path)
+
+    def getvalue(self) -> bytes:
+        with open(self.path, "rb") as f:
+            return f.read()
+
+
+def chunk_benchmark_command(args) -> int:
+    """문서의 청크 분할 시간을 이전 방식(호출마다 인코더 조회 + 길이 캐시 없음)과 비교합니다."""
+    from modules import document_processor
+
+    if args.file:
+        docs = document_processor.get_text([_LocalFile(path) for path in args.file])
+        if not docs:
+            print("오류: 문서에서 텍스트를 추출하지 못했습니다.", file=sys.stderr)
+            return 1
+    else:
+        from langchain.schema import Document
+
+        # 약관처럼 조항 단위 문단이 이어지는 합성 문서
+        clause = ("제{n}조 (보험금의 지급사유) 회사는 피보험자에게 다음 중 어느 하나의 사유가 발생한 경우에는 "
+                  "보험수익자에게 약정한 보험금을 지급합니다. 1. 보험기간 중 상해의 직접결과로써 사망한 경우 "
+                  "2. 보험기간 중 진단 확정된 질병으로 입원한 경우 (Coverage clause {n}, see Schedule A.)\n\n")
+        docs = [Document(page_content="".join(clause.format(n=page * 10 + i) for i in range(10)), metadata={"page": page})
+                for page in range(args.pages)]
+    result = document_processor.benchmark_chunking(docs)
+    print(f"페이지 {result['pages']}개 → 청크 {result['chunks']}개")
+    print(f"  이전 방식: {result['baseline_seconds']:.3f}s (길이 계산 {result['length_calls']}회)")
+    print(f"  현재 방식: {result['cached_seconds']:.3f}s (길이 캐시 적중 {result['length_cache_hits']}회)")
+    print(f"  속도 향상: {result['speedup']:.1f}배, 분할 결과 동일: {'예' if result['same_chunks'] else '아니오'}")
+    return 0
+
+
+def extract_benchmark_command(args) -> int:
+    """문서 텍스트 추출 시간을 순차 추출과 병렬 추출(프로세스 풀)로 비교합니다."""
+    from modules import document_extraction
+
+    missing = [path for path in args.file if not os.path.isfile(path)]
+    if missing:
+        print(f"오류: 파일을 찾을 수 없습니다: {', '.join(missing)}", file=sys.stderr)
+        return 1
+    result = document_extraction.benchmark_extraction(args.file, args.workers)
+    print(f"문서 {result['files']}개, 페이지 {result['pages']}개")
+    print(f"  순차 추출: {result['serial_seconds']:.2f}s")
+    print(f"  병렬 추출: {result['parallel_seconds']:.2f}s (프로세스 {result['workers']}개)")
+    print(f"  속도 향상: {result['speedup']:.1f}배, 추출 결과 동일: {'예' if result['same_pages'] else '아니오'}")
+    return 0
+
+
+def trend_benchmark_command(args) -> int:
+    """키워드 트렌드 분석의 정확 집계와 근사 집계(approximate=True)를 시간과 최대 메모리 사용량으로 비교합니다."""
+    result = trend_analyzer.benchmark_trend_modes(article_count=args.articles, max_candidates=args.max_candidates)
+    print(f"합성 기사 {result['articles']}개")
+    print(f"  정확 집계: {result['exact_seconds']:.2f}s, 최대 메모리 {result['exact_peak_mb']:.1f}MB")
+    print(f"  근사 집계: {result['approximate_seconds']:.2f}s, 최대 메모리 {result['approximate_peak_mb']:.1f}MB")
+    print(f"  메모리 절감: {result['exact_peak_mb'] / max(result['approximate_peak_mb'], 1e-9):.1f}배, "
+          f"상위 트렌드 키워드 동일: {'예' if result['same_top'] else '아니오'}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m modules.cli", description="뉴스 트렌드 보고서 명령줄 도구")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="뉴스 수집부터 보고서 생성(및 이메일 전송)까지 실행")
+    target = run_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--profile", help="저장된 검색 프리셋 이름 (또는 프리셋의 검색 키워드)")
+    target.add_argument("--keyword", help="검색할 뉴스 키워드 (프리셋 없이 실행)")
+    run_parser.add_argument("--total-days", type=int, help=f"총 검색 기간 (일, 기본값 {DEFAULT_TOTAL_SEARCH_DAYS} 또는 프리셋 값)")
+    run_parser.add_argument("--recent-days", type=int, help=f"최신 트렌드로 볼 최근 기간 (일, 기본값 {DEFAULT_RECENT_TREND_DAYS} 또는 프리셋 값)")
+    run_parser.add_argument("--max-pages", type=int, help=f"날짜별 네이버 뉴스 검색 페이지 수 (기본값 {DEFAULT_MAX_PAGES} 또는 프리셋 값)")
+    run_parser.add_argument("--end-date", help="검색 기간의 마지막 날 YYYY-MM-DD (기본값: 오늘). 최근/이전 트렌드 기간도 이 날을 기준으로 나눔")
+    run_parser.add_argument("--perspective", default=analysis_pipeline.DEFAULT_PERSPECTIVE, help="AI 키워드 선별 관점")
+    run_parser.add_argument("--scoring", choices=trend_analyzer.SCORING_METHODS, default=analysis_pipeline.DEFAULT_TREND_SCORING,
+                            help="트렌드 점수 방식 (ratio: 빈도 증가율, loglik/zscore: 기사 수로 정규화한 점수)")
+    run_parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR, help="결과 파일을 저장할 상위 디렉터리")
+    run_parser.add_argument("--email", help="보고서를 받을 이메일 주소 (콤마로 구분). 지정하지 않으면 전송하지 않음")
+    run_parser.add_argument("--no-endorsement", action="store_true", help="보고서 기반 특약 생성을 건너뜀")
+    run_parser.add_argument("--run-id", help="이어서 실행할 실행 ID")
+    run_parser.add_argument("--no-resume", action="store_true", help="같은 조건의 미완료 실행이 있어도 처음부터 실행")
+    run_parser.add_argument("--quiet", action="store_true", help="단계별 진행 메시지를 출력하지 않음")
+    run_parser.set_defaults(handler=run_command)
+
+    profiles_parser = subparsers.add_parser("profiles", help="저장된 검색 프리셋 목록 출력")
+    profiles_parser.set_defaults(handler=profiles_command)
+
+    batch_parser = subparsers.add_parser("batch", help="여러 검색 프리셋을 한 번에 수집하고 프리셋별 트렌드 키워드 출력")
+    batch_parser.add_argument("--profile", action="append", help="분석할 프리셋 이름 또는 검색 키워드 (여러 번 지정 가능). 생략하면 모든 프리셋")
+    batch_parser.add_argument("--workers", type=int, default=4, help="동시에 실행할 크롤링 스레드 수")
+    batch_parser.add_argument("--rps", type=float, default=2.0, help="모든 프리셋이 공유하는 초당 최대 요청 수")
+    batch_parser.add_argument("--scoring", choices=trend_analyzer.SCORING_METHODS, default=analysis_pipeline.DEFAULT_TREND_SCORING, help="트렌드 점수 방식")
+    batch_parser.add_argument("--top", type=int, default=10, help="프리셋마다 출력할 트렌드 키워드 수")
+    batch_parser.add_argument("--no-save", action="store_true", help="수집한 기사를 DB에 저장하지 않음")
+    batch_parser.set_defaults(handler=batch_command)
+
+    budget_parser = subparsers.add_parser("import-budget", help="웹 앱 시작 시 임포트 시간과 무거운 모듈 임포트 여부 확인")
+    budget_parser.add_argument("--budget-ms", type=float, default=DEFAULT_IMPORT_BUDGET_MS, help="허용하는 전체 임포트 시간 (밀리초)")
+    budget_parser.add_argument("--statement", default=IMPORT_BUDGET_TARGET, help="측정할 파이썬 임포트 문")
+    budget_parser.add_argument("--top", type=int, default=15, help="출력할 상위 모듈 수")
+    budget_parser.set_defaults(handler=import_budget_command)
+
+    benchmark_parser = subparsers.add_parser("index-benchmark", help="문서 검색 색인 종류별 성능(지연 시간, 메모리, recall) 비교")
+    benchmark_parser.add_argument("--vectors", type=int, default=50_000, help="벡터 수 (--from-cache면 최대 벡터 수)")
+    benchmark_parser.add_argument("--dim", type=int, default=768, help="합성 벡터 차원 (ko-sroberta-multitask는 768)")
+    benchmark_parser.add_argument("--queries", type=int, default=200, help="질의 수")
+    benchmark_parser.add_argument("-k", type=int, default=10, help="recall@k의 k")
+    benchmark_parser.add_argument("--types", default=",".join(INDEX_TYPE_CHOICES), help="비교할 색인 종류 (콤마로 구분, flat은 항상 기준선으로 포함)")
+    benchmark_parser.add_argument("--from-cache", action="store_true", help="합성 벡터 대신 임베딩 캐시에 저장된 실제 문서 벡터 사용")
+    benchmark_parser.set_defaults(handler=index_benchmark_command)
+
+    chunk_parser = subparsers.add_parser("chunk-benchmark", help="문서 청크 분할 시간 측정 (이전 방식과 비교)")
+    chunk_parser.add_argument("--file", action="append", help="측정할 문서 (pdf/docx/pptx/txt, 여러 번 지정 가능). 생략하면 합성 약관 문서 사용")
+    chunk_parser.add_argument("--pages", type=int, default=300, help="합성 문서의 페이지 수")
+    chunk_parser.set_defaults(handler=chunk_benchmark_command)
+
+    extract_parser = subparsers.add_parser("extract-benchmark", help="문서 텍스트 추출 시간 측정 (순차 추출과 병렬 추출 비교)")
+    extract_parser.add_argument("--file", action="append", required=True, help="측정할 문서 (pdf/docx/pptx/txt, 여러 번 지정 가능)")
+    extract_parser.add_argument("--workers", type=int, help="추출 프로세스 수 (기본값: EXTRACTION_WORKERS 또는 CPU 수와 4 중 작은 값)")
+    extract_parser.set_defaults(handler=extract_benchmark_command)
+
+    trend_parser = subparsers.add_parser("trend-benchmark", help="키워드 트렌드 분석 시간/메모리 측정 (정확 집계와 근사 집계 비교)")
+    trend_parser.add_argument("--articles", type=int, default=50_000, help="합성 기사 수")
+    trend_parser.add_argument("--max-candidates", type=int, default=5000, help="근사 집계에서 유지할 후보 키워드 수의 상한")
+    trend_parser.set_defaults(handler=trend_benchmark_command)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
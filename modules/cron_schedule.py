@@ -0,0 +1,122 @@
+# modules/cron_schedule.py
+# 예약 작업의 실행 시각을 계산하는 cron 형식 일정 파서입니다.
+# 형식: "분 시 일 월 요일" (예: "0 9 * * 1-5" = 평일 09:00). 요일은 0(일)~6(토), 7도 일요일로 취급합니다.
+# 시각은 작업에 지정된 시간대(zoneinfo 이름)의 현지 시각으로 해석하고, 계산 결과는 UTC로 반환합니다.
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+DEFAULT_TIMEZONE = "Asia/Seoul"
+MAX_LOOKAHEAD_DAYS = 366 * 5 # 이 기간 안에 실행 시각이 없으면 (예: 2월 30일) 실행되지 않는 일정으로 봄
+
+# 화면의 요일 선택지와 cron 요일 번호의 대응
+WEEKDAY_CRON_VALUES = {"매일": "*", "월요일": "1", "화요일": "2", "수요일": "3", "목요일": "4", "금요일": "5", "토요일": "6", "일요일": "0"}
+
+_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)] # 분, 시, 일, 월, 요일
+
+
+def _parse_field(field: str, low: int, high: int) -> set[int]:
+    """cron 필드 하나("*", "1,15", "1-5", "*/10", "0-30/5")를 값 집합으로 바꿉니다."""
+    values = set()
+    for part in field.split(','):
+        range_part, _, step_part = part.partition('/')
+        step = int(step_part) if step_part else 1
+        if range_part == '*':
+            start, end = low, high
+        elif '-' in range_part:
+            start, end = map(int, range_part.split('-', 1))
+        else:
+            start = end = int(range_part)
+            if step_part:
+                end = high
+        if step < 1 or start < low or end > high or start > end:
+            raise ValueError(f"cron 필드 '{field}'의 값이 범위({low}-{high})를 벗어났습니다.")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def parse_cron(expr: str) -> tuple:
+    """
+    cron 식을 (분, 시, 일, 월, 요일, 일 제한 여부, 요일 제한 여부) 튜플로 파싱합니다.
+    잘못된 식이면 ValueError를 발생시킵니다.
+    """
+    fields = expr.split()
+    if len(fields) != 5:
+        raise ValueError(f"cron 식은 '분 시 일 월 요일' 5개 필드여야 합니다: '{expr}'")
+    minutes, hours, days, months, weekdays = (
+        _parse_field(field, low, high) for field, (low, high) in zip(fields, _FIELD_RANGES)
+    )
+    if 7 in weekdays:
+        weekdays = (weekdays - {7}) | {0}
+    return minutes, hours, days, months, weekdays, fields[2] != '*', fields[4] != '*'
+
+
+def get_timezone(name: str | None) -> ZoneInfo:
+    """시간대 이름을 ZoneInfo로 바꿉니다. 알 수 없는 이름이면 ValueError."""
+    try:
+        return ZoneInfo(name or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"알 수 없는 시간대입니다: {name}") from e
+
+
+def _day_matches(day, parsed: tuple) -> bool:
+    """날짜가 cron 식의 일/월/요일 조건에 맞는지 확인합니다."""
+    _, _, days, months, weekdays, day_restricted, weekday_restricted = parsed
+    if day.month not in months:
+        return False
+    day_match = day.day in days
+    weekday_match = (day.isoweekday() % 7) in weekdays # isoweekday: 월=1 ... 일=7 → cron: 일=0
+    # cron 규칙: 일과 요일이 둘 다 제한되어 있으면 둘 중 하나만 맞아도 실행
+    if day_restricted and weekday_restricted:
+        return day_match or weekday_match
+    return day_match and weekday_match
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def next_run_after(expr: str, after: datetime, tz_name: str | None = DEFAULT_TIMEZONE) -> datetime | None:
+    """
+    after 이후 처음 돌아오는 실행 시각을 UTC(timezone-aware)로 반환합니다. 없으면 None.
+    after에 시간대 정보가 없으면 UTC로 간주합니다.
+    """
+    parsed = parse_cron(expr)
+    tz = get_timezone(tz_name)
+    after = _as_utc(after)
+    times = [(hour, minute) for hour in sorted(parsed[1]) for minute in sorted(parsed[0])]
+
+    day = after.astimezone(tz).date()
+    for _ in range(MAX_LOOKAHEAD_DAYS):
+        if _day_matches(day, parsed):
+            for hour, minute in times:
+                candidate = datetime(day.year, day.month, day.day, hour, minute, tzinfo=tz).astimezone(timezone.utc)
+                if candidate > after:
+                    return candidate
+        day += timedelta(days=1)
+    return None
+
+
+def latest_run_between(expr: str, start: datetime, end: datetime, tz_name: str | None = DEFAULT_TIMEZONE) -> datetime | None:
+    """start 이상 end 이하인 실행 시각 중 가장 늦은 것을 UTC로 반환합니다. 없으면 None. (놓친 실행 보충용)"""
+    parsed = parse_cron(expr)
+    tz = get_timezone(tz_name)
+    start, end = _as_utc(start), _as_utc(end)
+    times = [(hour, minute) for hour in sorted(parsed[1], reverse=True) for minute in sorted(parsed[0], reverse=True)]
+
+    first_day = start.astimezone(tz).date()
+    day = end.astimezone(tz).date()
+    while day >= first_day:
+        if _day_matches(day, parsed):
+            for hour, minute in times:
+                candidate = datetime(day.year, day.month, day.day, hour, minute, tzinfo=tz).astimezone(timezone.utc)
+                if start <= candidate <= end:
+                    return candidate
+        day -= timedelta(days=1)
+    return None
+
+
+def cron_from_day_and_time(schedule_day: str, schedule_time: str) -> str:
+    """화면에서 고른 반복 요일("매일", "월요일" 등)과 시각("HH:MM")을 cron 식으로 바꿉니다."""
+    hour, minute = map(int, schedule_time.split(':'))
+    return f"{minute} {hour} * * {WEEKDAY_CRON_VALUES[schedule_day]}"
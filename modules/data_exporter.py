@@ -5,12 +5,13 @@ from io import BytesIO
 from datetime import datetime
 import xlsxwriter # xlsxwriter 임포트 (Pandas의 to_excel 엔진으로 사용)
 import re # 정규 표현식을 위해 추가
+from typing import Iterable
 
-def export_articles_to_txt(articles_list: list[dict], file_prefix: str = "news_articles") -> str:
+def export_articles_to_txt(articles_list: Iterable[dict], file_prefix: str = "news_articles") -> str:
     """
     기사 목록을 텍스트 형식으로 변환합니다.
     Args:
-        articles_list (list[dict]): 기사 데이터 목록.
+        articles_list (Iterable[dict]): 기사 데이터 목록. (제너레이터도 가능)
         file_prefix (str): 파일 이름 접두사.
     Returns:
         str: 텍스트 파일 내용.
@@ -1,15 +1,71 @@
 # modules/database_manager.py
 
+import os
 import sqlite3
-from datetime import datetime
-import streamlit as st # Streamlit의 st.session_state, st.success, st.error 등을 사용하기 위해 임시로 import.
-                        # 실제 프로덕션에서는 이 로깅 부분을 다른 방식으로 처리하는 것이 좋습니다.
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable
 
 DB_FILE = 'news_data.db'
 
-def init_db():
-    """데이터베이스를 초기화하고 테이블을 생성합니다."""
-    conn = sqlite3.connect(DB_FILE)
+# 연결 튜닝 설정
+SQLITE_TIMEOUT_SECONDS = 30 # 다른 연결이 쓰기 잠금을 잡고 있을 때 대기할 최대 시간
+SQLITE_MMAP_SIZE = 256 * 1024 * 1024 # 메모리 매핑 I/O 크기 (256MB)
+
+INTERMEDIATE_SUMMARY_TTL_HOURS = 24 # 이 시간이 지난 중간 요약은 완료되지 않은 실행의 것이라도 삭제
+PIPELINE_RUN_TTL_HOURS = 48 # 이 시간이 지난 분석 실행 기록과 단계별 체크포인트는 삭제
+PIPELINE_RUN_LEASE_MINUTES = 30 # running 상태인 실행이 이 시간 동안 갱신(체크포인트/하트비트)이 없으면 중단된 것으로 보고 이어서 실행할 수 있음
+JOB_LEASE_MINUTES = 10 # 실행 중인 작업의 임대 기간. 워커가 주기적으로 연장하며, 연장되지 않고 만료되면 워커가 죽은 것으로 보고 다시 대기열에 넣음
+JOB_MAX_ATTEMPTS = 3 # 작업을 가져간 횟수가 이 값에 이른 뒤 임대가 만료되면 다시 넣지 않고 실패로 처리
+EMBEDDING_CACHE_MAX_BYTES = 512 * 1024 * 1024 # 임베딩 캐시 벡터의 총 크기 상한. 넘으면 가장 오래 쓰이지 않은 벡터부터 삭제
+
+_thread_local = threading.local()
+
+
+def get_connection(db_file: str | None = None) -> sqlite3.Connection:
+    """
+    현재 스레드 전용 SQLite 연결을 반환합니다. 스레드마다 DB 파일별로 한 번만 연결하고 이후에는 재사용합니다.
+    db_file을 주면 DB_FILE 대신 그 파일에 연결합니다. (벤치마크 등 임시 DB용)
+    Streamlit은 세션의 스크립트를 각자의 스레드에서 실행하므로, 연결을 스레드 단위로 두면
+    세션끼리 연결을 공유하지 않으면서도 기사 수천 건을 저장할 때 매번 연결을 새로 열지 않아도 됩니다.
+    WAL 모드를 사용하므로 한 세션이 쓰는 동안에도 다른 세션의 읽기가 막히지 않습니다.
+    """
+    connections = getattr(_thread_local, "connections", None)
+    if connections is None:
+        connections = _thread_local.connections = {}
+    db_file = db_file or DB_FILE
+    conn = connections.get(db_file)
+    if conn is None:
+        conn = sqlite3.connect(db_file, timeout=SQLITE_TIMEOUT_SECONDS)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL") # WAL 모드에서는 NORMAL로도 손상 없이 안전
+        conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        connections[db_file] = conn
+    return conn
+
+
+def close_connection(db_file: str | None = None):
+    """현재 스레드가 열어 둔 모든 SQLite 연결을 닫습니다. (프로세스/워커 종료 시 사용) db_file을 주면 그 파일의 연결만 닫습니다."""
+    connections = getattr(_thread_local, "connections", None)
+    if not connections:
+        return
+    if db_file is not None:
+        conn = connections.pop(db_file, None)
+        if conn is not None:
+            conn.close()
+        return
+    for conn in connections.values():
+        conn.close()
+    connections.clear()
+
+
+def init_db(db_file: str | None = None):
+    """데이터베이스를 초기화하고 테이블을 생성합니다. (db_file: get_connection 참고)"""
+    conn = get_connection(db_file)
     c = conn.cursor()
     c.execute('''
         CREATE TABLE IF NOT EXISTS articles (
@@ -71,56 +127,570 @@ def init_db():
         )
     ''')
     conn.commit()
-    conn.close()
+    _apply_migrations(conn)
+
+# --- 스키마 마이그레이션 ---
+# 각 마이그레이션은 한 번만 실행되며, 적용된 버전은 PRAGMA user_version에 기록됩니다.
+# 새 마이그레이션은 MIGRATIONS 목록 끝에 추가합니다. (기존 항목의 순서/내용은 변경하지 않음)
+
+def _migration_001_article_dates_and_indexes(c: sqlite3.Cursor):
+    """기사 테이블에 검색어/프로필/정규화된 날짜 컬럼과 조회용 인덱스를 추가합니다."""
+    c.execute("ALTER TABLE articles ADD COLUMN keyword TEXT") # 기사를 수집한 검색어
+    c.execute("ALTER TABLE articles ADD COLUMN profile_id INTEGER") # 기사를 수집한 검색 프로필 (있는 경우)
+    # 자유 형식 TEXT였던 date를 ISO-8601(YYYY-MM-DD)로 정규화한 컬럼. 문자열 비교가 곧 날짜 비교가 됩니다.
+    c.execute("ALTER TABLE articles ADD COLUMN published_date DATE")
+    c.execute("UPDATE articles SET published_date = date(replace(substr(trim(date), 1, 10), '.', '-'))")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_published_date ON articles (published_date DESC, crawl_timestamp DESC)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_crawl_timestamp ON articles (crawl_timestamp)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_keyword_date ON articles (keyword, published_date)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_articles_profile_date ON articles (profile_id, published_date)")
+
+def _migration_002_articles_fts(c: sqlite3.Cursor):
+    """기사 제목/내용 전문 검색용 FTS5 인덱스를 만들고 기존 기사로 채웁니다."""
+    try:
+        # rowid = articles.id. (migration 009에서 원문을 그대로 색인하는 external content 테이블로 바뀜)
+        c.execute("CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(title, content, tokenize = 'unicode61')")
+    except sqlite3.OperationalError as e:
+        # FTS5 없이 빌드된 SQLite에서는 search_articles가 LIKE 검색으로 대체됩니다.
+        print(f"경고: FTS5를 사용할 수 없어 전문 검색 인덱스를 건너뜁니다 - {e}")
+        return
+    c.execute("SELECT id, title, content FROM articles")
+    while True:
+        rows = c.fetchmany(500)
+        if not rows:
+            break
+        c.connection.executemany(
+            "INSERT INTO articles_fts (rowid, title, content) VALUES (?, ?, ?)",
+            [(article_id, _fts_document(title), _fts_document(content)) for article_id, title, content in rows]
+        )
+
+def _migration_003_run_scoped_intermediate_summaries(c: sqlite3.Cursor):
+    """중간 요약을 실행(run_id) 단위로 구분하고, 이어서 실행할 때 입력이 같은지 확인할 해시를 저장합니다."""
+    c.execute("ALTER TABLE intermediate_summaries ADD COLUMN run_id TEXT")
+    c.execute("ALTER TABLE intermediate_summaries ADD COLUMN input_hash TEXT")
+    c.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_intermediate_summaries_run_batch ON intermediate_summaries (run_id, batch_id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_intermediate_summaries_timestamp ON intermediate_summaries (timestamp)")
+
+def _migration_004_pipeline_checkpoints(c: sqlite3.Cursor):
+    """분석 파이프라인 실행 기록과 단계별 체크포인트 테이블을 만듭니다."""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS pipeline_runs (
+            run_id TEXT PRIMARY KEY,
+            params TEXT NOT NULL, -- 실행 조건 (JSON, 키 정렬). 같은 조건의 미완료 실행을 찾아 이어서 진행할 때 사용
+            status TEXT NOT NULL, -- running / completed / failed
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    ''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_pipeline_runs_params ON pipeline_runs (params, status, created_at)")
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS pipeline_checkpoints (
+            run_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            payload TEXT NOT NULL, -- 단계 결과 (JSON)
+            timestamp TEXT NOT NULL,
+            PRIMARY KEY (run_id, stage)
+        )
+    ''')
+
+def _migration_005_scheduled_task_runs(c: sqlite3.Cursor):
+    """예약 작업 실행 기록 테이블을 만듭니다. (task_id, scheduled_for)가 유일하므로 같은 회차를 두 워커가 동시에 실행하지 못합니다."""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS scheduled_task_runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            scheduled_for TEXT NOT NULL, -- 실행 회차 (예약된 실행 시각, UTC "YYYY-MM-DD HH:MM")
+            status TEXT NOT NULL, -- running / succeeded / failed
+            worker_id TEXT NOT NULL, -- 실행을 가져간 워커 ("호스트:PID")
+            started_at TEXT NOT NULL,
+            finished_at TEXT,
+            report_sent INTEGER NOT NULL DEFAULT 0,
+            endorsement_sent INTEGER NOT NULL DEFAULT 0,
+            message TEXT,
+            UNIQUE (task_id, scheduled_for)
+        )
+    ''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_scheduled_task_runs_started_at ON scheduled_task_runs (started_at)")
+
+def _migration_006_job_queue_and_cron_schedules(c: sqlite3.Cursor):
+    """
+    여러 예약 작업을 둘 수 있도록 예약 작업에 cron 일정/시간대/우선순위 컬럼을 추가하고, 실행 기록을 작업 큐(job_queue)로 옮깁니다.
+    기존 예약(UTC "HH:MM" + 요일)은 한국 시간(Asia/Seoul, UTC+9 고정) 기준 cron 식으로 변환합니다.
+    """
+    c.execute("ALTER TABLE scheduled_tasks ADD COLUMN task_name TEXT")
+    c.execute("ALTER TABLE scheduled_tasks ADD COLUMN cron_expr TEXT") # "분 시 일 월 요일"
+    c.execute("ALTER TABLE scheduled_tasks ADD COLUMN timezone TEXT NOT NULL DEFAULT 'Asia/Seoul'") # zoneinfo 시간대 이름
+    c.execute("ALTER TABLE scheduled_tasks ADD COLUMN priority INTEGER NOT NULL DEFAULT 0") # 클수록 먼저 실행
+    c.execute("ALTER TABLE scheduled_tasks ADD COLUMN enabled INTEGER NOT NULL DEFAULT 1")
+    c.execute("ALTER TABLE scheduled_tasks ADD COLUMN catch_up INTEGER NOT NULL DEFAULT 1") # 워커가 꺼져 있는 동안 놓친 실행을 보충할지 여부
+    c.execute("ALTER TABLE scheduled_tasks ADD COLUMN next_run_at TEXT") # 다음 실행 시각 (UTC "YYYY-MM-DD HH:MM")
+
+    weekday_cron_values = {"월요일": 1, "화요일": 2, "수요일": 3, "목요일": 4, "금요일": 5, "토요일": 6, "일요일": 0}
+    for task_id, schedule_time, schedule_day in c.execute("SELECT id, schedule_time, schedule_day FROM scheduled_tasks").fetchall():
+        try:
+            hour, minute = map(int, schedule_time.split(':'))
+        except ValueError:
+            print(f"경고: 예약 작업 {task_id}의 시간 형식이 올바르지 않아 비활성화합니다 - {schedule_time}")
+            c.execute("UPDATE scheduled_tasks SET enabled = 0 WHERE id = ?", (task_id,))
+            continue
+        day_shift, kst_hour = divmod(hour + 9, 24)
+        weekday = str((weekday_cron_values[schedule_day] + day_shift) % 7) if schedule_day in weekday_cron_values else "*"
+        c.execute("UPDATE scheduled_tasks SET cron_expr = ?, timezone = 'Asia/Seoul' WHERE id = ?",
+                  (f"{minute} {kst_hour} * * {weekday}", task_id))
+
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS job_queue (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            task_id INTEGER NOT NULL,
+            scheduled_for TEXT NOT NULL, -- 실행 회차 (예약된 실행 시각, UTC "YYYY-MM-DD HH:MM")
+            priority INTEGER NOT NULL DEFAULT 0,
+            status TEXT NOT NULL, -- queued / running / succeeded / failed
+            worker_id TEXT, -- 실행을 가져간 워커 ("호스트:PID")
+            enqueued_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            report_sent INTEGER NOT NULL DEFAULT 0,
+            endorsement_sent INTEGER NOT NULL DEFAULT 0,
+            message TEXT,
+            UNIQUE (task_id, scheduled_for)
+        )
+    ''')
+    c.execute("CREATE INDEX IF NOT EXISTS idx_job_queue_status_priority ON job_queue (status, priority DESC, scheduled_for)")
+    # 이전 실행 기록(scheduled_task_runs)을 작업 큐로 옮김. 실행 중이던 기록은 중단된 것으로 봄
+    c.execute('''
+        INSERT OR IGNORE INTO job_queue (task_id, scheduled_for, status, worker_id, enqueued_at, started_at, finished_at, attempts, report_sent, endorsement_sent, message)
+        SELECT task_id, scheduled_for, CASE WHEN status = 'running' THEN 'failed' ELSE status END, worker_id, started_at, started_at, finished_at, 1,
+               report_sent, endorsement_sent, message
+        FROM scheduled_task_runs
+    ''')
+    c.execute("DROP TABLE scheduled_task_runs")
+
+def _migration_007_embedding_cache(c: sqlite3.Cursor):
+    """문서 청크 임베딩 캐시 테이블을 만듭니다. 같은 청크(내용 해시)를 같은 모델로 다시 임베딩하지 않도록 벡터를 저장합니다."""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS embedding_cache (
+            model_key TEXT NOT NULL, -- "모델 이름|백엔드|양자화 여부"
+            chunk_hash TEXT NOT NULL, -- 청크 내용의 SHA-256
+            vector BLOB NOT NULL, -- float32 배열
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (model_key, chunk_hash)
+        )
+    ''')
+
+def _migration_008_job_leases(c: sqlite3.Cursor):
+    """
+    작업 큐에 임대 만료 시각(lease_expires_at) 컬럼을 추가합니다. 실행 중인 워커가 주기적으로 연장하므로,
+    오래 걸리는 작업도 워커가 살아 있는 동안에는 다시 대기열에 들어가지 않습니다.
+    이미 실행 중인 작업은 시작 시각 + 기본 임대 기간으로 채웁니다.
+    """
+    c.execute("ALTER TABLE job_queue ADD COLUMN lease_expires_at TEXT")
+    c.execute("UPDATE job_queue SET lease_expires_at = datetime(started_at, ?) WHERE status = 'running'", (f"+{JOB_LEASE_MINUTES} minutes",))
+
+def _migration_009_articles_fts_raw_text(c: sqlite3.Cursor):
+    """
+    전문 검색 인덱스를 articles 테이블을 내용으로 쓰는 external content FTS5 테이블로 다시 만듭니다.
+    원문을 unicode61로 토큰화해 저장하고 트리거로 기사 저장/수정/삭제와 함께 갱신하므로,
+    기사를 저장할 때나 이 마이그레이션에서 형태소 분석기를 실행하지 않습니다. (채우기는 FTS5 'rebuild' 명령으로 SQLite 안에서 처리)
+    한국어 조사/어미가 붙은 어절은 검색어 토큰의 접두어 검색으로 찾습니다. (search_articles 참고)
+    """
+    c.execute("DROP TABLE IF EXISTS articles_fts")
+    try:
+        c.execute("CREATE VIRTUAL TABLE articles_fts USING fts5(title, content, content = 'articles', content_rowid = 'id', tokenize = 'unicode61')")
+    except sqlite3.OperationalError as e:
+        print(f"경고: FTS5를 사용할 수 없어 전문 검색 인덱스를 건너뜁니다 - {e}")
+        return
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+            INSERT INTO articles_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+            INSERT INTO articles_fts (articles_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE OF title, content ON articles BEGIN
+            INSERT INTO articles_fts (articles_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO articles_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    ''')
+    c.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+
+def _migration_010_embedding_cache_last_used(c: sqlite3.Cursor):
+    """임베딩 캐시에 마지막 사용 시각 컬럼을 추가합니다. 캐시가 크기 상한을 넘으면 오래 쓰이지 않은 벡터부터 삭제합니다."""
+    c.execute("ALTER TABLE embedding_cache ADD COLUMN last_used_at TEXT")
+    c.execute("UPDATE embedding_cache SET last_used_at = created_at")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_embedding_cache_last_used_at ON embedding_cache (last_used_at)")
+
+MIGRATIONS = [
+    _migration_001_article_dates_and_indexes,
+    _migration_002_articles_fts,
+    _migration_003_run_scoped_intermediate_summaries,
+    _migration_004_pipeline_checkpoints,
+    _migration_005_scheduled_task_runs,
+    _migration_006_job_queue_and_cron_schedules,
+    _migration_007_embedding_cache,
+    _migration_008_job_leases,
+    _migration_009_articles_fts_raw_text,
+    _migration_010_embedding_cache_last_used,
+]
+
+def _apply_migrations(conn: sqlite3.Connection):
+    """아직 적용되지 않은 스키마 마이그레이션을 순서대로 실행합니다."""
+    current_version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for version, migration in enumerate(MIGRATIONS, start=1):
+        if version <= current_version:
+            continue
+        try:
+            c = conn.cursor()
+            migration(c)
+            c.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"오류: 스키마 마이그레이션 {version} ({migration.__name__}) 실패 - {e}")
+            raise
+
+def _fts_document(text: str | None) -> str:
+    """
+    전문 검색 인덱스에 저장할 텍스트를 반환합니다. (migration 002의 기존 기사 채우기에서 사용)
+    migration 009부터 인덱스는 원문을 SQLite가 직접 토큰화하므로 형태소 분석 없이 원문을 그대로 씁니다.
+    """
+    return text or ""
 
-def insert_article(article: dict):
-    """기사 데이터를 데이터베이스에 삽입합니다. 중복 링크는 건너뛰거나 업데이트합니다."""
-    conn = sqlite3.connect(DB_FILE)
+def _fts_query_tokens(query: str) -> list[str]:
+    """검색어를 키워드 추출과 같은 토크나이저로 토큰화합니다. (검색어 하나만 분석하므로 기사 저장 경로에는 영향 없음)"""
+    from modules import trend_analyzer # konlpy 로딩 비용이 있어 필요할 때만 임포트
+    return trend_analyzer.get_default_pipeline().tokenize(query)
+
+def _fts_available(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'articles_fts'").fetchone() is not None
+
+def _normalize_date(value) -> str | None:
+    """datetime 또는 'YYYY-MM-DD' / 'YYYY.MM.DD' 형식의 날짜를 ISO-8601 날짜 문자열로 변환합니다."""
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d')
+    if not value:
+        return None
+    text = str(value).strip()[:10].replace('.', '-')
+    try:
+        return datetime.strptime(text, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+# 링크가 이미 존재하면 같은 행을 업데이트 (INSERT OR REPLACE와 달리 행 id가 바뀌지 않음)
+ARTICLE_UPSERT_SQL = """
+    INSERT INTO articles (link, title, date, content, crawl_timestamp, published_date, keyword, profile_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(link) DO UPDATE SET
+        title = excluded.title,
+        date = excluded.date,
+        content = excluded.content,
+        crawl_timestamp = excluded.crawl_timestamp,
+        published_date = excluded.published_date,
+        keyword = COALESCE(excluded.keyword, articles.keyword),
+        profile_id = COALESCE(excluded.profile_id, articles.profile_id)
+"""
+# SQLite의 바인딩 변수 개수 제한(기본 999)을 넘지 않도록 IN 절을 나누는 크기
+SQLITE_MAX_IN_PARAMS = 900
+
+def _article_row(article: dict, crawl_timestamp: str, keyword: str | None, profile_id: int | None) -> tuple:
+    return (article['링크'], article['제목'], article['날짜'], article['내용'], crawl_timestamp,
+            _normalize_date(article['날짜']), keyword, profile_id)
+
+def insert_article(article: dict, keyword: str | None = None, profile_id: int | None = None, db_file: str | None = None):
+    """
+    기사 데이터를 데이터베이스에 삽입합니다. 중복 링크는 업데이트합니다.
+    keyword, profile_id: 기사를 수집한 검색어와 검색 프로필 ID (선택 사항)
+    db_file: 저장할 DB 파일 (기본값 DB_FILE)
+    """
+    conn = get_connection(db_file)
     c = conn.cursor()
     try:
-        # 링크가 이미 존재하면 업데이트, 없으면 삽입
-        c.execute("INSERT OR REPLACE INTO articles (link, title, date, content, crawl_timestamp) VALUES (?, ?, ?, ?, ?)",
-                  (article['링크'], article['제목'], article['날짜'], article['내용'], datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        c.execute(ARTICLE_UPSERT_SQL, _article_row(article, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), keyword, profile_id))
         conn.commit()
     except Exception as e:
+        conn.rollback() # 재사용 연결에 실패한 트랜잭션이 남지 않도록 롤백
         print(f"오류: 데이터베이스 삽입/업데이트 실패 - {e} (링크: {article['링크']})")
-    finally:
-        conn.close()
+
+def _upsert_article_chunk(conn: sqlite3.Connection, rows: list[tuple]) -> tuple[int, int]:
+    """기사 행 묶음을 하나의 트랜잭션으로 저장하고 (삽입 수, 업데이트 수)를 반환합니다."""
+    rows_by_link = {row[0]: row for row in rows} # 같은 묶음 안의 중복 링크는 마지막 값만 사용
+    links = list(rows_by_link)
+    existing_count = 0
+    for i in range(0, len(links), SQLITE_MAX_IN_PARAMS):
+        link_batch = links[i:i + SQLITE_MAX_IN_PARAMS]
+        placeholders = ",".join("?" * len(link_batch))
+        existing_count += conn.execute(f"SELECT COUNT(*) FROM articles WHERE link IN ({placeholders})", link_batch).fetchone()[0]
+    conn.executemany(ARTICLE_UPSERT_SQL, rows_by_link.values()) # 전문 검색 인덱스는 트리거로 함께 갱신됨
+    conn.commit()
+    return len(links) - existing_count, existing_count
+
+def insert_articles_bulk(articles: Iterable[dict], chunk_size: int = 500, keyword: str | None = None, profile_id: int | None = None,
+                         db_file: str | None = None) -> dict:
+    """
+    여러 기사를 chunk_size 단위 트랜잭션과 executemany로 한 번에 저장합니다.
+    이미 존재하는 링크는 ON CONFLICT(link) DO UPDATE로 같은 행을 갱신합니다.
+    Args:
+        articles (Iterable[dict]): {"제목", "링크", "날짜", "내용"} 형식의 기사 목록 (제너레이터도 가능).
+        chunk_size (int): 한 트랜잭션에 저장할 기사 수.
+        keyword (str, optional): 기사를 수집한 검색어.
+        profile_id (int, optional): 기사를 수집한 검색 프로필 ID.
+        db_file (str, optional): 저장할 DB 파일 (기본값 DB_FILE).
+    Returns:
+        dict: {"inserted": 새로 삽입된 기사 수, "updated": 갱신된 기존 기사 수}
+    """
+    conn = get_connection(db_file)
+    crawl_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    result = {"inserted": 0, "updated": 0}
+
+    def flush(rows):
+        try:
+            inserted, updated = _upsert_article_chunk(conn, rows)
+            result["inserted"] += inserted
+            result["updated"] += updated
+        except Exception as e:
+            conn.rollback()
+            print(f"오류: 기사 일괄 저장 실패 - {e} ({len(rows)}건)")
+
+    rows = []
+    for article in articles:
+        rows.append(_article_row(article, crawl_timestamp, keyword, profile_id))
+        if len(rows) >= chunk_size:
+            flush(rows)
+            rows = []
+    if rows:
+        flush(rows)
+    return result
+
+def benchmark_article_ingestion(row_count: int = 5000, chunk_size: int = 500) -> dict:
+    """
+    임시 DB에서 기사 저장 속도(rows/sec)를 측정하여 insert_article(행 단위)과 insert_articles_bulk를 비교합니다.
+    임시 DB 경로를 각 함수에 직접 넘기므로 실제 DB_FILE이나 다른 스레드의 연결은 건드리지 않습니다.
+    반환 값: {"rows": int, "per_row_rows_per_sec": float, "bulk_rows_per_sec": float, "speedup": float}
+    """
+    articles = [
+        {"제목": f"벤치마크 기사 {i}", "링크": f"https://example.com/news/{i}", "날짜": "2025-01-01", "내용": "미리보기 스니펫 " * 10}
+        for i in range(row_count)
+    ]
+    timings = {}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for mode in ("per_row", "bulk"):
+            bench_db_file = os.path.join(temp_dir, f"bench_{mode}.db")
+            try:
+                init_db(bench_db_file)
+                start = time.perf_counter()
+                if mode == "per_row":
+                    for article in articles:
+                        insert_article(article, db_file=bench_db_file)
+                else:
+                    insert_articles_bulk(articles, chunk_size=chunk_size, db_file=bench_db_file)
+                timings[mode] = time.perf_counter() - start
+            finally:
+                close_connection(bench_db_file)
+
+    per_row_rate = row_count / timings["per_row"]
+    bulk_rate = row_count / timings["bulk"]
+    return {
+        "rows": row_count,
+        "per_row_rows_per_sec": per_row_rate,
+        "bulk_rows_per_sec": bulk_rate,
+        "speedup": bulk_rate / per_row_rate
+    }
+
+ARTICLE_COLUMNS = ['제목', '링크', '날짜', '내용', '수집_시간']
+ARTICLE_SELECT_SQL = "SELECT title, link, date, content, crawl_timestamp FROM articles"
+ARTICLE_ORDER_SQL = " ORDER BY published_date DESC, crawl_timestamp DESC, id DESC"
 
 def get_all_articles():
-    """데이터베이스의 모든 기사 데이터를 가져옵니다."""
-    conn = sqlite3.connect(DB_FILE)
+    """
+    데이터베이스의 모든 기사 데이터를 가져옵니다.
+    전체 테이블을 메모리에 올리므로, 화면 표시나 내보내기에는 count_articles / iter_articles / get_articles_page를 사용하세요.
+    """
+    return list(iter_articles())
+
+def count_articles() -> int:
+    """저장된 기사 수를 반환합니다. (기사 내용은 읽지 않음)"""
+    conn = get_connection()
+    return conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+def iter_articles(batch_size: int = 1000):
+    """
+    모든 기사를 최신순으로 batch_size개씩 커서에서 읽어 하나씩 반환하는 제너레이터입니다.
+    메모리 사용량은 전체 기사 수와 무관하게 batch_size에 비례합니다.
+    Yields:
+        tuple: (제목, 링크, 날짜, 내용, 수집_시간)
+    """
+    conn = get_connection()
     c = conn.cursor()
-    c.execute("SELECT title, link, date, content, crawl_timestamp FROM articles ORDER BY date DESC, crawl_timestamp DESC")
-    articles = c.fetchall()
-    conn.close()
-    return articles
-
-def clear_db_content():
-    """데이터베이스의 모든 기사 기록을 삭제합니다."""
-    conn = sqlite3.connect(DB_FILE)
+    c.execute(ARTICLE_SELECT_SQL + ARTICLE_ORDER_SQL)
+    while True:
+        rows = c.fetchmany(batch_size)
+        if not rows:
+            break
+        yield from rows
+
+def get_articles_page(page_size: int = 50, cursor: tuple | None = None) -> tuple[list[tuple], tuple | None]:
+    """
+    기사를 최신순으로 한 페이지씩 가져옵니다. (OFFSET 대신 마지막 행 기준의 keyset 페이지네이션)
+    Args:
+        page_size (int): 한 페이지의 기사 수.
+        cursor (tuple, optional): 이전 호출이 반환한 다음 페이지 커서. 없으면 첫 페이지.
+    Returns:
+        tuple: (기사 목록 [(제목, 링크, 날짜, 내용, 수집_시간)], 다음 페이지 커서 또는 마지막 페이지면 None)
+    """
+    query = "SELECT title, link, date, content, crawl_timestamp, published_date, id FROM articles"
+    params = []
+    if cursor is not None:
+        last_published_date, last_crawl_timestamp, last_id = cursor
+        if last_published_date is not None:
+            # 게시 날짜가 없는(NULL) 기사는 내림차순에서 가장 마지막에 옵니다.
+            query += (" WHERE published_date < ?"
+                      " OR (published_date = ? AND (crawl_timestamp, id) < (?, ?))"
+                      " OR published_date IS NULL")
+            params = [last_published_date, last_published_date, last_crawl_timestamp, last_id]
+        else:
+            query += " WHERE published_date IS NULL AND (crawl_timestamp, id) < (?, ?)"
+            params = [last_crawl_timestamp, last_id]
+    query += ARTICLE_ORDER_SQL + " LIMIT ?"
+    params.append(page_size + 1)
+
+    conn = get_connection()
+    rows = conn.execute(query, params).fetchall()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = (rows[-1][5], rows[-1][4], rows[-1][6]) if has_more else None
+    return [row[:5] for row in rows], next_cursor
+
+def get_articles_by_date_range(start_date, end_date, keyword: str | None = None, profile_id: int | None = None, limit: int | None = None) -> list[dict]:
+    """
+    게시 날짜가 start_date ~ end_date(양 끝 포함)인 기사를 인덱스를 사용해 조회합니다.
+    Args:
+        start_date, end_date: datetime 또는 'YYYY-MM-DD' 문자열.
+        keyword (str, optional): 이 검색어로 수집된 기사만 조회.
+        profile_id (int, optional): 이 검색 프로필로 수집된 기사만 조회.
+        limit (int, optional): 최대 조회 건수.
+    Returns:
+        list[dict]: 크롤러와 같은 형식의 기사 목록 ("날짜"는 datetime, 최신순).
+                    trend_analyzer.analyze_keyword_trends에 바로 전달할 수 있습니다.
+    """
+    query = "SELECT title, link, published_date, content, crawl_timestamp FROM articles WHERE published_date BETWEEN ? AND ?"
+    params = [_normalize_date(start_date), _normalize_date(end_date)]
+    if keyword is not None:
+        query += " AND keyword = ?"
+        params.append(keyword)
+    if profile_id is not None:
+        query += " AND profile_id = ?"
+        params.append(profile_id)
+    query += " ORDER BY published_date DESC, crawl_timestamp DESC"
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+
+    conn = get_connection()
+    rows = conn.execute(query, params).fetchall()
+    return [
+        {
+            "제목": row[0],
+            "링크": row[1],
+            "날짜": datetime.strptime(row[2], '%Y-%m-%d'),
+            "내용": row[3] or "",
+            "수집_시간": row[4]
+        }
+        for row in rows
+    ]
+
+def search_articles(query: str, limit: int = 20, start_date=None, end_date=None, match_all: bool = False) -> list[dict]:
+    """
+    저장된 기사를 전문 검색하여 관련도(BM25, 제목 가중치 2배) 순으로 반환합니다.
+    FTS5를 사용할 수 없는 환경에서는 LIKE 검색 결과를 최신순으로 반환합니다.
+    Args:
+        query (str): 검색어. 키워드 추출과 같은 토크나이저로 토큰화하며, 각 토큰으로 시작하는 어절을 찾습니다. (예: "보험" -> "보험료가")
+        limit (int): 최대 결과 수.
+        start_date, end_date (optional): 게시 날짜 범위 (datetime 또는 'YYYY-MM-DD').
+        match_all (bool): True면 모든 토큰을 포함하는 기사만, False면 하나라도 포함하는 기사를 찾습니다.
+    Returns:
+        list[dict]: 크롤러와 같은 형식의 기사 목록 ("날짜"는 datetime)에 "score"(클수록 관련도 높음)가 추가됩니다.
+    """
+    conn = get_connection()
+    use_fts = _fts_available(conn)
+    tokens = _fts_query_tokens(query) if use_fts else query.split()
+    if not tokens:
+        return []
+
+    date_filter = ""
+    params = []
+    if start_date is not None:
+        date_filter += " AND a.published_date >= ?"
+        params.append(_normalize_date(start_date))
+    if end_date is not None:
+        date_filter += " AND a.published_date <= ?"
+        params.append(_normalize_date(end_date))
+
+    if use_fts:
+        operator = " AND " if match_all else " OR "
+        match_expression = operator.join('"' + token.replace('"', '""') + '"*' for token in dict.fromkeys(tokens))
+        sql = ("SELECT a.title, a.link, a.published_date, a.content, a.crawl_timestamp, -bm25(articles_fts, 2.0, 1.0) AS score"
+               " FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid"
+               " WHERE articles_fts MATCH ?" + date_filter +
+               " ORDER BY bm25(articles_fts, 2.0, 1.0) LIMIT ?")
+        params = [match_expression] + params + [limit]
+    else:
+        operator = " AND " if match_all else " OR "
+        like_filter = operator.join("(a.title LIKE ? OR a.content LIKE ?)" for _ in tokens)
+        like_params = [f"%{token}%" for token in tokens for _ in range(2)]
+        sql = ("SELECT a.title, a.link, a.published_date, a.content, a.crawl_timestamp, 0.0 AS score"
+               " FROM articles a WHERE (" + like_filter + ")" + date_filter +
+               " ORDER BY a.published_date DESC, a.crawl_timestamp DESC LIMIT ?")
+        params = like_params + params + [limit]
+
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    except Exception as e:
+        print(f"오류: 기사 검색 실패 - {e} (검색어: {query})")
+        return []
+    return [
+        {
+            "제목": row[0],
+            "링크": row[1],
+            "날짜": datetime.strptime(row[2], '%Y-%m-%d') if row[2] else None,
+            "내용": row[3] or "",
+            "수집_시간": row[4],
+            "score": row[5]
+        }
+        for row in rows
+    ]
+
+def clear_db_content() -> tuple[bool, str]:
+    """
+    데이터베이스의 모든 기사 기록을 삭제합니다.
+    반환 값: (성공 여부, 사용자에게 표시할 결과 메시지)
+    """
+    conn = get_connection()
     c = conn.cursor()
     try:
         c.execute("DELETE FROM articles")
         # 추가: 검색 프로필, 예약 작업, 생성된 특약, 문서 텍스트, 중간 요약도 함께 삭제
         c.execute("DELETE FROM search_profiles")
         c.execute("DELETE FROM scheduled_tasks")
+        c.execute("DELETE FROM job_queue")
         c.execute("DELETE FROM generated_endorsements")
         c.execute("DELETE FROM document_texts")
         c.execute("DELETE FROM intermediate_summaries") # 새로 추가
+        c.execute("DELETE FROM pipeline_checkpoints")
+        c.execute("DELETE FROM pipeline_runs")
+        c.execute("DELETE FROM embedding_cache") # 전문 검색 인덱스는 기사 삭제 트리거로 함께 비워짐
         conn.commit()
-        st.session_state['db_status_message'] = "데이터베이스의 모든 기록이 성공적으로 삭제되었습니다."
-        st.session_state['db_status_type'] = "success"
+        return True, "데이터베이스의 모든 기록이 성공적으로 삭제되었습니다."
     except Exception as e:
-        st.session_state['db_status_message'] = f"데이터베이스 초기화 중 오류 발생: {e}"
-        st.session_state['db_status_type'] = "error"
-    finally:
-        conn.close()
+        conn.rollback()
+        return False, f"데이터베이스 초기화 중 오류 발생: {e}"
 
 # --- 검색 프로필 관련 함수 ---
 def save_search_profile(profile_name: str, keyword: str, total_search_days: int, recent_trend_days: int, max_naver_search_pages_per_day: int):
     """검색 프로필을 저장하거나 업데이트합니다."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     c = conn.cursor()
     try:
         c.execute("INSERT OR REPLACE INTO search_profiles (profile_name, keyword, total_search_days, recent_trend_days, max_naver_search_pages_per_day) VALUES (?, ?, ?, ?, ?)",
@@ -128,18 +698,16 @@ def save_search_profile(profile_name: str, keyword: str, total_search_days: int,
         conn.commit()
         return True
     except Exception as e:
+        conn.rollback()
         print(f"오류: 검색 프로필 저장/업데이트 실패 - {e}")
         return False
-    finally:
-        conn.close()
 
 def get_search_profiles() -> list[dict]:
     """저장된 모든 검색 프로필을 가져옵니다."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     c = conn.cursor()
     c.execute("SELECT id, profile_name, keyword, total_search_days, recent_trend_days, max_naver_search_pages_per_day FROM search_profiles ORDER BY profile_name")
     profiles = c.fetchall()
-    conn.close()
     
     profile_list = []
     for p in profiles:
@@ -155,82 +723,275 @@ def get_search_profiles() -> list[dict]:
 
 def delete_search_profile(profile_id: int):
     """지정된 ID의 검색 프로필을 삭제합니다."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     c = conn.cursor()
     try:
         c.execute("DELETE FROM search_profiles WHERE id = ?", (profile_id,))
         conn.commit()
         return True
     except Exception as e:
+        conn.rollback()
         print(f"오류: 검색 프로필 삭제 실패 - {e}")
         return False
-    finally:
-        conn.close()
 
 # --- 예약 작업 관련 함수 ---
-def save_scheduled_task(profile_id: int, schedule_time: str, schedule_day: str, recipient_emails: str): # schedule_day 추가
-    """예약된 작업을 저장하거나 업데이트합니다. (단일 예약만 가능하도록 구현)"""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
+# 예약 작업은 여러 개를 둘 수 있으며, 일정은 cron 식(cron_expr)과 시간대(timezone)로 저장합니다.
+# 실행 시각이 된 작업은 scheduler_worker가 job_queue에 넣고, 워커들이 우선순위 순으로 꺼내 실행합니다.
+SCHEDULED_TASK_COLUMNS = "id, task_name, profile_id, cron_expr, timezone, recipient_emails, priority, enabled, catch_up, next_run_at, last_run_date"
+
+def _scheduled_task_from_row(row: tuple) -> dict:
+    return {
+        "id": row[0],
+        "task_name": row[1],
+        "profile_id": row[2],
+        "cron_expr": row[3],
+        "timezone": row[4],
+        "recipient_emails": row[5],
+        "priority": row[6],
+        "enabled": bool(row[7]),
+        "catch_up": bool(row[8]),
+        "next_run_at": row[9], # 다음 실행 시각 (UTC "YYYY-MM-DD HH:MM"), 아직 계산 전이면 None
+        "last_run_date": row[10]
+    }
+
+def save_scheduled_task(profile_id: int, cron_expr: str, timezone_name: str, recipient_emails: str, task_name: str | None = None,
+                        priority: int = 0, catch_up: bool = True, task_id: int | None = None) -> int | None:
+    """
+    예약 작업을 새로 저장하거나(task_id 없음) 기존 작업을 수정합니다. 일정이 바뀌면 다음 실행 시각은 스케줄러가 다시 계산합니다.
+    반환 값: 저장된 작업 ID (실패 시 None)
+    """
+    conn = get_connection()
     try:
-        # 기존 예약 삭제 후 새로 삽입 (단일 예약만 허용)
-        c.execute("DELETE FROM scheduled_tasks")
-        c.execute("INSERT INTO scheduled_tasks (profile_id, schedule_time, schedule_day, recipient_emails, last_run_date) VALUES (?, ?, ?, ?, ?)", # schedule_day 추가
-                  (profile_id, schedule_time, schedule_day, recipient_emails, None)) # 초기 last_run_date는 None
+        if task_id is None:
+            # schedule_time / schedule_day는 이전 단일 예약 방식(UTC 시각 + 요일)의 컬럼으로, 새 작업에서는 사용하지 않습니다.
+            task_id = conn.execute(
+                "INSERT INTO scheduled_tasks (task_name, profile_id, cron_expr, timezone, recipient_emails, priority, catch_up, schedule_time, schedule_day) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, '', '')",
+                (task_name, profile_id, cron_expr, timezone_name, recipient_emails, priority, int(catch_up))
+            ).lastrowid
+        else:
+            conn.execute(
+                "UPDATE scheduled_tasks SET next_run_at = CASE WHEN cron_expr = ? AND timezone = ? THEN next_run_at END, "
+                "task_name = ?, profile_id = ?, cron_expr = ?, timezone = ?, recipient_emails = ?, priority = ?, catch_up = ? WHERE id = ?",
+                (cron_expr, timezone_name, task_name, profile_id, cron_expr, timezone_name, recipient_emails, priority, int(catch_up), task_id)
+            )
         conn.commit()
-        return True
+        return task_id
     except Exception as e:
+        conn.rollback()
         print(f"오류: 예약 작업 저장 실패 - {e}")
+        return None
+
+def get_scheduled_tasks(enabled_only: bool = False) -> list[dict]:
+    """저장된 예약 작업을 우선순위가 높은 순으로 가져옵니다."""
+    sql = f"SELECT {SCHEDULED_TASK_COLUMNS} FROM scheduled_tasks"
+    if enabled_only:
+        sql += " WHERE enabled = 1"
+    sql += " ORDER BY priority DESC, id"
+    conn = get_connection()
+    return [_scheduled_task_from_row(row) for row in conn.execute(sql).fetchall()]
+
+def get_scheduled_task(task_id: int) -> dict | None:
+    """지정된 ID의 예약 작업을 가져옵니다."""
+    conn = get_connection()
+    row = conn.execute(f"SELECT {SCHEDULED_TASK_COLUMNS} FROM scheduled_tasks WHERE id = ?", (task_id,)).fetchone()
+    return _scheduled_task_from_row(row) if row else None
+
+def set_scheduled_task_enabled(task_id: int, enabled: bool):
+    """예약 작업을 켜거나 끕니다. 꺼져 있던 동안의 실행은 보충하지 않도록 다음 실행 시각을 스케줄러가 새로 계산하게 합니다."""
+    conn = get_connection()
+    try:
+        conn.execute("UPDATE scheduled_tasks SET enabled = ?, next_run_at = NULL WHERE id = ?", (int(enabled), task_id))
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 예약 작업 상태 변경 실패 - {e}")
         return False
-    finally:
-        conn.close()
 
-def get_scheduled_task() -> dict | None:
-    """현재 예약된 작업을 가져옵니다."""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
-    c.execute("SELECT id, profile_id, schedule_time, schedule_day, recipient_emails, last_run_date FROM scheduled_tasks LIMIT 1") # schedule_day 추가
-    task = c.fetchone()
-    conn.close()
-    
-    if task:
-        return {
-            "id": task[0],
-            "profile_id": task[1],
-            "schedule_time": task[2],
-            "schedule_day": task[3], # schedule_day 추가
-            "recipient_emails": task[4],
-            "last_run_date": task[5]
-        }
-    return None
+def update_scheduled_task_next_run(task_id: int, expected_next_run_at: str | None, next_run_at: str | None) -> bool:
+    """
+    다음 실행 시각을 갱신합니다. 현재 값이 expected_next_run_at일 때만 바꾸므로,
+    여러 스케줄러가 같은 작업을 동시에 보더라도 한 곳만 갱신에 성공합니다.
+    """
+    conn = get_connection()
+    try:
+        updated = conn.execute("UPDATE scheduled_tasks SET next_run_at = ? WHERE id = ? AND next_run_at IS ?",
+                               (next_run_at, task_id, expected_next_run_at)).rowcount
+        conn.commit()
+        return updated == 1
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 예약 작업 다음 실행 시각 갱신 실패 - {e}")
+        return False
 
 def update_scheduled_task_last_run_date(task_id: int, run_date: str):
     """예약된 작업의 마지막 실행 날짜를 업데이트합니다."""
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     c = conn.cursor()
     try:
         c.execute("UPDATE scheduled_tasks SET last_run_date = ? WHERE id = ?", (run_date, task_id))
         conn.commit()
         return True
     except Exception as e:
+        conn.rollback()
         print(f"오류: 예약 작업 마지막 실행 날짜 업데이트 실패 - {e}")
         return False
-    finally:
-        conn.close()
 
-def clear_scheduled_task():
-    """예약된 작업을 삭제합니다."""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
+def delete_scheduled_task(task_id: int):
+    """예약 작업과 아직 실행되지 않은 대기 작업을 삭제합니다. (실행 기록은 남김)"""
+    conn = get_connection()
     try:
-        c.execute("DELETE FROM scheduled_tasks")
+        conn.execute("DELETE FROM job_queue WHERE task_id = ? AND status = 'queued'", (task_id,))
+        conn.execute("DELETE FROM scheduled_tasks WHERE id = ?", (task_id,))
         conn.commit()
         return True
     except Exception as e:
+        conn.rollback()
         print(f"오류: 예약 작업 삭제 실패 - {e}")
         return False
-    finally:
-        conn.close()
+
+# --- 작업 큐 함수 (scheduler_worker에서 사용) ---
+JOB_COLUMNS = "id, task_id, scheduled_for, priority, status, worker_id, enqueued_at, started_at, finished_at, attempts, report_sent, endorsement_sent, message, lease_expires_at"
+
+def _job_from_row(row: tuple) -> dict:
+    return {
+        "id": row[0],
+        "task_id": row[1],
+        "scheduled_for": row[2],
+        "priority": row[3],
+        "status": row[4],
+        "worker_id": row[5],
+        "enqueued_at": row[6],
+        "started_at": row[7],
+        "finished_at": row[8],
+        "attempts": row[9],
+        "report_sent": bool(row[10]),
+        "endorsement_sent": bool(row[11]),
+        "message": row[12],
+        "lease_expires_at": row[13]
+    }
+
+def enqueue_job(task_id: int, scheduled_for: str, priority: int = 0) -> bool:
+    """예약 작업의 한 회차를 작업 큐에 넣습니다. 같은 회차가 이미 있으면 넣지 않고 False를 반환합니다."""
+    conn = get_connection()
+    try:
+        inserted = conn.execute(
+            "INSERT OR IGNORE INTO job_queue (task_id, scheduled_for, priority, status, enqueued_at) VALUES (?, ?, ?, 'queued', ?)",
+            (task_id, scheduled_for, priority, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+        ).rowcount
+        conn.commit()
+        return inserted == 1
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 작업 큐 추가 실패 - {e}")
+        return False
+
+def claim_next_job(worker_id: str, max_running: int, lease_minutes: int = JOB_LEASE_MINUTES, max_tries: int = 5) -> dict | None:
+    """
+    대기 중인 작업 중 우선순위가 가장 높은(같으면 회차가 이른) 작업 하나를 running으로 바꿔 가져오고 lease_minutes 동안 임대합니다.
+    전체 실행 중인 작업이 max_running 이상이거나, 같은 예약 작업의 다른 회차가 실행 중이면 가져오지 않습니다.
+    후보를 고른 뒤 status가 아직 queued이고 위 조건이 그대로일 때만 바꾸는 조건부 UPDATE로 가져오므로,
+    여러 워커 프로세스가 동시에 호출해도 같은 작업을 두 번 가져가지 않습니다. (다른 워커가 먼저 가져가면 다음 후보로 다시 시도)
+    UPDATE ... RETURNING을 쓰지 않으므로 SQLite 3.35 미만에서도 동작합니다.
+    """
+    conn = get_connection()
+    try:
+        for _ in range(max_tries):
+            row = conn.execute('''
+                SELECT id FROM job_queue
+                WHERE status = 'queued'
+                  AND task_id NOT IN (SELECT task_id FROM job_queue WHERE status = 'running')
+                ORDER BY priority DESC, scheduled_for, id
+                LIMIT 1
+            ''').fetchone()
+            if row is None:
+                return None
+            now = datetime.now()
+            claimed = conn.execute('''
+                UPDATE job_queue SET status = 'running', worker_id = ?, started_at = ?, lease_expires_at = ?, attempts = attempts + 1
+                WHERE id = ? AND status = 'queued'
+                  AND task_id NOT IN (SELECT task_id FROM job_queue WHERE status = 'running')
+                  AND (SELECT COUNT(*) FROM job_queue WHERE status = 'running') < ?
+            ''', (worker_id, now.strftime('%Y-%m-%d %H:%M:%S'), (now + timedelta(minutes=lease_minutes)).strftime('%Y-%m-%d %H:%M:%S'),
+                  row[0], max_running)).rowcount
+            conn.commit()
+            if claimed == 1:
+                job = conn.execute(f"SELECT {JOB_COLUMNS} FROM job_queue WHERE id = ?", (row[0],)).fetchone()
+                return _job_from_row(job) if job else None
+            if conn.execute("SELECT COUNT(*) FROM job_queue WHERE status = 'running'").fetchone()[0] >= max_running:
+                return None
+        return None
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 작업 큐에서 작업 가져오기 실패 - {e}")
+        return None
+
+def renew_job_leases(worker_id: str, lease_minutes: int = JOB_LEASE_MINUTES) -> int:
+    """worker_id가 실행 중인 작업들의 임대를 지금부터 lease_minutes 뒤까지 연장하고 연장한 작업 수를 반환합니다. (워커 하트비트)"""
+    lease_expires_at = (datetime.now() + timedelta(minutes=lease_minutes)).strftime('%Y-%m-%d %H:%M:%S')
+    conn = get_connection()
+    try:
+        renewed = conn.execute("UPDATE job_queue SET lease_expires_at = ? WHERE worker_id = ? AND status = 'running'",
+                               (lease_expires_at, worker_id)).rowcount
+        conn.commit()
+        return renewed
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 작업 임대 연장 실패 - {e}")
+        return 0
+
+def finish_job(job_id: int, status: str, report_sent: bool = False, endorsement_sent: bool = False, message: str | None = None):
+    """실행한 작업을 succeeded / failed 상태로 마무리합니다."""
+    conn = get_connection()
+    try:
+        conn.execute("UPDATE job_queue SET status = ?, finished_at = ?, report_sent = ?, endorsement_sent = ?, message = ?, lease_expires_at = NULL WHERE id = ?",
+                     (status, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), int(report_sent), int(endorsement_sent), message, job_id))
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 작업 실행 결과 기록 실패 - {e}")
+        return False
+
+def requeue_stale_jobs(max_attempts: int = JOB_MAX_ATTEMPTS) -> tuple[int, int]:
+    """
+    임대가 만료된 running 작업(연장하던 워커가 죽은 것으로 간주)을 정리합니다.
+    가져간 횟수가 max_attempts 미만이면 다시 대기 상태로 돌리고, 이상이면 실패로 처리합니다.
+    반환 값: (다시 대기열에 넣은 작업 수, 실패로 처리한 작업 수)
+    """
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    conn = get_connection()
+    try:
+        failed = conn.execute("UPDATE job_queue SET status = 'failed', finished_at = ?, lease_expires_at = NULL, "
+                              "message = '워커 응답 없이 임대가 만료되었고 최대 시도 횟수(' || attempts || '회)에 도달하여 실패로 처리됨' "
+                              "WHERE status = 'running' AND lease_expires_at < ? AND attempts >= ?", (now, now, max_attempts)).rowcount
+        requeued = conn.execute("UPDATE job_queue SET status = 'queued', worker_id = NULL, lease_expires_at = NULL, "
+                                "message = '워커 응답 없이 임대가 만료되어 다시 대기열에 추가됨' "
+                                "WHERE status = 'running' AND lease_expires_at < ?", (now,)).rowcount
+        conn.commit()
+        return requeued, failed
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 임대 만료 작업 정리 실패 - {e}")
+        return 0, 0
+
+def get_job_history(limit: int = 20, task_id: int | None = None) -> list[dict]:
+    """최근 작업 큐 기록(대기/실행 중/완료)을 최신 회차순으로 가져옵니다."""
+    sql = f"SELECT {JOB_COLUMNS} FROM job_queue"
+    params = []
+    if task_id is not None:
+        sql += " WHERE task_id = ?"
+        params.append(task_id)
+    sql += " ORDER BY scheduled_for DESC, id DESC LIMIT ?"
+    params.append(limit)
+    conn = get_connection()
+    return [_job_from_row(row) for row in conn.execute(sql, params).fetchall()]
+
+def count_jobs_by_status() -> dict[str, int]:
+    """작업 큐의 상태별 작업 수를 반환합니다. (예: {"queued": 3, "running": 1})"""
+    conn = get_connection()
+    return dict(conn.execute("SELECT status, COUNT(*) FROM job_queue GROUP BY status").fetchall())
 
 # --- 생성된 특약 관련 함수 ---
 def save_generated_endorsement(endorsement_text: str):
@@ -238,7 +999,7 @@ def save_generated_endorsement(endorsement_text: str):
     생성된 특약 텍스트를 데이터베이스에 저장합니다.
     항상 가장 최신 특약만 유지합니다 (기존 특약 삭제 후 새로 삽입).
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     c = conn.cursor()
     try:
         # 기존 특약 삭제
@@ -249,20 +1010,18 @@ def save_generated_endorsement(endorsement_text: str):
         conn.commit()
         return True
     except Exception as e:
+        conn.rollback()
         print(f"오류: 생성된 특약 저장 실패 - {e}")
         return False
-    finally:
-        conn.close()
 
 def get_latest_generated_endorsement() -> str | None:
     """
     데이터베이스에 저장된 가장 최신 특약 텍스트를 가져옵니다.
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     c = conn.cursor()
     c.execute("SELECT endorsement_text FROM generated_endorsements ORDER BY generation_timestamp DESC LIMIT 1")
     result = c.fetchone()
-    conn.close()
     if result:
         return result[0]
     return None
@@ -273,75 +1032,316 @@ def save_document_text(full_text: str):
     업로드된 문서의 전체 텍스트를 데이터베이스에 저장합니다.
     항상 가장 최신 텍스트만 유지합니다 (기존 텍스트 삭제 후 새로 삽입).
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     c = conn.cursor()
     try:
         # 기존 문서 텍스트 삭제
         c.execute("DELETE FROM document_texts")
         # 새 문서 텍스트 삽입
         c.execute("INSERT INTO document_texts (full_text, timestamp) VALUES (?, ?)",
-                  (full_text, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))\
-        ;conn.commit()
+                  (full_text, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        conn.commit()
         return True
     except Exception as e:
+        conn.rollback()
         print(f"오류: 문서 텍스트 저장 실패 - {e}")
         return False
-    finally:
-        conn.close()
 
 def get_latest_document_text() -> str | None:
     """
     데이터베이스에 저장된 가장 최신 문서 텍스트를 가져옵니다.
     """
-    conn = sqlite3.connect(DB_FILE)
+    conn = get_connection()
     c = conn.cursor()
     c.execute("SELECT full_text FROM document_texts ORDER BY timestamp DESC LIMIT 1")
     result = c.fetchone()
-    conn.close()
     if result:
         return result[0]
     return None
 
 # --- 중간 요약문 저장 및 로드 함수 (새로 추가) ---
-def save_intermediate_summary(summary_text: str, batch_id: str, level: int):
-    """중간 요약 텍스트를 데이터베이스에 저장합니다."""
-    conn = sqlite3.connect(DB_FILE)
+# 중간 요약은 실행(run_id)별로 저장되므로 동시에 실행되는 분석끼리 서로의 요약을 지우지 않습니다.
+
+def generate_run_id(prefix: str = "run") -> str:
+    """분석 실행을 구분하는 고유 ID를 생성합니다. (예: trend_20250101093000_1a2b3c4d)"""
+    return f"{prefix}_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+
+def save_intermediate_summary(summary_text: str, batch_id: str, level: int, run_id: str | None = None, input_hash: str | None = None):
+    """
+    중간 요약 텍스트를 데이터베이스에 저장합니다.
+    같은 실행(run_id)의 같은 배치(batch_id)가 이미 있으면 덮어씁니다.
+    """
+    conn = get_connection()
     c = conn.cursor()
     try:
-        c.execute("INSERT INTO intermediate_summaries (summary_text, batch_id, level, timestamp) VALUES (?, ?, ?, ?)",
-                  (summary_text, batch_id, level, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        c.execute("""
+            INSERT INTO intermediate_summaries (summary_text, batch_id, level, timestamp, run_id, input_hash) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(run_id, batch_id) DO UPDATE SET
+                summary_text = excluded.summary_text,
+                level = excluded.level,
+                timestamp = excluded.timestamp,
+                input_hash = excluded.input_hash
+        """, (summary_text, batch_id, level, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), run_id, input_hash))
         conn.commit()
         return True
     except Exception as e:
+        conn.rollback()
         print(f"오류: 중간 요약 저장 실패 - {e}")
         return False
-    finally:
-        conn.close()
 
-def get_intermediate_summaries(level: int, batch_id_prefix: str = "") -> list[str]:
-    """특정 계층 및 배치 접두사에 해당하는 중간 요약문들을 가져옵니다."""
-    conn = sqlite3.connect(DB_FILE)
-    c = conn.cursor()
+def get_intermediate_summary(run_id: str, batch_id: str, input_hash: str | None = None) -> str | None:
+    """
+    실행의 특정 배치에 저장된 중간 요약을 가져옵니다. (중단된 계층 요약을 이어서 실행할 때 사용)
+    input_hash가 주어지면 저장 당시의 입력 해시와 같을 때만 반환합니다.
+    """
+    conn = get_connection()
+    row = conn.execute("SELECT summary_text, input_hash FROM intermediate_summaries WHERE run_id = ? AND batch_id = ?",
+                       (run_id, batch_id)).fetchone()
+    if row is None or (input_hash is not None and row[1] != input_hash):
+        return None
+    return row[0]
+
+def get_intermediate_summaries(level: int, batch_id_prefix: str = "", run_id: str | None = None) -> list[str]:
+    """특정 계층 및 배치 접두사에 해당하는 중간 요약문들을 가져옵니다. run_id가 주어지면 해당 실행의 요약만 가져옵니다."""
+    query = "SELECT summary_text FROM intermediate_summaries WHERE level = ?"
+    params = [level]
+    if run_id is not None:
+        query += " AND run_id = ?"
+        params.append(run_id)
     if batch_id_prefix:
-        c.execute("SELECT summary_text FROM intermediate_summaries WHERE level = ? AND batch_id LIKE ? ORDER BY id",
-                  (level, f"{batch_id_prefix}%"))
-    else:
-        c.execute("SELECT summary_text FROM intermediate_summaries WHERE level = ? ORDER BY id")
+        query += " AND batch_id LIKE ?"
+        params.append(f"{batch_id_prefix}%")
+    query += " ORDER BY id"
+    conn = get_connection()
+    c = conn.cursor()
+    c.execute(query, params)
     summaries = [row[0] for row in c.fetchall()]
-    conn.close()
     return summaries
 
-def clear_intermediate_summaries():
-    """중간 요약 테이블의 모든 내용을 삭제합니다."""
-    conn = sqlite3.connect(DB_FILE)
+def clear_intermediate_summaries(run_id: str | None = None):
+    """
+    중간 요약을 삭제합니다.
+    run_id가 주어지면 해당 실행의 요약만, 없으면 테이블 전체를 삭제합니다. (전체 삭제는 DB 초기화용)
+    """
+    conn = get_connection()
     c = conn.cursor()
     try:
-        c.execute("DELETE FROM intermediate_summaries")
+        if run_id is None:
+            c.execute("DELETE FROM intermediate_summaries")
+        else:
+            c.execute("DELETE FROM intermediate_summaries WHERE run_id = ?", (run_id,))
         conn.commit()
-        print("중간 요약 테이블이 성공적으로 초기화되었습니다.")
         return True
     except Exception as e:
+        conn.rollback()
         print(f"오류: 중간 요약 테이블 초기화 실패 - {e}")
         return False
-    finally:
-        conn.close()
+
+def purge_expired_intermediate_summaries(ttl_hours: int = INTERMEDIATE_SUMMARY_TTL_HOURS) -> int:
+    """ttl_hours보다 오래된 중간 요약(중단된 실행이 남긴 것 포함)을 삭제하고 삭제된 행 수를 반환합니다."""
+    cutoff = (datetime.now() - timedelta(hours=ttl_hours)).strftime('%Y-%m-%d %H:%M:%S')
+    conn = get_connection()
+    try:
+        deleted = conn.execute("DELETE FROM intermediate_summaries WHERE timestamp < ?", (cutoff,)).rowcount
+        conn.commit()
+        return deleted
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 만료된 중간 요약 삭제 실패 - {e}")
+        return 0
+
+# --- 분석 파이프라인 실행 및 체크포인트 함수 ---
+def create_pipeline_run(run_id: str, params: str):
+    """새 분석 실행을 running 상태로 기록합니다. params는 실행 조건 JSON 문자열입니다."""
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    conn = get_connection()
+    try:
+        conn.execute("INSERT OR IGNORE INTO pipeline_runs (run_id, params, status, created_at, updated_at) VALUES (?, ?, 'running', ?, ?)",
+                     (run_id, params, now, now))
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 분석 실행 기록 실패 - {e}")
+        return False
+
+def update_pipeline_run_status(run_id: str, status: str):
+    """분석 실행의 상태(running / completed / failed)를 갱신합니다."""
+    conn = get_connection()
+    try:
+        conn.execute("UPDATE pipeline_runs SET status = ?, updated_at = ? WHERE run_id = ?",
+                     (status, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), run_id))
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 분석 실행 상태 갱신 실패 - {e}")
+        return False
+
+def claim_resumable_pipeline_run(params: str, ttl_hours: int = PIPELINE_RUN_TTL_HOURS,
+                                 lease_minutes: int = PIPELINE_RUN_LEASE_MINUTES) -> str | None:
+    """
+    같은 실행 조건의 이어서 실행할 수 있는 가장 최근 실행을 running 상태로 가져와 ID를 반환합니다. 없으면 None.
+    실패한(failed) 실행과, running 상태지만 lease_minutes 동안 갱신이 없는(실행하던 프로세스가 사라진) 실행만 대상입니다.
+    상태를 조건부 UPDATE로 바꾸므로 두 세션이 동시에 요청해도 한 실행은 한 세션만 가져갑니다.
+    """
+    now = datetime.now()
+    cutoff = (now - timedelta(hours=ttl_hours)).strftime('%Y-%m-%d %H:%M:%S')
+    stale_before = (now - timedelta(minutes=lease_minutes)).strftime('%Y-%m-%d %H:%M:%S')
+    conn = get_connection()
+    try:
+        candidates = conn.execute(
+            "SELECT run_id FROM pipeline_runs WHERE params = ? AND created_at >= ? "
+            "AND (status = 'failed' OR (status = 'running' AND updated_at < ?)) ORDER BY created_at DESC LIMIT 5",
+            (params, cutoff, stale_before)
+        ).fetchall()
+        for (run_id,) in candidates:
+            claimed = conn.execute(
+                "UPDATE pipeline_runs SET status = 'running', updated_at = ? "
+                "WHERE run_id = ? AND (status = 'failed' OR (status = 'running' AND updated_at < ?))",
+                (now.strftime('%Y-%m-%d %H:%M:%S'), run_id, stale_before)
+            ).rowcount
+            conn.commit()
+            if claimed:
+                return run_id
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 이어서 실행할 분석 실행 조회 실패 - {e}")
+    return None
+
+def touch_pipeline_run(run_id: str):
+    """실행 중인 분석의 갱신 시각(하트비트)을 현재 시각으로 바꿉니다."""
+    conn = get_connection()
+    try:
+        conn.execute("UPDATE pipeline_runs SET updated_at = ? WHERE run_id = ? AND status = 'running'",
+                     (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), run_id))
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 분석 실행 갱신 시각 기록 실패 - {e}")
+        return False
+
+def save_pipeline_checkpoint(run_id: str, stage: str, payload: str):
+    """분석 단계 결과(JSON 문자열)를 저장합니다. 같은 단계가 이미 있으면 덮어씁니다. 실행의 갱신 시각(하트비트)도 함께 바꿉니다."""
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    conn = get_connection()
+    try:
+        conn.execute("INSERT OR REPLACE INTO pipeline_checkpoints (run_id, stage, payload, timestamp) VALUES (?, ?, ?, ?)",
+                     (run_id, stage, payload, now))
+        conn.execute("UPDATE pipeline_runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 분석 체크포인트 저장 실패 - {e} (실행: {run_id}, 단계: {stage})")
+        return False
+
+def get_pipeline_checkpoints(run_id: str) -> dict[str, str]:
+    """실행의 모든 단계 체크포인트를 {단계: 결과 JSON 문자열} 형태로 가져옵니다."""
+    conn = get_connection()
+    rows = conn.execute("SELECT stage, payload FROM pipeline_checkpoints WHERE run_id = ?", (run_id,)).fetchall()
+    return {stage: payload for stage, payload in rows}
+
+def purge_expired_pipeline_runs(ttl_hours: int = PIPELINE_RUN_TTL_HOURS) -> int:
+    """ttl_hours보다 오래된 분석 실행 기록과 체크포인트를 삭제하고 삭제된 실행 수를 반환합니다."""
+    cutoff = (datetime.now() - timedelta(hours=ttl_hours)).strftime('%Y-%m-%d %H:%M:%S')
+    conn = get_connection()
+    try:
+        conn.execute("DELETE FROM pipeline_checkpoints WHERE run_id IN (SELECT run_id FROM pipeline_runs WHERE updated_at < ?)", (cutoff,))
+        deleted = conn.execute("DELETE FROM pipeline_runs WHERE updated_at < ?", (cutoff,)).rowcount
+        conn.commit()
+        return deleted
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 만료된 분석 실행 기록 삭제 실패 - {e}")
+        return 0
+
+
+# --- 임베딩 캐시 함수 (document_processor에서 사용) ---
+def get_cached_embeddings(model_key: str, chunk_hashes: list[str]) -> dict[str, bytes]:
+    """
+    저장된 청크 임베딩을 {청크 해시: float32 바이트} 형태로 가져옵니다. 없는 청크는 결과에 포함되지 않습니다.
+    가져온 청크는 마지막 사용 시각을 갱신하여 크기 정리(purge_embedding_cache)에서 나중에 삭제되게 합니다.
+    """
+    conn = get_connection()
+    cached = {}
+    unique_hashes = list(dict.fromkeys(chunk_hashes))
+    for start in range(0, len(unique_hashes), SQLITE_MAX_IN_PARAMS):
+        batch = unique_hashes[start:start + SQLITE_MAX_IN_PARAMS]
+        placeholders = ",".join("?" * len(batch))
+        rows = conn.execute(f"SELECT chunk_hash, vector FROM embedding_cache WHERE model_key = ? AND chunk_hash IN ({placeholders})",
+                            [model_key, *batch]).fetchall()
+        cached.update(rows)
+    if cached:
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        hit_hashes = list(cached)
+        try:
+            for start in range(0, len(hit_hashes), SQLITE_MAX_IN_PARAMS):
+                batch = hit_hashes[start:start + SQLITE_MAX_IN_PARAMS]
+                placeholders = ",".join("?" * len(batch))
+                conn.execute(f"UPDATE embedding_cache SET last_used_at = ? WHERE model_key = ? AND chunk_hash IN ({placeholders})",
+                             [now, model_key, *batch])
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            print(f"오류: 임베딩 캐시 사용 시각 갱신 실패 - {e}")
+    return cached
+
+def save_cached_embeddings(model_key: str, vectors: list[tuple[str, bytes]]):
+    """청크 임베딩 목록 [(청크 해시, float32 바이트), ...]을 저장합니다. 이미 있는 청크는 건너뜁니다."""
+    created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    conn = get_connection()
+    try:
+        conn.executemany("INSERT OR IGNORE INTO embedding_cache (model_key, chunk_hash, vector, created_at, last_used_at) VALUES (?, ?, ?, ?, ?)",
+                         [(model_key, chunk_hash, vector, created_at, created_at) for chunk_hash, vector in vectors])
+        conn.commit()
+        return True
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 임베딩 캐시 저장 실패 - {e}")
+        return False
+
+def purge_embedding_cache(max_bytes: int = EMBEDDING_CACHE_MAX_BYTES) -> int:
+    """
+    임베딩 캐시 벡터의 총 크기가 max_bytes를 넘으면 마지막 사용 시각이 오래된 벡터부터 삭제하고 삭제한 벡터 수를 반환합니다.
+    (삭제한 공간은 DB 파일 안에서 재사용되며 파일 크기는 VACUUM 전까지 줄어들지 않음)
+    """
+    conn = get_connection()
+    try:
+        total_bytes = conn.execute("SELECT COALESCE(SUM(length(vector)), 0) FROM embedding_cache").fetchone()[0]
+        if total_bytes <= max_bytes:
+            return 0
+        excess = total_bytes - max_bytes
+        stale_rowids = []
+        for rowid, size in conn.execute("SELECT rowid, length(vector) FROM embedding_cache ORDER BY last_used_at, rowid"):
+            if excess <= 0:
+                break
+            stale_rowids.append((rowid,))
+            excess -= size
+        conn.executemany("DELETE FROM embedding_cache WHERE rowid = ?", stale_rowids)
+        conn.commit()
+        return len(stale_rowids)
+    except Exception as e:
+        conn.rollback()
+        print(f"오류: 임베딩 캐시 정리 실패 - {e}")
+        return 0
+
+
+def get_cached_embedding_vectors(limit: int | None = None, model_key: str | None = None) -> list[bytes]:
+    """저장된 청크 임베딩 벡터(float32 바이트)를 가져옵니다. (색인 벤치마크에서 실제 문서 벡터로 측정할 때 사용)"""
+    sql = "SELECT vector FROM embedding_cache"
+    params = []
+    if model_key is not None:
+        sql += " WHERE model_key = ?"
+        params.append(model_key)
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    conn = get_connection()
+    return [row[0] for row in conn.execute(sql, params).fetchall()]
+
+if __name__ == "__main__":
+    result = benchmark_article_ingestion()
+    print(f"{result['rows']}건 저장: 행 단위 {result['per_row_rows_per_sec']:.0f} rows/sec, "
+          f"일괄 {result['bulk_rows_per_sec']:.0f} rows/sec ({result['speedup']:.1f}배)")
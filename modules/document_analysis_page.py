@@ -9,6 +9,8 @@ from datetime import datetime # 파일명에 타임스탬프를 위해 추가
 from modules import ai_service # AI 서비스 모듈
 from modules import document_processor # 새로 만든 문서 처리 모듈
 from modules import database_manager # 데이터베이스 관리 모듈 임포트
+from modules import embedding_models # 프로세스 전체에서 공유하는 임베딩 모델
+from modules import vector_index_cache # 디스크에 저장된 문서 색인
 
 from langchain.memory import StreamlitChatMessageHistory # Langchain Streamlit 통합
 
@@ -51,6 +53,8 @@ def document_analysis_page():
     # 세션 상태 초기화
     if "vectordb" not in st.session_state:
         st.session_state.vectordb = None
+    if "corpus" not in st.session_state: # 업로드된 문서와 벡터 DB (바뀐 파일만 다시 임베딩)
+        st.session_state.corpus = document_processor.DocumentCorpus()
     if 'messages' not in st.session_state:
         st.session_state.messages = [{
             "role": "assistant",
@@ -77,16 +81,36 @@ def document_analysis_page():
         uploaded_files = st.file_uploader("📎 문서 업로드", type=['pdf', 'docx', 'pptx', 'txt'], accept_multiple_files=True)
         process = st.button("📚 문서 처리")
 
+        with st.expander("🧠 임베딩 모델 상태"):
+            memory_usage = embedding_models.get_memory_usage()
+            if memory_usage["process_rss_mb"] is not None:
+                st.caption(f"프로세스 메모리: {memory_usage['process_rss_mb']:.0f}MB")
+            if memory_usage["models"]:
+                for model in memory_usage["models"]:
+                    rss_delta = f"+{model['rss_delta_mb']:.0f}MB" if model.get('rss_delta_mb') is not None else "알 수 없음"
+                    st.caption(f"{model['model_name']} ({model['backend']}{', int8' if model['quantized'] else ''}) · "
+                               f"로드 {model.get('load_seconds', 0):.1f}초 · 메모리 {rss_delta}")
+            else:
+                st.caption("아직 로드된 모델이 없습니다. 첫 문서 처리 시 로드됩니다.")
+            cache_entries = vector_index_cache.list_entries()
+            st.caption(f"문서 색인 캐시: {len(cache_entries)}개, {sum(e['size_bytes'] for e in cache_entries) / (1024 * 1024):.1f}MB")
+
     if process:
         if not uploaded_files:
             st.warning("문서를 업로드해주세요.")
             st.stop()
 
         with st.spinner("문서를 처리 중입니다..."):
-            docs = document_processor.get_text(uploaded_files)
-            chunks = document_processor.get_text_chunks(docs)
-            vectordb = document_processor.get_vectorstore(chunks)
-            st.session_state.vectordb = vectordb
+            corpus = st.session_state.corpus
+            progress_bar = st.progress(0.0, text="문서 처리 준비 중...")
+
+            def update_progress(stage, message, fraction=None):
+                progress_bar.progress(min(max(fraction or 0.0, 0.0), 1.0), text=message)
+
+            sync_result = corpus.sync(uploaded_files, progress_callback=update_progress) # 새로 추가/변경된 파일만 임베딩하고, 빠진 파일은 색인에서 삭제
+            progress_bar.empty()
+            docs = corpus.docs
+            st.session_state.vectordb = corpus.search_vectordb # 청크가 많으면 HNSW/IVF 검색 색인
             st.session_state.docs = docs # 'docs' 세션 상태에 저장 (특약 생성에서 사용)
             
             # 문서의 전체 텍스트를 추출하여 데이터베이스에 저장 (새로 추가된 부분)
@@ -97,6 +121,8 @@ def document_analysis_page():
             st.session_state.messages = [{ # 문서 처리 후 메시지 초기화
                 "role": "assistant",
                 "content": "문서 분석이 완료되었습니다. 이제 질문하거나 특약을 생성할 수 있습니다."
+                           + f" (추가 {len(sync_result['added'])}개, 변경 {len(sync_result['updated'])}개, 삭제 {len(sync_result['removed'])}개, "
+                           f"유지 {len(sync_result['unchanged'])}개 · 저장된 색인 재사용 {len(sync_result['cached'])}개)"
             }]
             st.session_state.generated_endorsement_sections = {} # 문서 처리 시 특약 초기화
             st.session_state['generated_endorsement_full_text'] = "" # 특약 전체 텍스트 초기화
@@ -123,8 +149,8 @@ def document_analysis_page():
                     st.stop()
 
                 with st.spinner("답변 생성 중..."):
-                    retriever = st.session_state.vectordb.as_retriever(search_type="similarity", k=3)
-                    docs = retriever.get_relevant_documents(query)
+                    # BM25(조항 번호, 정확한 용어) + 벡터(의미) 검색 결과를 합쳐 관련 청크를 찾음
+                    docs = st.session_state.corpus.search(query, k=3)
 
                     context = "\n\n".join([doc.page_content for doc in docs])
                     final_prompt = f"""다음 문서를 참고하여 질문에 답하세요.
@@ -163,52 +189,14 @@ def document_analysis_page():
         # 현재 페이지에서는 'docs' 세션 상태가 우선이므로 그대로 사용
         all_text = "\n\n".join([doc.page_content for doc in st.session_state.docs])
         
-        # 특약 구성 항목 정의 (협업자 파일에서 가져옴)
-        sections = {
-            "1. 특약의 명칭": "자동차 보험 표준약관을 참고하여 특약의 **명칭**을 작성해줘.",
-            "2. 특약의 목적": "이 특약의 **목적**을 설명해줘.",
-            "3. 보장 범위": "**보장 범위**에 대해 상세히 작성해줘.",
-            "4. 보험금 지급 조건": "**보험금 지급 조건**을 구체적으로 작성해줘.",
-            "5. 보험료 산정 방식": "**보험료 산정 방식**을 설명해줘.",
-            "6. 면책 사항": "**면책 사항**에 해당하는 내용을 작성해줘.",
-            "7. 특약의 적용 기간": "**적용 기간**을 명시해줘.",
-            "8. 기타 특별 조건": "**기타 특별 조건**이 있다면 제안해줘.",
-            # 새로 추가된 항목들
-            "9. 운전가능자 제한": "**운전자 연령과 범위**에 따른 특별 약관을 제안해줘.",
-            "10. 보험료 할인": "**보험료 할인**에 해당하는 특별 약관을 작성해줘.",
-            "11. 보장 확대": "**법률비용 및 다른 자동차 운전**에 해당하는 특별 약관을 작성해줘"
-        }
-
         if st.button("🚀 특약 생성 시작"):
-            all_generated_sections = {} # 각 섹션별 답변을 저장할 딕셔너리
-            full_text_for_download = "" # 다운로드용 전체 텍스트 (이제 세션 상태에도 저장)
-
             with st.spinner("Gemini API에 순차적으로 요청 중입니다..."):
-                for title, question in sections.items():
-                    st.info(f"⏳ {title} 생성 중...")
-                    prompt = f"""
-너는 자동차 보험을 설계하고 있는 보험사 직원이야.
-다음 조건에 따라 자동차 보험 특약의 '{title}'을 3~5줄 정도로 작성해줘.
-
-[기획 목적]
-- 이 특약은 보험 상품 기획 초기 단계에서 트렌드 조사 및 방향성 도출에 도움 되는 목적으로 작성돼야 해.
-- 새로운 기술(예: 블랙박스, 자율주행 등)이나 최근 사회적 이슈(예: 고령 운전자 증가 등)를 반영해도 좋아.
-- 표준약관 표현 방식을 따라줘.
-
-[표준약관 내용]
-{all_text}
-
-[질문]
-{question}
-
-[답변]
-"""
-                    # ai_service 모듈의 retry_ai_call 함수 사용
-                    response_dict = ai_service.retry_ai_call(prompt, GEMINI_API_KEY)
-                    answer = ai_service.clean_ai_response_text(response_dict.get("text", response_dict.get("error", "AI 응답 실패.")))
-                    
-                    all_generated_sections[title] = answer # 각 섹션별로 저장
-                    full_text_for_download += f"#### {title}\n{answer.strip()}\n\n" # 다운로드용 텍스트에 추가
+                all_generated_sections = ai_service.generate_endorsement_sections(
+                    all_text,
+                    GEMINI_API_KEY,
+                    progress_callback=lambda title, index, total: st.info(f"⏳ {title} 생성 중...")
+                ) # 각 섹션별 답변을 저장할 딕셔너리
+                full_text_for_download = ai_service.format_endorsement_text(all_generated_sections) # 다운로드용 전체 텍스트 (세션 상태에도 저장)
 
             st.session_state.generated_endorsement_sections = all_generated_sections # 세션 상태에 딕셔너리로 저장
             st.session_state['generated_endorsement_full_text'] = full_text_for_download # 새로 추가: 전체 특약 텍스트 세션 상태에 저장
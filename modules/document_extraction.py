@@ -0,0 +1,241 @@
+# modules/document_extraction.py
+# 업로드된 문서(PDF, DOCX, PPTX, TXT)의 텍스트를 여러 프로세스에서 병렬로 추출합니다.
+# 파일 하나씩 순서대로 추출하면 큰 PPTX 하나가 나머지 파일을 모두 기다리게 하므로,
+# 파일(큰 PDF는 페이지 묶음) 단위 작업을 프로세스 풀에 나눠 주고 끝나는 순서대로 결과를 돌려줍니다.
+# 작업마다 제한 시간(EXTRACTION_TIMEOUT)이 있어, 멈춘 로더가 있어도 해당 파일만 건너뛰고 나머지는 계속 처리합니다.
+# 추출 프로세스가 langchain을 임포트하는 데만 수 초가 걸리므로 PDF/DOCX는 pypdf/docx2txt로 직접 읽고(langchain 로더와 같은 결과),
+# 읽기만 하면 되는 TXT는 프로세스를 거치지 않고 현재 프로세스에서 읽습니다.
+# 파일 내용은 upload_ingestion.stage_uploads가 준비한 bytes(메모리에서 바로 파싱) 또는 임시 파일 경로로 받습니다.
+# 환경 변수:
+#   EXTRACTION_WORKERS       추출 프로세스 수 (기본값 0: CPU 수와 4 중 작은 값, 1이면 현재 프로세스에서 순서대로 추출)
+#   EXTRACTION_TIMEOUT       작업(파일 또는 PDF 페이지 묶음) 하나의 제한 시간 (초, 기본값 120)
+#   EXTRACTION_PDF_PAGE_BATCH 큰 PDF를 나눌 페이지 수 (기본값 25, 이 값의 두 배 이상인 PDF만 나눔, 0 이하이면 나누지 않음)
+# 벤치마크: python -m modules.cli extract-benchmark --file a.pdf --file b.pptx
+
+import io
+import itertools
+import multiprocessing
+import os
+import queue
+import time
+from loguru import logger
+
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", "0"))
+EXTRACTION_TIMEOUT = float(os.getenv("EXTRACTION_TIMEOUT", "120"))
+EXTRACTION_PDF_PAGE_BATCH = int(os.getenv("EXTRACTION_PDF_PAGE_BATCH", "25"))
+# 문서 페이지에서는 임베딩 모델 워밍업 스레드 등이 돌고 있으므로 fork 대신 새 인터프리터로 시작 (fork는 잠긴 락을 복사할 수 있음)
+EXTRACTION_START_METHOD = "spawn"
+SUPPORTED_EXTENSIONS = (".pdf", ".docx", ".pptx", ".txt")
+
+
+def default_worker_count() -> int:
+    return EXTRACTION_WORKERS if EXTRACTION_WORKERS > 0 else min(4, os.cpu_count() or 1)
+
+
+def is_supported(file_name: str) -> bool:
+    return file_name.endswith(SUPPORTED_EXTENSIONS)
+
+
+def _open(content: bytes | str):
+    """파일 내용(bytes)이면 메모리 버퍼를, 경로이면 경로를 그대로 반환합니다. (pypdf, docx2txt는 둘 다 받음)"""
+    return io.BytesIO(content) if isinstance(content, bytes) else content
+
+
+def _pdf_pages(reader, file_name: str, start: int, stop: int) -> list[tuple[str, dict]]:
+    return [(reader.pages[page].extract_text(), {"source": file_name, "page": page}) for page in range(start, min(stop, len(reader.pages)))]
+
+
+def load_pdf_pages(file_name: str, content: bytes | str, start: int = 0, stop: int | None = None) -> list[tuple[str, dict]]:
+    """PDF의 [start, stop) 페이지 텍스트를 PyPDFLoader와 같은 형식(source, page 메타데이터)으로 추출합니다."""
+    import pypdf
+
+    reader = pypdf.PdfReader(_open(content))
+    return _pdf_pages(reader, file_name, start, len(reader.pages) if stop is None else stop)
+
+
+def load_file(file_name: str, content: bytes | str) -> list[tuple[str, dict]]:
+    """
+    파일 형식에 맞게 텍스트를 추출하여 [(본문, 메타데이터), ...]를 반환합니다. (페이지 단위, 청크 분할은 document_processor에서)
+    content는 파일 내용(bytes) 또는 파일 경로이며, 메타데이터의 source는 항상 업로드한 파일 이름입니다.
+    """
+    if file_name.endswith('.pdf'):
+        return load_pdf_pages(file_name, content)
+    if file_name.endswith('.docx'):
+        import docx2txt # Docx2txtLoader와 같은 방식
+        return [(docx2txt.process(_open(content)), {"source": file_name})]
+    if file_name.endswith('.txt'):
+        if isinstance(content, bytes):
+            return [(content.decode("utf-8"), {"source": file_name})]
+        with open(content, encoding="utf-8") as f: # TextLoader와 같은 방식
+            return [(f.read(), {"source": file_name})]
+    if file_name.endswith('.pptx'):
+        from langchain_community.document_loaders import UnstructuredPowerPointLoader
+        if isinstance(content, bytes):
+            raise ValueError(f"PPTX는 파일 경로로만 추출할 수 있습니다: {file_name}")
+        return [(doc.page_content, {**doc.metadata, "source": file_name}) for doc in UnstructuredPowerPointLoader(content).load()]
+    raise ValueError(f"지원하지 않는 파일 형식입니다: {file_name}")
+
+
+def _run_task(task: tuple) -> tuple[list[tuple[str, dict]], list[tuple[int, int]]]:
+    """
+    작업 (파일 이름, 내용, 페이지 범위, 페이지 묶음 크기) 하나를 실행하고 (추출 결과, 이어서 추출할 페이지 범위 목록)을 반환합니다.
+    페이지 범위가 없는 PDF 작업은 페이지 수를 먼저 읽어, 묶음 크기의 두 배 이상이면 첫 묶음만 추출하고 나머지 묶음의 범위를 돌려줍니다.
+    (페이지 수 읽기도 작업 안에서 하므로 큰 파일이나 손상된 파일도 제한 시간을 받음)
+    프로세스 풀에서 호출되므로 모듈 최상위 함수이며, 결과는 피클 가능한 튜플 목록입니다.
+    """
+    file_name, content, page_range, page_batch = task
+    if page_range is not None:
+        return load_pdf_pages(file_name, content, *page_range), []
+    if not (file_name.endswith('.pdf') and page_batch > 0):
+        return load_file(file_name, content), []
+    import pypdf
+
+    reader = pypdf.PdfReader(_open(content))
+    page_count = len(reader.pages)
+    if page_count < 2 * page_batch:
+        return _pdf_pages(reader, file_name, 0, page_count), []
+    return _pdf_pages(reader, file_name, 0, page_batch), [(start, start + page_batch) for start in range(page_batch, page_count, page_batch)]
+
+
+def _iter_task_results_serial(tasks: dict):
+    """작업({작업 번호: 작업})을 현재 프로세스에서 순서대로 실행합니다. 실행 중에 tasks에 추가된 작업도 이어서 실행합니다."""
+    started = set()
+    while len(started) < len(tasks):
+        for task_index in [i for i in tasks if i not in started]:
+            started.add(task_index)
+            try:
+                yield task_index, _run_task(tasks[task_index]), None
+            except Exception as e:
+                yield task_index, None, e
+
+
+def _iter_task_results_parallel(tasks: dict, workers: int, timeout: float):
+    """
+    작업({작업 번호: 작업})을 프로세스 풀에서 실행하고 (작업 번호, 결과, 오류)를 끝나는 순서대로 반환합니다.
+    실행 중에 tasks에 추가된 작업(큰 PDF의 나머지 페이지 묶음)도 같은 풀에서 이어서 실행합니다.
+    동시에 실행 중인 작업 수를 프로세스 수 이하로 유지하므로, 제한 시간은 작업이 실제로 시작된 시각부터 잽니다.
+    제한 시간을 넘긴 작업의 프로세스는 멈춘 것으로 보고 더 이상 작업을 주지 않으며, 남은 프로세스가 없으면 풀을 새로 만듭니다.
+    제한 시간을 넘긴 작업이 나중에 끝나면 그 프로세스는 다시 비었으므로 작업을 다시 줍니다. (늦게 도착한 결과는 버림)
+    """
+    context = multiprocessing.get_context(EXTRACTION_START_METHOD)
+    results = queue.Queue()
+    pool = context.Pool(workers)
+    stuck = set() # 제한 시간을 넘겨 아직 프로세스를 차지하고 있는 작업 번호
+    running = {} # {작업 번호: 마감 시각}
+    waiting = []
+    queued = set() # waiting에 넣은 적이 있는 작업 번호
+    try:
+        while True:
+            new_tasks = [i for i in tasks if i not in queued]
+            queued.update(new_tasks)
+            waiting.extend(new_tasks)
+            if not waiting and not running:
+                break
+            if waiting and len(stuck) >= workers:
+                pool.terminate()
+                pool = context.Pool(workers)
+                stuck.clear()
+            while waiting and len(running) + len(stuck) < workers:
+                task_index = waiting.pop(0)
+                pool.apply_async(
+                    _run_task, (tasks[task_index],),
+                    callback=lambda result, i=task_index: results.put((i, result, None)),
+                    error_callback=lambda error, i=task_index: results.put((i, None, error))
+                )
+                running[task_index] = time.monotonic() + timeout
+            try:
+                task_index, result, error = results.get(timeout=max(0.0, min(running.values()) - time.monotonic()))
+            except queue.Empty:
+                now = time.monotonic()
+                for task_index in [i for i, deadline in running.items() if deadline <= now]:
+                    del running[task_index]
+                    stuck.add(task_index)
+                    yield task_index, None, TimeoutError(f"{timeout:.0f}초 안에 추출이 끝나지 않았습니다")
+                continue
+            if task_index in stuck: # 제한 시간을 넘긴 뒤 끝난 작업: 결과는 버리고 프로세스 자리만 돌려받음
+                stuck.discard(task_index)
+            elif running.pop(task_index, None) is not None:
+                yield task_index, result, error
+    finally:
+        if stuck or running:
+            pool.terminate() # 멈춘 작업이나 소비자가 중단한 뒤 남은 작업을 기다리지 않음
+        else:
+            pool.close()
+        pool.join()
+
+
+def iter_extracted(sources: list[tuple[str, bytes | str]], workers: int | None = None, timeout: float | None = None,
+                   page_batch: int | None = None):
+    """
+    [(파일 이름, 내용 bytes 또는 파일 경로), ...]의 텍스트를 추출하여, 파일 하나의 추출이 끝날 때마다
+    (파일 이름, [(본문, 메타데이터), ...])를 반환하는 제너레이터입니다. 파일 이름은 서로 달라야 합니다.
+    파일은 추출이 끝나는 순서대로 나오며, 한 파일의 페이지는 원래 순서를 유지합니다.
+    페이지가 page_batch의 두 배 이상인 PDF는 첫 작업이 페이지 수를 읽은 뒤 나머지를 페이지 묶음 작업으로 나눕니다. (page_batch가 0 이하이면 나누지 않음)
+    추출에 실패하거나 제한 시간을 넘긴 파일은 오류를 기록하고 빈 목록으로 반환합니다.
+    TXT 파일, 그리고 나머지 작업이 하나뿐이고 나눌 수 있는 PDF가 아니거나 workers가 1일 때는 프로세스를 만들지 않고 현재 프로세스에서 추출합니다. (이때는 제한 시간 없음)
+    """
+    workers = workers or default_worker_count()
+    timeout = timeout or EXTRACTION_TIMEOUT
+    page_batch = EXTRACTION_PDF_PAGE_BATCH if page_batch is None else page_batch
+
+    tasks = {i: (file_name, content, None, page_batch) for i, (file_name, content) in enumerate(sources)}
+    remaining = {file_name: 1 for file_name, _ in sources} # {파일 이름: 남은 작업 수}
+    parts = {file_name: {} for file_name, _ in sources} # {파일 이름: {작업 번호: 결과}}
+    failed = set()
+
+    local_tasks = {i: task for i, task in tasks.items() if task[0].endswith('.txt')}
+    pool_tasks = {i: task for i, task in tasks.items() if i not in local_tasks}
+    may_split = page_batch > 0 and any(task[0].endswith('.pdf') for task in pool_tasks.values())
+    workers = workers if may_split else min(workers, len(pool_tasks))
+    if workers > 1:
+        logger.info(f"문서 {len(sources)}개를 프로세스 {workers}개에서 추출합니다.")
+        task_results = itertools.chain(_iter_task_results_serial(local_tasks), _iter_task_results_parallel(pool_tasks, workers, timeout))
+        runner_tasks = pool_tasks
+    else:
+        task_results = _iter_task_results_serial(tasks)
+        runner_tasks = tasks
+
+    for task_index, result, error in task_results:
+        file_name, content = tasks[task_index][:2]
+        remaining[file_name] -= 1
+        if error is not None:
+            if file_name not in failed:
+                logger.error(f"문서 텍스트 추출 실패 ({file_name}): {error}")
+            failed.add(file_name)
+        else:
+            pages, follow_up = result
+            parts[file_name][task_index] = pages
+            for page_range in follow_up: # 큰 PDF의 나머지 페이지 묶음을 같은 실행기에 추가
+                new_index = len(tasks)
+                tasks[new_index] = runner_tasks[new_index] = (file_name, content, page_range, page_batch)
+                remaining[file_name] += 1
+        if remaining[file_name] == 0:
+            if file_name in failed: # 일부 페이지만 있는 문서는 청크 순번이 달라지므로 파일 전체를 건너뜀
+                yield file_name, []
+            else:
+                yield file_name, [page for i in sorted(parts[file_name]) for page in parts[file_name][i]]
+            del parts[file_name]
+
+
+def benchmark_extraction(paths: list[str], workers: int | None = None) -> dict:
+    """
+    로컬 파일 경로 목록의 같은 파일들을 현재 프로세스에서 순서대로 추출할 때와 병렬로 추출할 때의 시간을 비교합니다.
+    반환 값: {"files", "pages", "workers", "serial_seconds", "parallel_seconds", "speedup", "same_pages"}
+    """
+    workers = workers or default_worker_count()
+    sources = [(path, path) for path in paths]
+    started = time.perf_counter()
+    serial = dict(iter_extracted(sources, workers=1))
+    serial_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    parallel = dict(iter_extracted(sources, workers=workers))
+    parallel_seconds = time.perf_counter() - started
+    return {
+        "files": len(paths),
+        "pages": sum(len(pages) for pages in serial.values()),
+        "workers": workers,
+        "serial_seconds": serial_seconds,
+        "parallel_seconds": parallel_seconds,
+        "speedup": serial_seconds / parallel_seconds if parallel_seconds else float("inf"),
+        "same_pages": serial == parallel
+    }
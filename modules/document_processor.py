@@ -1,68 +1,411 @@
 # modules/document_processor.py
 
-import tiktoken
+import functools
+import hashlib
+import time
+from array import array
 from loguru import logger
 from typing import List, Dict, Any
 
-from langchain_community.document_loaders import (
-    PyPDFLoader, Docx2txtLoader, UnstructuredPowerPointLoader, TextLoader
-)
-from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain.embeddings import HuggingFaceEmbeddings
-from langchain.vectorstores import FAISS
+from modules import ann_index
+from modules import database_manager
+from modules import document_extraction
+from modules import embedding_models
+from modules import hybrid_retriever
+from modules import upload_ingestion
+from modules import vector_index_cache
 
+CHUNK_SIZE = 900 # 토큰 수 기준
+CHUNK_OVERLAP = 100
+TOKEN_ENCODING = "cl100k_base" # 청크 길이를 셀 때 사용하는 tiktoken 인코딩
+TOKEN_LENGTH_CACHE_SIZE = 4096 # 분할기가 같은 조각의 길이를 반복해서 물으므로 최근 결과를 기억 (조각이 최대 수 KB라 수십 MB 이내)
 
+# tiktoken, langchain 로더/분할기, FAISS는 임포트만으로도 수 초와 수백 MB가 들기 때문에
+# 각 함수 안에서 처음 필요할 때 임포트합니다. (문서를 처리하기 전에는 로드되지 않음)
+
+
+@functools.lru_cache(maxsize=None)
+def get_encoding():
+    """tiktoken 인코더를 처음 한 번만 만들어 재사용합니다."""
+    import tiktoken
+    return tiktoken.get_encoding(TOKEN_ENCODING)
+
+
+@functools.lru_cache(maxsize=TOKEN_LENGTH_CACHE_SIZE)
 def tiktoken_len(text):
-    """텍스트의 토큰 길이를 계산합니다."""
-    tokenizer = tiktoken.get_encoding("cl100k_base")
-    return len(tokenizer.encode(text))
+    """
+    텍스트의 토큰 길이를 계산합니다.
+    RecursiveCharacterTextSplitter는 청크 후보를 만들 때마다 겹치는 조각의 길이를 다시 묻기 때문에 결과를 기억해 둡니다.
+    특수 토큰 검사가 필요 없으므로 encode_ordinary를 사용합니다. (문서에 "<|endoftext|>" 같은 문자열이 있어도 오류 없음)
+    """
+    return len(get_encoding().encode_ordinary(text))
+
 
+def _to_documents(pages) -> list:
+    from langchain.schema import Document
+    return [Document(page_content=page_content, metadata=metadata) for page_content, metadata in pages]
 
-def get_text(uploaded_files):
-    """업로드된 문서에서 텍스트를 추출합니다."""
-    all_docs = []
+
+def iter_text(uploaded_files, workers: int | None = None):
+    """
+    업로드된 문서의 텍스트를 여러 프로세스에서 병렬로 추출하여, 파일 하나가 끝날 때마다 (업로드 파일, 문서 목록)을 반환하는 제너레이터입니다.
+    파일은 추출이 끝나는 순서대로 나오므로, 받는 쪽은 다른 파일의 추출을 기다리지 않고 바로 청크 분할/임베딩을 시작할 수 있습니다.
+    지원하지 않는 형식이거나 추출에 실패한 파일은 문서 목록이 비어 있습니다.
+    """
+    uploads_by_name = {}
     for doc in uploaded_files:
-        file_name = doc.name
-        try:
-            # Streamlit 환경에서는 파일을 직접 저장해야 로더가 접근 가능
-            with open(file_name, "wb") as f:
-                f.write(doc.getvalue())
-            logger.info(f"Uploaded: {file_name}")
-
-            if file_name.endswith('.pdf'):
-                loader = PyPDFLoader(file_name)
-            elif file_name.endswith('.docx'):
-                loader = Docx2txtLoader(file_name)
-            elif file_name.endswith('.pptx'):
-                loader = UnstructuredPowerPointLoader(file_name)
-            elif file_name.endswith('.txt'):
-                loader = TextLoader(file_name, encoding="utf-8")
-            else:
-                logger.warning(f"지원하지 않는 파일 형식입니다: {file_name}. 건너뜁니다.")
-                continue
+        if not document_extraction.is_supported(doc.name):
+            logger.warning(f"지원하지 않는 파일 형식입니다: {doc.name}. 건너뜁니다.")
+            yield doc, []
+            continue
+        uploads_by_name[doc.name] = doc
 
-            all_docs.extend(loader.load_and_split())
-        except Exception as e:
-            logger.error(f"문서 처리 중 오류 발생 ({file_name}): {e}", exc_info=True)
-            continue # 오류 발생 시 해당 파일은 건너뛰고 다음 파일 처리
-    return all_docs
+    # 작업 디렉터리에 파일을 쓰지 않고, 메모리 버퍼 또는 요청별 임시 파일로 추출 (임시 파일은 추출이 끝나면 삭제)
+    with upload_ingestion.stage_uploads(uploads_by_name.values()) as staged:
+        for file_name in uploads_by_name.keys() - {file_name for file_name, _ in staged}:
+            yield uploads_by_name[file_name], [] # 임시 파일로 저장하지 못한 파일
+        for file_name, pages in document_extraction.iter_extracted(staged, workers):
+            yield uploads_by_name[file_name], _to_documents(pages)
 
 
-def get_text_chunks(texts):
-    """텍스트를 청크 단위로 분할합니다."""
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=900,
-        chunk_overlap=100,
+def get_text(uploaded_files, workers: int | None = None):
+    """업로드된 문서에서 텍스트를 추출합니다. (파일별 병렬 추출, 결과는 업로드 순서대로)"""
+    docs_by_name = {uploaded_file.name: docs for uploaded_file, docs in iter_text(uploaded_files, workers)}
+    return [doc for uploaded_file in uploaded_files for doc in docs_by_name.get(uploaded_file.name, [])]
+
+
+@functools.lru_cache(maxsize=None)
+def get_text_splitter():
+    """토큰 길이 기준 분할기를 한 번만 만들어 재사용합니다."""
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    return RecursiveCharacterTextSplitter(
+        chunk_size=CHUNK_SIZE,
+        chunk_overlap=CHUNK_OVERLAP,
         length_function=tiktoken_len
     )
-    return splitter.split_documents(texts)
 
 
-def get_vectorstore(chunks):
-    """텍스트 청크를 기반으로 벡터 데이터베이스를 생성합니다."""
-    embeddings = HuggingFaceEmbeddings(
-        model_name="jhgan/ko-sroberta-multitask",
-        model_kwargs={'device': 'cpu'},
-        encode_kwargs={'normalize_embeddings': True}
+def get_text_chunks(texts):
+    """텍스트를 청크 단위로 분할합니다."""
+    return get_text_splitter().split_documents(texts)
+
+
+def benchmark_chunking(docs) -> dict:
+    """
+    인코더/길이 캐시가 없는 이전 방식(호출마다 get_encoding + encode)과 현재 분할 방식의 청크 분할 시간을 비교합니다.
+    반환 값: {"pages", "chunks", "baseline_seconds", "cached_seconds", "speedup", "length_calls", "length_cache_hits", "same_chunks"}
+    """
+    import tiktoken
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+    baseline_calls = 0
+
+    def baseline_len(text):
+        nonlocal baseline_calls
+        baseline_calls += 1
+        return len(tiktoken.get_encoding(TOKEN_ENCODING).encode(text, disallowed_special=()))
+
+    baseline_splitter = RecursiveCharacterTextSplitter(chunk_size=CHUNK_SIZE, chunk_overlap=CHUNK_OVERLAP, length_function=baseline_len)
+    started = time.perf_counter()
+    baseline_chunks = baseline_splitter.split_documents(docs)
+    baseline_seconds = time.perf_counter() - started
+
+    tiktoken_len.cache_clear()
+    get_encoding() # 인코더 생성 시간은 프로세스당 한 번이므로 측정에서 제외
+    started = time.perf_counter()
+    chunks = get_text_chunks(docs)
+    cached_seconds = time.perf_counter() - started
+    cache_info = tiktoken_len.cache_info()
+    return {
+        "pages": len(docs),
+        "chunks": len(chunks),
+        "baseline_seconds": baseline_seconds,
+        "cached_seconds": cached_seconds,
+        "speedup": baseline_seconds / cached_seconds if cached_seconds else float("inf"),
+        "length_calls": baseline_calls,
+        "length_cache_hits": cache_info.hits,
+        "same_chunks": [c.page_content for c in chunks] == [c.page_content for c in baseline_chunks]
+    }
+
+
+def embed_chunks(chunks, batch_size: int | None = None, progress_callback=None) -> list[list[float]]:
+    """
+    청크를 batch_size개씩 나눠 임베딩하고 청크 순서대로 벡터 목록을 반환합니다.
+    이전에 같은 모델로 임베딩한 청크(내용 해시 기준)는 DB의 임베딩 캐시에서 가져오고, 나머지만 모델로 계산합니다.
+    progress_callback(stage, message, fraction)으로 진행률을 알립니다.
+    """
+    batch_size = batch_size or embedding_models.EMBEDDING_BATCH_SIZE
+    embeddings = embedding_models.get_embeddings()
+    model_key = "|".join(str(part) for part in embedding_models.get_model_key())
+    texts = [chunk.page_content for chunk in chunks]
+    chunk_hashes = [hashlib.sha256(text.encode('utf-8')).hexdigest() for text in texts]
+
+    vectors = {}
+    for chunk_hash, vector_bytes in database_manager.get_cached_embeddings(model_key, chunk_hashes).items():
+        vector = array('f')
+        vector.frombytes(vector_bytes)
+        vectors[chunk_hash] = vector.tolist()
+
+    # 캐시에 없는 청크만 (같은 내용은 한 번만) 임베딩
+    text_by_hash = dict(zip(chunk_hashes, texts))
+    pending = [chunk_hash for chunk_hash in text_by_hash if chunk_hash not in vectors]
+    total = len(pending)
+    if progress_callback:
+        progress_callback("embed", f"청크 {len(chunks)}개 중 {total}개 임베딩 중... (나머지는 저장된 임베딩 사용)", 0.0 if total else 1.0)
+    for start in range(0, total, batch_size):
+        batch_hashes = pending[start:start + batch_size]
+        batch_vectors = embeddings.embed_documents([text_by_hash[h] for h in batch_hashes])
+        vectors.update(zip(batch_hashes, batch_vectors))
+        database_manager.save_cached_embeddings(model_key, [(h, array('f', v).tobytes()) for h, v in zip(batch_hashes, batch_vectors)])
+        if progress_callback:
+            done = min(start + batch_size, total)
+            progress_callback("embed", f"임베딩 중... ({done}/{total})", done / total)
+    if total:
+        database_manager.purge_embedding_cache() # 새로 저장한 만큼 크기 상한을 넘으면 오래 쓰이지 않은 벡터 삭제
+    return [vectors[h] for h in chunk_hashes]
+
+
+def get_vectorstore(chunks, ids: list[str] | None = None, progress_callback=None):
+    """
+    텍스트 청크를 기반으로 벡터 데이터베이스를 생성합니다. (임베딩 모델은 프로세스에서 한 번만 로드한 것을 재사용)
+    ids를 주면 각 청크의 ID로 사용하며, 나중에 이 ID로 청크를 삭제할 수 있습니다.
+    """
+    from langchain.vectorstores import FAISS
+
+    vectors = embed_chunks(chunks, progress_callback=progress_callback)
+    return FAISS.from_embeddings(
+        list(zip([chunk.page_content for chunk in chunks], vectors)),
+        embedding_models.get_embeddings(),
+        metadatas=[chunk.metadata for chunk in chunks],
+        ids=ids
     )
-    return FAISS.from_documents(chunks, embeddings)
+
+
+def _index_params() -> dict:
+    """색인 캐시 키에 들어가는 처리 설정 (하나라도 바뀌면 색인을 새로 만듦)"""
+    model_name, backend, quantize = embedding_models.get_model_key()
+    return {
+        "loader": "load", # 페이지 단위 로드 후 한 번만 분할 (이전: load_and_split)
+        "chunk_size": CHUNK_SIZE,
+        "chunk_overlap": CHUNK_OVERLAP,
+        "token_encoding": TOKEN_ENCODING,
+        "embedding_model": model_name,
+        "embedding_backend": backend,
+        "embedding_quantized": quantize
+    }
+
+
+def build_file_index(uploaded_file, content_hash: str | None = None, progress_callback=None, docs: list | None = None):
+    """
+    파일 하나를 텍스트 추출 → 청크 분할 → 벡터 DB 생성까지 처리합니다.
+    같은 파일 내용과 같은 설정으로 처리한 적이 있으면 디스크 캐시에서 결과를 불러옵니다.
+    청크 ID는 "<내용 해시 앞 16자리>-<순번>"이므로 같은 내용의 파일은 항상 같은 청크 ID를 가집니다.
+    docs에 이미 추출한 문서(iter_text 결과)를 주면 텍스트 추출 단계를 건너뜁니다.
+    반환 값: (문서 목록, 벡터 DB, 캐시 사용 여부). 추출한 텍스트가 없으면 벡터 DB는 None
+    progress_callback(stage, message, fraction)으로 단계(extract/split/embed)와 진행률을 알립니다.
+    """
+    def report(stage, message, fraction=None):
+        if progress_callback:
+            progress_callback(stage, message, fraction)
+
+    embeddings = embedding_models.get_embeddings()
+    params = _index_params()
+    content_hash = content_hash or vector_index_cache.hash_file_content(uploaded_file.getvalue())
+    cache_key = vector_index_cache.make_cache_key([content_hash], params)
+
+    cached = vector_index_cache.load(cache_key, embeddings)
+    if cached:
+        docs, vectordb = cached
+        logger.info(f"캐시된 문서 색인을 사용합니다: {uploaded_file.name} ({cache_key[:12]})")
+        return docs, vectordb, True
+
+    if docs is None:
+        report("extract", "텍스트 추출 중...", 0.0)
+        docs = get_text([uploaded_file])
+    report("split", f"{len(docs)}페이지를 청크로 분할 중...", 0.0)
+    chunks = get_text_chunks(docs)
+    if not chunks:
+        return docs, None, False
+    vectordb = get_vectorstore(chunks, ids=[f"{content_hash[:16]}-{i:05d}" for i in range(len(chunks))], progress_callback=progress_callback)
+    vector_index_cache.save(cache_key, docs, vectordb, params, [uploaded_file.name])
+    return docs, vectordb, False
+
+
+class DocumentCorpus:
+    """
+    업로드된 문서 집합과 하나의 FAISS 벡터 DB를 함께 관리합니다.
+    sync()에 현재 업로드된 파일 목록을 넘기면 새로 추가되거나 내용이 바뀐 파일만 임베딩하여 추가하고,
+    빠진 파일의 청크는 문서 ID(파일 이름)별로 기록해 둔 청크 ID로 삭제합니다.
+    따라서 처리 시간은 전체 문서 양이 아니라 바뀐 파일의 양에 비례합니다.
+    vectordb는 추가/삭제가 가능한 flat 색인이고, 청크가 많아지면(ann_index.resolve_index_type) 검색에는
+    같은 벡터로 만든 HNSW/IVF 색인(search_vectordb)을 사용합니다. (임베딩은 다시 계산하지 않음)
+    파일을 추가하기만 하면 검색용 색인에 새 벡터만 더하고, 청크를 삭제했거나 색인 종류가 바뀔 때만 새로 만듭니다.
+    청크를 추가/삭제할 때 BM25 색인도 함께 갱신하며, search()는 두 검색 결과를 합친 하이브리드 검색입니다.
+    """
+
+    def __init__(self, index_type: str | None = None):
+        self.vectordb = None
+        self.search_vectordb = None
+        self.index_type = index_type # None이면 VECTOR_INDEX_TYPE 환경 변수 설정(기본값 auto)을 따름
+        self.search_index_type = "flat"
+        self.search_index_stale = False # flat 색인에서 벡터를 삭제해 검색용 색인의 벡터 위치가 맞지 않으면 True
+        self.bm25 = hybrid_retriever.BM25Index()
+        self.retriever = None
+        self.files = {} # {문서 ID(파일 이름): {"content_hash": str, "chunk_ids": list[str], "docs": list}} (추가된 순서 유지)
+
+    @property
+    def docs(self) -> list:
+        """모든 파일의 문서(페이지) 목록을 파일이 추가된 순서대로 반환합니다."""
+        return [doc for entry in self.files.values() for doc in entry["docs"]]
+
+    @property
+    def chunk_count(self) -> int:
+        return sum(len(entry["chunk_ids"]) for entry in self.files.values())
+
+    def remove_file(self, doc_id: str):
+        """문서 ID(파일 이름)에 해당하는 파일과 그 청크를 벡터 DB에서 삭제합니다."""
+        entry = self.files.pop(doc_id, None)
+        if not entry or not entry["chunk_ids"] or self.vectordb is None:
+            return
+        for chunk_id in entry["chunk_ids"]:
+            self.bm25.remove(chunk_id)
+        self.search_index_stale = True
+        if self.chunk_count == 0:
+            self.vectordb = None # 빈 FAISS 색인은 검색할 수 없으므로 새로 만들도록 비움
+        else:
+            self.vectordb.delete(entry["chunk_ids"])
+
+    def add_file(self, uploaded_file, content_hash: str | None = None, progress_callback=None, docs: list | None = None) -> bool:
+        """파일 하나를 처리해 벡터 DB에 추가합니다. 캐시된 색인을 사용했으면 True를 반환합니다."""
+        content_hash = content_hash or vector_index_cache.hash_file_content(uploaded_file.getvalue())
+        docs, file_index, from_cache = build_file_index(uploaded_file, content_hash, progress_callback, docs)
+        chunk_ids = list(file_index.index_to_docstore_id.values()) if file_index is not None else []
+        if file_index is not None:
+            for chunk_id in chunk_ids:
+                self.bm25.add(chunk_id, file_index.docstore.search(chunk_id).page_content)
+            if self.vectordb is None:
+                self.vectordb = file_index
+            else:
+                self.vectordb.merge_from(file_index)
+        self.files[uploaded_file.name] = {"content_hash": content_hash, "chunk_ids": chunk_ids, "docs": docs}
+        return from_cache
+
+    def sync(self, uploaded_files, progress_callback=None) -> dict:
+        """
+        벡터 DB를 현재 업로드된 파일 목록에 맞춥니다.
+        캐시된 색인이 없는 파일은 여러 프로세스에서 병렬로 텍스트를 추출하고, 추출이 끝나는 순서대로 청크 분할/임베딩합니다.
+        progress_callback(stage, message, fraction)의 fraction은 처리할 파일 전체에 대한 진행률(0~1)입니다.
+        반환 값: {"added": [...], "updated": [...], "removed": [...], "unchanged": [...], "skipped": [...], "cached": [...]} (파일 이름 목록)
+        """
+        result = {"added": [], "updated": [], "removed": [], "unchanged": [], "skipped": [], "cached": []}
+        current = {doc.name: (doc, vector_index_cache.hash_file_content(doc.getvalue())) for doc in uploaded_files}
+
+        for doc_id in [doc_id for doc_id in self.files if doc_id not in current]:
+            self.remove_file(doc_id)
+            result["removed"].append(doc_id)
+
+        # 내용이 그대로인 파일의 해시만 중복 검사에 사용 (내용이 바뀐 파일의 기존 청크는 이번 동기화에서 삭제되므로,
+        # 두 파일의 내용을 맞바꿔도 서로를 중복으로 보지 않음)
+        kept_hashes = {entry["content_hash"] for doc_id, entry in self.files.items() if entry["content_hash"] == current[doc_id][1]}
+        pending = {} # {문서 ID: (업로드 파일, 내용 해시, 기존에 있던 파일인지)}
+        for doc_id, (uploaded_file, content_hash) in current.items():
+            entry = self.files.get(doc_id)
+            if entry and entry["content_hash"] == content_hash:
+                result["unchanged"].append(doc_id)
+                continue
+            if entry:
+                self.remove_file(doc_id)
+            if content_hash in kept_hashes or any(other_hash == content_hash for _, other_hash, _ in pending.values()):
+                # 같은 내용의 파일이 다른 이름으로 이미 있음 (청크 ID가 겹치므로 추가하지 않음, 바뀌기 전 내용은 위에서 삭제)
+                logger.info(f"같은 내용의 문서가 이미 있어 건너뜁니다: {doc_id}")
+                result["skipped"].append(doc_id)
+                if entry:
+                    result["removed"].append(doc_id)
+                continue
+            pending[doc_id] = (uploaded_file, content_hash, entry is not None)
+
+        processed = 0
+
+        def add(doc_id, docs=None):
+            nonlocal processed
+            uploaded_file, content_hash, existed = pending[doc_id]
+            file_callback = None
+            if progress_callback:
+                file_number = processed
+
+                def file_callback(stage, message, fraction=None):
+                    overall = (file_number + (fraction or 0.0)) / len(pending)
+                    progress_callback(stage, f"[{file_number + 1}/{len(pending)}] {doc_id}: {message}", overall)
+
+            if self.add_file(uploaded_file, content_hash, file_callback, docs):
+                result["cached"].append(doc_id)
+            result["updated" if existed else "added"].append(doc_id)
+            processed += 1
+
+        # 캐시된 색인이 있는 파일은 추출할 필요가 없으므로 먼저 불러오고, 나머지는 추출이 끝나는 대로 처리
+        params = _index_params()
+        to_extract = []
+        for doc_id, (uploaded_file, content_hash, _) in pending.items():
+            if vector_index_cache.contains(vector_index_cache.make_cache_key([content_hash], params)):
+                add(doc_id)
+            else:
+                to_extract.append(uploaded_file)
+        if to_extract and progress_callback:
+            progress_callback("extract", f"문서 {len(to_extract)}개 텍스트 추출 중...", processed / len(pending))
+        for uploaded_file, docs in iter_text(to_extract):
+            add(uploaded_file.name, docs)
+
+        self.files = {doc_id: self.files[doc_id] for doc_id in current if doc_id in self.files} # 업로드 순서로 정렬
+        if result["added"] or result["updated"] or result["removed"] or self.search_vectordb is None:
+            self.refresh_search_index(progress_callback)
+        logger.info(f"문서 동기화 완료: 추가 {len(result['added'])}개, 변경 {len(result['updated'])}개, "
+                    f"삭제 {len(result['removed'])}개, 유지 {len(result['unchanged'])}개 (청크 {self.chunk_count}개)")
+        return result
+
+    def refresh_search_index(self, progress_callback=None):
+        """
+        청크 수에 맞는 색인 종류로 검색용 색인을 갱신합니다. flat이면 vectordb를 그대로 사용합니다.
+        색인 종류가 그대로이고 삭제된 청크가 없으면 기존 HNSW/IVF 색인에 새 벡터만 추가하고, 아니면 새로 만듭니다.
+        """
+        previous_type = self.search_index_type
+        self.search_index_type = ann_index.resolve_index_type(self.chunk_count, self.index_type)
+        self.retriever = None
+        if self.vectordb is None or self.search_index_type == "flat":
+            self.search_index_type = "flat"
+            self.search_vectordb = self.vectordb
+            self.search_index_stale = False
+        elif (self.search_index_type == previous_type and not self.search_index_stale
+              and self.search_vectordb is not None and self.search_vectordb is not self.vectordb):
+            self._extend_search_vectordb(progress_callback)
+        else:
+            self._rebuild_search_vectordb(progress_callback)
+        if self.search_vectordb is not None:
+            self.retriever = hybrid_retriever.HybridRetriever(self.search_vectordb, self.bm25, embedding_models.get_embeddings())
+
+    def _rebuild_search_vectordb(self, progress_callback=None):
+        if progress_callback:
+            progress_callback("index", f"청크 {self.chunk_count}개로 {self.search_index_type} 검색 색인 생성 중...", 1.0)
+        try:
+            self.search_vectordb = ann_index.rebuild_store(self.vectordb, self.search_index_type)
+        except Exception as e:
+            logger.error(f"{self.search_index_type} 검색 색인 생성 실패: {e}. flat 색인으로 검색합니다.")
+            self.search_index_type = "flat"
+            self.search_vectordb = self.vectordb
+        self.search_index_stale = False
+
+    def _extend_search_vectordb(self, progress_callback=None):
+        if progress_callback:
+            progress_callback("index", f"{self.search_index_type} 검색 색인에 새 청크 추가 중...", 1.0)
+        try:
+            added = ann_index.extend_store(self.search_vectordb, self.vectordb)
+            logger.info(f"{self.search_index_type} 검색 색인에 벡터 {added}개 추가 (전체 {self.search_vectordb.index.ntotal}개)")
+        except Exception as e:
+            logger.error(f"{self.search_index_type} 검색 색인에 추가 실패: {e}. 색인을 새로 만듭니다.")
+            self._rebuild_search_vectordb(progress_callback)
+
+    def search(self, query: str, k: int = 3) -> list:
+        """질문과 관련된 청크를 BM25 + 벡터 하이브리드 검색으로 k개 찾습니다. 처리된 문서가 없으면 빈 목록을 반환합니다."""
+        if self.retriever is None:
+            return []
+        return self.retriever.search(query, k)
@@ -0,0 +1,169 @@
+# modules/embedding_models.py
+# 문서 임베딩 모델을 프로세스 전체에서 한 번만 로드하여 모든 Streamlit 세션/스레드가 공유하도록 관리합니다.
+# 모델 가중치(수백 MB)를 '문서 처리'를 누를 때마다 다시 읽지 않도록, 로드한 모델은 (모델 이름, 백엔드, 양자화 여부)별로 보관합니다.
+# 환경 변수:
+#   EMBEDDING_MODEL     사용할 sentence-transformers 모델 (기본값 jhgan/ko-sroberta-multitask)
+#   EMBEDDING_BACKEND   torch / onnx / openvino (onnx, openvino는 sentence-transformers 3.2 이상과 optimum 필요)
+#   EMBEDDING_QUANTIZE  1이면 torch 백엔드에서 Linear 층을 int8로 동적 양자화 (CPU 추론 속도/메모리 개선, 정확도는 약간 떨어질 수 있음)
+#   EMBEDDING_WARMUP    1이면 앱 시작 시 백그라운드에서 모델을 미리 로드
+#   EMBEDDING_BATCH_SIZE 한 번에 임베딩할 청크 수 (기본값 32)
+#   EMBEDDING_THREADS   torch 연산에 사용할 CPU 스레드 수 (기본값: torch 기본값, 보통 물리 코어 수)
+
+import os
+import threading
+import time
+from loguru import logger
+
+DEFAULT_EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "jhgan/ko-sroberta-multitask")
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_QUANTIZE = os.getenv("EMBEDDING_QUANTIZE", "0") == "1"
+EMBEDDING_WARMUP = os.getenv("EMBEDDING_WARMUP", "0") == "1"
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
+EMBEDDING_THREADS = int(os.getenv("EMBEDDING_THREADS", "0")) # 0이면 torch 기본값 사용
+SUPPORTED_BACKENDS = ("torch", "onnx", "openvino")
+
+_models = {} # {(모델 이름, 백엔드, 양자화 여부): HuggingFaceEmbeddings}
+_load_stats = {} # {(모델 이름, 백엔드, 양자화 여부): 로드 시간/메모리 증가량}
+_registry_lock = threading.Lock() # 여러 세션이 동시에 처음 요청해도 모델은 한 번만 로드
+_unavailable_backends = set() # 로드에 실패한 백엔드 (이후 요청은 바로 torch 백엔드 사용)
+_warmup_thread = None
+
+
+def _current_rss_mb() -> float | None:
+    """현재 프로세스의 상주 메모리(RSS)를 MB 단위로 반환합니다. 알 수 없으면 None."""
+    try:
+        import psutil # 선택 의존성
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _load_model(model_name: str, backend: str, quantize: bool):
+    from langchain.embeddings import HuggingFaceEmbeddings
+
+    if EMBEDDING_THREADS > 0:
+        try:
+            import torch
+            torch.set_num_threads(EMBEDDING_THREADS) # 프로세스 전체에 적용 (여러 사용자가 동시에 임베딩할 때 코어를 나눠 쓰도록 줄일 수 있음)
+        except ImportError:
+            pass
+    model_kwargs = {'device': 'cpu'}
+    if backend != "torch":
+        model_kwargs['backend'] = backend
+    embeddings = HuggingFaceEmbeddings(
+        model_name=model_name,
+        model_kwargs=model_kwargs,
+        encode_kwargs={'normalize_embeddings': True, 'batch_size': EMBEDDING_BATCH_SIZE}
+    )
+    if quantize and backend == "torch":
+        try:
+            import torch
+            embeddings.client = torch.quantization.quantize_dynamic(embeddings.client, {torch.nn.Linear}, dtype=torch.qint8)
+        except Exception as e:
+            logger.warning(f"임베딩 모델 int8 양자화 실패: {e}. 양자화하지 않은 모델을 사용합니다.")
+    return embeddings
+
+
+def get_model_key(model_name: str | None = None, backend: str | None = None, quantize: bool | None = None) -> tuple[str, str, bool]:
+    """
+    get_embeddings가 실제로 사용할 (모델 이름, 백엔드, 양자화 여부)를 반환합니다.
+    같은 키의 모델은 같은 임베딩 벡터를 만들므로, 임베딩 결과를 캐시할 때 키의 일부로 사용합니다.
+    """
+    model_name = model_name or DEFAULT_EMBEDDING_MODEL
+    backend = backend or EMBEDDING_BACKEND
+    if backend not in SUPPORTED_BACKENDS:
+        logger.warning(f"지원하지 않는 임베딩 백엔드입니다: {backend}. torch 백엔드를 사용합니다.")
+        backend = "torch"
+    if backend in _unavailable_backends:
+        backend = "torch"
+    quantize = EMBEDDING_QUANTIZE if quantize is None else quantize
+    return model_name, backend, quantize
+
+
+def get_embeddings(model_name: str | None = None, backend: str | None = None, quantize: bool | None = None):
+    """
+    임베딩 모델(HuggingFaceEmbeddings)을 반환합니다. 처음 요청될 때 한 번만 로드하고 이후에는 같은 객체를 반환합니다.
+    인자를 생략하면 환경 변수 설정(EMBEDDING_MODEL, EMBEDDING_BACKEND, EMBEDDING_QUANTIZE)을 따릅니다.
+    """
+    key = model_name, backend, quantize = get_model_key(model_name, backend, quantize)
+
+    embeddings = _models.get(key)
+    if embeddings is not None:
+        return embeddings
+    with _registry_lock:
+        if key in _models:
+            return _models[key]
+        logger.info(f"임베딩 모델 로드 시작: {model_name} (백엔드 {backend}, 양자화 {'사용' if quantize else '미사용'})")
+        rss_before = _current_rss_mb()
+        started = time.perf_counter()
+        try:
+            embeddings = _load_model(model_name, backend, quantize)
+        except (TypeError, ValueError, ImportError) as e:
+            if backend == "torch":
+                raise
+            # 설치된 sentence-transformers/optimum이 이 백엔드를 지원하지 않음
+            logger.warning(f"임베딩 모델을 {backend} 백엔드로 로드하지 못했습니다: {e}. torch 백엔드를 사용합니다.")
+            _unavailable_backends.add(backend)
+            embeddings = None
+        else:
+            rss_after = _current_rss_mb()
+            _models[key] = embeddings
+            _load_stats[key] = {
+                "load_seconds": time.perf_counter() - started,
+                "rss_delta_mb": rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+                "loaded_at": time.strftime('%Y-%m-%d %H:%M:%S')
+            }
+            logger.info(f"임베딩 모델 로드 완료: {model_name} ({_load_stats[key]['load_seconds']:.1f}초)")
+    return embeddings if embeddings is not None else get_embeddings(model_name, "torch", quantize)
+
+
+def warm_up(model_name: str | None = None):
+    """모델을 로드하고 짧은 문장을 한 번 임베딩하여, 첫 문서 처리 때 로드/초기화 지연이 없도록 합니다."""
+    try:
+        get_embeddings(model_name).embed_query("임베딩 모델 워밍업")
+        logger.info("임베딩 모델 워밍업 완료")
+    except Exception as e:
+        logger.error(f"임베딩 모델 워밍업 실패: {e}")
+
+
+def start_background_warmup() -> bool:
+    """
+    EMBEDDING_WARMUP=1이면 백그라운드 스레드에서 모델을 미리 로드합니다. 프로세스당 한 번만 시작하며, 시작했으면 True를 반환합니다.
+    (앱 시작을 막지 않도록 별도 스레드에서 실행)
+    """
+    global _warmup_thread
+    if not EMBEDDING_WARMUP:
+        return False
+    with _registry_lock:
+        if _warmup_thread is not None:
+            return False
+        _warmup_thread = threading.Thread(target=warm_up, name="embedding-warmup", daemon=True)
+        _warmup_thread.start()
+    return True
+
+
+def is_loaded(model_name: str | None = None) -> bool:
+    """지정한 모델(생략 시 기본 모델)이 이미 로드되어 있는지 여부를 반환합니다."""
+    model_name = model_name or DEFAULT_EMBEDDING_MODEL
+    return any(key[0] == model_name for key in _models)
+
+
+def get_memory_usage() -> dict:
+    """
+    프로세스 메모리와 로드된 임베딩 모델 정보를 반환합니다.
+    반환 값: {"process_rss_mb": float | None, "models": [{"model_name", "backend", "quantized", "load_seconds", "rss_delta_mb", "loaded_at"}, ...]}
+    rss_delta_mb는 모델을 로드하면서 늘어난 프로세스 메모리(근사치)입니다.
+    """
+    return {
+        "process_rss_mb": _current_rss_mb(),
+        "models": [
+            {"model_name": model_name, "backend": backend, "quantized": quantize, **_load_stats.get((model_name, backend, quantize), {})}
+            for model_name, backend, quantize in list(_models)
+        ]
+    }
@@ -0,0 +1,137 @@
+# modules/hybrid_retriever.py
+# 문서 QA 검색을 위한 BM25(키워드) + FAISS(의미) 하이브리드 검색기입니다.
+# 임베딩 검색은 뜻이 비슷한 문장은 잘 찾지만 "제3조", "면책" 같은 조항 번호나 정확한 용어를 자주 놓치므로,
+# 청크를 만들 때 BM25 색인도 함께 만들어 두고 두 검색 결과의 순위를 RRF(Reciprocal Rank Fusion)로 합칩니다.
+
+import heapq
+import math
+import re
+from collections import Counter, OrderedDict
+from loguru import logger
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+RRF_K = 60 # RRF 점수 1 / (RRF_K + 순위)의 상수. 클수록 하위 순위의 영향이 커짐
+CANDIDATE_COUNT = 20 # 각 검색기에서 가져와 합칠 후보 수
+QUERY_CACHE_SIZE = 128 # 검색 결과를 기억할 최근 질문 수
+
+# "제 3 조", "제3 항"처럼 띄어 쓴 조항 번호를 "제3조" 한 토큰으로 맞춤
+_CLAUSE_PATTERN = re.compile(r"제\s*(\d+)\s*(조|항|호|관|장|절)")
+_TOKEN_PATTERN = re.compile(r"제\d+(?:조|항|호|관|장|절)|[가-힣]+|[a-z]+|\d+(?:\.\d+)?")
+_HANGUL_PATTERN = re.compile(r"^[가-힣]+$")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    BM25용 토큰 목록을 만듭니다. 조항 번호, 한글 어절, 영문 단어, 숫자를 토큰으로 하고,
+    조사가 붙은 어절("보험금을")도 찾을 수 있도록 세 글자 이상의 한글 어절은 두 글자씩 나눈 토큰(바이그램)도 추가합니다.
+    """
+    text = _CLAUSE_PATTERN.sub(r"제\1\2", text.lower())
+    tokens = []
+    for word in _TOKEN_PATTERN.findall(text):
+        tokens.append(word)
+        if len(word) > 2 and _HANGUL_PATTERN.match(word):
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class BM25Index:
+    """청크 ID별로 추가/삭제할 수 있는 BM25 색인입니다. (DocumentCorpus가 파일 단위로 갱신)"""
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.postings = {} # {토큰: {청크 ID: 빈도}}
+        self.doc_lengths = {} # {청크 ID: 토큰 수}
+        self.chunk_terms = {} # {청크 ID: 토큰 목록} (삭제할 때 해당 토큰의 목록만 고치기 위해)
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def add(self, chunk_id: str, text: str):
+        if chunk_id in self.doc_lengths:
+            self.remove(chunk_id)
+        term_counts = Counter(tokenize(text))
+        for term, count in term_counts.items():
+            self.postings.setdefault(term, {})[chunk_id] = count
+        length = sum(term_counts.values())
+        self.chunk_terms[chunk_id] = list(term_counts)
+        self.doc_lengths[chunk_id] = length
+        self.total_length += length
+
+    def remove(self, chunk_id: str):
+        length = self.doc_lengths.pop(chunk_id, None)
+        if length is None:
+            return
+        self.total_length -= length
+        for term in self.chunk_terms.pop(chunk_id):
+            del self.postings[term][chunk_id]
+            if not self.postings[term]:
+                del self.postings[term]
+
+    def search(self, query: str, k: int = CANDIDATE_COUNT) -> list[tuple[str, float]]:
+        """질문과 BM25 점수가 높은 순으로 [(청크 ID, 점수), ...]를 반환합니다."""
+        doc_count = len(self.doc_lengths)
+        if not doc_count:
+            return []
+        average_length = self.total_length / doc_count or 1.0
+        scores = {}
+        for term in set(tokenize(query)):
+            chunk_counts = self.postings.get(term)
+            if not chunk_counts:
+                continue
+            idf = math.log(1 + (doc_count - len(chunk_counts) + 0.5) / (len(chunk_counts) + 0.5))
+            for chunk_id, count in chunk_counts.items():
+                length_norm = 1 - self.b + self.b * self.doc_lengths[chunk_id] / average_length
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * count * (self.k1 + 1) / (count + self.k1 * length_norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], rrf_k: int = RRF_K) -> list[tuple[str, float]]:
+    """여러 검색 결과(청크 ID 순위 목록)를 RRF 점수로 합쳐 점수가 높은 순으로 반환합니다."""
+    scores = {}
+    for ranking in rankings:
+        for rank, chunk_id in enumerate(ranking, start=1):
+            scores[chunk_id] = scores.get(chunk_id, 0.0) + 1.0 / (rrf_k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridRetriever:
+    """
+    FAISS 벡터 검색과 BM25 검색 결과를 RRF로 합쳐 문서를 찾습니다.
+    같은 질문을 다시 하면 저장해 둔 결과를 돌려줍니다. (문서가 바뀌면 DocumentCorpus가 검색기를 새로 만들어 캐시도 비워짐)
+    """
+
+    def __init__(self, vectordb, bm25: BM25Index, embeddings, candidate_count: int = CANDIDATE_COUNT,
+                 rrf_k: int = RRF_K, cache_size: int = QUERY_CACHE_SIZE):
+        self.vectordb = vectordb
+        self.bm25 = bm25
+        self.embeddings = embeddings
+        self.candidate_count = candidate_count
+        self.rrf_k = rrf_k
+        self.cache_size = cache_size
+        self._cache = OrderedDict() # {(정규화된 질문, k): [청크 ID, ...]}
+
+    def _vector_search(self, query: str) -> list[str]:
+        import numpy as np
+
+        query_vector = np.array([self.embeddings.embed_query(query)], dtype="float32")
+        _, positions = self.vectordb.index.search(query_vector, min(self.candidate_count, self.vectordb.index.ntotal))
+        return [self.vectordb.index_to_docstore_id[position] for position in positions[0] if position != -1]
+
+    def search(self, query: str, k: int = 3) -> list:
+        """질문과 관련된 청크(Document)를 k개 반환합니다."""
+        cache_key = (" ".join(query.split()), k)
+        chunk_ids = self._cache.get(cache_key)
+        if chunk_ids is not None:
+            self._cache.move_to_end(cache_key)
+        else:
+            rankings = [self._vector_search(query), [chunk_id for chunk_id, _ in self.bm25.search(query, self.candidate_count)]]
+            chunk_ids = [chunk_id for chunk_id, _ in reciprocal_rank_fusion(rankings, self.rrf_k)[:k]]
+            logger.info(f"하이브리드 검색: 벡터 후보 {len(rankings[0])}개, BM25 후보 {len(rankings[1])}개 → {len(chunk_ids)}개")
+            self._cache[cache_key] = chunk_ids
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        docs = [self.vectordb.docstore.search(chunk_id) for chunk_id in chunk_ids]
+        return [doc for doc in docs if not isinstance(doc, str)] # docstore는 없는 ID에 대해 안내 문자열을 반환
@@ -3,22 +3,58 @@
 import requests
 from bs4 import BeautifulSoup
 import time
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from loguru import logger
 
-# Streamlit의 st.error, st.warning 등을 사용하기 위해 임시로 import.
-# 실제 프로덕션에서는 이 로깅 부분을 다른 방식으로 처리하는 것이 좋습니다.
-import streamlit as st
+REQUEST_HEADERS = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36 Edg/138.0.0.0'}
 
-def crawl_naver_news_metadata(keyword: str, current_search_date: datetime, max_naver_search_pages_per_day: int):
+
+class RateLimiter:
+    """여러 스레드가 공유하는 요청 속도 제한기입니다. 요청 사이의 최소 간격을 보장합니다."""
+
+    def __init__(self, requests_per_second: float = 2.0):
+        self.min_interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next_allowed_time = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            wait_seconds = self._next_allowed_time - now
+            self._next_allowed_time = max(now, self._next_allowed_time) + self.min_interval
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+
+def create_session(pool_size: int = 8) -> requests.Session:
+    """연결을 재사용하는 HTTP 세션을 생성합니다. (여러 크롤링 작업이 공유)"""
+    session = requests.Session()
+    session.headers.update(REQUEST_HEADERS)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def crawl_naver_news_metadata(keyword: str, current_search_date: datetime, max_naver_search_pages_per_day: int,
+                              session: requests.Session | None = None, rate_limiter: RateLimiter | None = None,
+                              errors: list | None = None):
     """
     지정된 키워드와 날짜로 네이버 뉴스 메타데이터를 크롤링합니다.
     Args:
         keyword (str): 검색할 키워드.
         current_search_date (datetime): 검색할 날짜 (datetime 객체).
         max_naver_search_pages_per_day (int): 해당 날짜에 크롤링할 최대 페이지 수.
+        session (requests.Session, optional): 공유 HTTP 세션. 없으면 요청마다 새 연결을 사용합니다.
+        rate_limiter (RateLimiter, optional): 공유 속도 제한기. 없으면 페이지마다 0.5초 대기합니다.
+        errors (list, optional): 주어지면 요청/파싱 오류로 크롤링을 중단했을 때 오류 메시지를 추가합니다.
+            (반환된 목록이 그날의 전체 기사인지, 오류로 일부만 수집된 것인지 구분할 때 사용)
     Returns:
         list[dict]: 수집된 기사 메타데이터 목록.
     """
+    http = session or requests
     articles_on_this_day = []
     formatted_search_date = current_search_date.strftime('%Y.%m.%d')
 
@@ -33,8 +69,9 @@ def crawl_naver_news_metadata(keyword: str, current_search_date: datetime, max_n
         )
 
         try:
-            headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36 Edg/138.0.0.0'}
-            response = requests.get(search_url, headers=headers)
+            if rate_limiter:
+                rate_limiter.wait()
+            response = http.get(search_url, headers=REQUEST_HEADERS)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, "html.parser")
 
@@ -74,12 +111,64 @@ def crawl_naver_news_metadata(keyword: str, current_search_date: datetime, max_n
                 if articles_on_this_page_count == 0:
                     break
 
-            time.sleep(0.5) # 서버 부하를 줄이기 위한 딜레이
+            if not rate_limiter:
+                time.sleep(0.5) # 서버 부하를 줄이기 위한 딜레이
 
         except requests.exceptions.RequestException as e:
-            st.error(f"웹 페이지 요청 중 오류 발생 ({formatted_search_date} 날짜, 페이지 {page + 1}): {e}")
+            logger.error(f"웹 페이지 요청 중 오류 발생 ({formatted_search_date} 날짜, 페이지 {page + 1}): {e}")
+            if errors is not None:
+                errors.append(f"페이지 {page + 1}: {e}")
             break # 오류 발생 시 해당 날짜의 크롤링 중단
         except Exception as e:
-            st.error(f"스크립트 실행 중 오류 발생 ({formatted_search_date} 날짜, 페이지 {page + 1}): {e}")
+            logger.error(f"스크립트 실행 중 오류 발생 ({formatted_search_date} 날짜, 페이지 {page + 1}): {e}")
+            if errors is not None:
+                errors.append(f"페이지 {page + 1}: {e}")
             break # 오류 발생 시 해당 날짜의 크롤링 중단
     return articles_on_this_day
+
+
+def crawl_profiles_concurrently(profiles: list[dict], max_workers: int = 4, requests_per_second: float = 2.0) -> dict[int, list[dict]]:
+    """
+    여러 검색 프로필을 (검색어, 날짜) 단위 작업으로 나누어 동시에 크롤링합니다.
+    검색어가 같은 프로필끼리는 같은 날짜를 한 번만 요청하고 결과를 함께 사용합니다.
+    (프로필마다 페이지 수가 다르면 가장 큰 페이지 수로 수집하므로, 페이지 수가 작은 프로필도 그만큼의 기사를 받음)
+    모든 작업은 하나의 HTTP 세션(연결 풀)과 하나의 속도 제한기를 공유하므로,
+    프로필 수가 늘어도 네이버에 보내는 초당 요청 수는 requests_per_second를 넘지 않습니다.
+    Args:
+        profiles (list[dict]): database_manager.get_search_profiles() 형식의 프로필 목록.
+        max_workers (int): 동시에 실행할 크롤링 스레드 수.
+        requests_per_second (float): 전체 작업이 공유하는 초당 최대 요청 수.
+    Returns:
+        dict[int, list[dict]]: 프로필 ID -> 수집된 기사 메타데이터 목록 (날짜 오름차순).
+    """
+    today_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    session = create_session(pool_size=max_workers)
+    rate_limiter = RateLimiter(requests_per_second)
+
+    def search_dates(profile):
+        search_start_date = today_date - timedelta(days=profile['total_search_days'] - 1)
+        return [search_start_date + timedelta(days=i) for i in range(profile['total_search_days'])]
+
+    # (검색어, 날짜) -> 수집할 페이지 수
+    jobs = {}
+    for profile in profiles:
+        for search_date in search_dates(profile):
+            job_key = (profile['keyword'], search_date)
+            jobs[job_key] = max(jobs.get(job_key, 0), profile['max_naver_search_pages_per_day'])
+
+    crawled = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(crawl_naver_news_metadata, keyword, search_date, max_pages, session, rate_limiter): (keyword, search_date)
+                for (keyword, search_date), max_pages in jobs.items()
+            }
+            for future in as_completed(futures):
+                crawled[futures[future]] = future.result()
+    finally:
+        session.close()
+
+    return {
+        profile['id']: [article for search_date in search_dates(profile) for article in crawled[(profile['keyword'], search_date)]]
+        for profile in profiles
+    }
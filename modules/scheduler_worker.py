@@ -0,0 +1,212 @@
+# modules/scheduler_worker.py
+# 예약된 보고서 작업을 브라우저 없이 실행하는 스케줄러 워커입니다.
+# 실행: python -m modules.scheduler_worker [--workers 2] [--max-concurrent 4] [--poll-interval 30] [--once]
+# 웹 앱은 예약 설정과 실행 기록 조회만 담당하고, 예약 시간 확인과 실행은 이 프로세스가 맡습니다.
+# 실행 시각이 된 예약 작업은 작업 큐(job_queue)에 넣고, 워커 풀이 우선순위 순으로 꺼내 실행합니다.
+# 워커 프로세스를 여러 개 띄워도 같은 회차는 한 번만 큐에 들어가고 한 워커만 가져갑니다.
+
+import argparse
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from dotenv import load_dotenv
+from loguru import logger
+
+from modules import analysis_pipeline
+from modules import cron_schedule
+from modules import database_manager
+
+DEFAULT_POLL_INTERVAL_SECONDS = 30
+DEFAULT_WORKER_COUNT = 2 # 이 프로세스에서 동시에 실행할 작업 수
+DEFAULT_MAX_CONCURRENT_JOBS = 4 # 모든 워커 프로세스를 합쳐 동시에 실행할 작업 수 (뉴스 수집/AI 호출량 제한)
+DEFAULT_GRACE_MINUTES = 60 # 놓친 실행을 보충하지 않는 작업은 예약 시각 후 이 시간 안에만 실행
+JOB_HEARTBEAT_SECONDS = 60 # 실행 중인 작업의 임대(database_manager.JOB_LEASE_MINUTES)를 연장하는 주기
+RUN_SLOT_FORMAT = '%Y-%m-%d %H:%M' # 실행 회차/다음 실행 시각의 저장 형식 (UTC)
+
+
+def _format_slot(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime(RUN_SLOT_FORMAT)
+
+
+def _parse_slot(value: str) -> datetime:
+    return datetime.strptime(value, RUN_SLOT_FORMAT).replace(tzinfo=timezone.utc)
+
+
+def enqueue_due_jobs(now_utc: datetime | None = None, grace_minutes: int = DEFAULT_GRACE_MINUTES) -> int:
+    """
+    실행 시각이 지난 예약 작업을 작업 큐에 넣고 다음 실행 시각을 갱신합니다. 큐에 넣은 작업 수를 반환합니다.
+    워커가 꺼져 있어 여러 회차를 놓쳤다면 가장 최근 회차 하나만 넣습니다. (같은 보고서를 여러 번 보내지 않도록)
+    catch_up이 꺼진 작업은 그 회차가 grace_minutes 안일 때만 넣습니다.
+    """
+    now_utc = now_utc or datetime.now(timezone.utc)
+    enqueued = 0
+    for task in database_manager.get_scheduled_tasks(enabled_only=True):
+        try:
+            if task['next_run_at'] is None:
+                # 새 작업이거나 일정이 바뀐 작업: 지금 이후의 첫 회차부터 실행
+                next_run = cron_schedule.next_run_after(task['cron_expr'], now_utc, task['timezone'])
+                database_manager.update_scheduled_task_next_run(task['id'], None, _format_slot(next_run) if next_run else None)
+                continue
+            next_run = _parse_slot(task['next_run_at'])
+            if next_run > now_utc:
+                continue
+            latest_run = cron_schedule.latest_run_between(task['cron_expr'], next_run, now_utc, task['timezone'])
+            following_run = cron_schedule.next_run_after(task['cron_expr'], now_utc, task['timezone'])
+        except (TypeError, ValueError) as e:
+            logger.error(f"예약 작업 {task['id']}의 일정을 계산할 수 없습니다 ({task['cron_expr']}, {task['timezone']}): {e}")
+            continue
+
+        if latest_run and (task['catch_up'] or now_utc - latest_run < timedelta(minutes=grace_minutes)):
+            if latest_run > next_run:
+                logger.warning(f"예약 작업 {task['id']}: {task['next_run_at']}부터 놓친 실행이 있어 가장 최근 회차({_format_slot(latest_run)})만 실행합니다.")
+            if database_manager.enqueue_job(task['id'], _format_slot(latest_run), task['priority']):
+                enqueued += 1
+        elif latest_run:
+            logger.info(f"예약 작업 {task['id']}: 놓친 회차({_format_slot(latest_run)})는 보충하지 않는 설정이라 건너뜁니다.")
+        database_manager.update_scheduled_task_next_run(task['id'], task['next_run_at'], _format_slot(following_run) if following_run else None)
+    return enqueued
+
+
+def run_job(job: dict, api_key: str, email_config: dict | None):
+    """작업 큐에서 가져온 작업 하나를 실행하고 결과를 큐에 기록합니다."""
+    try:
+        task = database_manager.get_scheduled_task(job['task_id'])
+        profile = None
+        if task:
+            profile = {p['id']: p for p in database_manager.get_search_profiles()}.get(task['profile_id'])
+        if not profile:
+            database_manager.finish_job(job['id'], "failed", message="예약 작업 또는 해당 검색 프리셋을 찾을 수 없습니다.")
+            logger.error(f"작업 {job['id']}: 예약 작업 {job['task_id']} 또는 검색 프리셋을 찾을 수 없습니다.")
+            return
+
+        recipient_emails = [e.strip() for e in task['recipient_emails'].split(',') if e.strip()]
+        if not recipient_emails:
+            logger.warning(f"예약 작업 {task['id']}에 유효한 수신자 이메일이 없어 이메일 전송을 건너뜁니다.")
+        if not email_config:
+            logger.warning("이메일 설정이 없어 예약 작업의 이메일 전송을 건너뜁니다.")
+
+        def log_progress(stage, message, fraction=None, level="info"):
+            if fraction is None: # 진행률 갱신은 로그에 남기지 않음
+                logger.log(level.upper(), f"[작업 {job['id']}][{stage}] {message}")
+
+        logger.info(f"작업 {job['id']} 실행 시작: '{task['task_name'] or profile['profile_name']}' ({job['scheduled_for']} UTC, 우선순위 {job['priority']})")
+        outcome = analysis_pipeline.run_profile_report(
+            profile,
+            api_key,
+            recipient_emails=recipient_emails,
+            email_config=email_config,
+            progress_callback=log_progress
+        )
+        succeeded = outcome["report_sent"] and outcome["endorsement_sent"]
+        if outcome["report_sent"] or outcome["endorsement_sent"]:
+            run_date = _parse_slot(job['scheduled_for']).astimezone(cron_schedule.get_timezone(task['timezone'])).strftime('%Y-%m-%d')
+            database_manager.update_scheduled_task_last_run_date(task['id'], run_date)
+        if succeeded:
+            message = "예약된 보고서와 특약이 모두 성공적으로 전송되었습니다."
+        elif outcome["report_sent"]:
+            message = "예약된 보고서는 전송되었으나, 특약 전송에 문제가 있었습니다."
+        elif outcome["endorsement_sent"]:
+            message = "예약된 특약은 전송되었으나, 보고서 전송에 문제가 있었습니다."
+        else:
+            message = "예약된 보고서와 특약 전송이 모두 실패했습니다."
+        database_manager.finish_job(job['id'], "succeeded" if succeeded else "failed",
+                                    outcome["report_sent"], outcome["endorsement_sent"], message)
+        logger.info(f"작업 {job['id']} 실행 완료: {message}")
+    except Exception as e:
+        database_manager.finish_job(job['id'], "failed", message=f"예약된 작업 실행 중 오류 발생: {e}")
+        logger.exception(f"작업 {job['id']} 실행 중 오류 발생: {e}")
+    finally:
+        database_manager.close_connection() # 풀 스레드가 연 연결 정리
+
+
+def dispatch_jobs(executor: ThreadPoolExecutor, worker_id: str, api_key: str, email_config: dict | None,
+                  in_flight: set, local_limit: int, max_running: int, on_done=None) -> list:
+    """이 프로세스의 남은 실행 슬롯만큼 작업 큐에서 작업을 가져와 워커 풀에 제출하고 Future 목록을 반환합니다."""
+    futures = []
+    while len(in_flight) < local_limit:
+        job = database_manager.claim_next_job(worker_id, max_running)
+        if job is None:
+            break
+        in_flight.add(job['id'])
+        future = executor.submit(run_job, job, api_key, email_config)
+
+        def finished(_, job_id=job['id']):
+            in_flight.discard(job_id)
+            if on_done:
+                on_done()
+
+        future.add_done_callback(finished)
+        futures.append(future)
+    return futures
+
+
+def heartbeat_loop(worker_id: str, stopped: threading.Event, interval: int = JOB_HEARTBEAT_SECONDS):
+    """stopped가 설정될 때까지 interval초마다 이 워커가 실행 중인 작업의 임대를 연장합니다. (별도 스레드에서 실행)"""
+    try:
+        while not stopped.wait(interval):
+            database_manager.renew_job_leases(worker_id)
+    finally:
+        database_manager.close_connection()
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(description="예약된 뉴스 트렌드 보고서를 실행하는 스케줄러 워커")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKER_COUNT, help="이 프로세스에서 동시에 실행할 작업 수")
+    parser.add_argument("--max-concurrent", type=int, default=DEFAULT_MAX_CONCURRENT_JOBS, help="모든 워커 프로세스를 합쳐 동시에 실행할 작업 수")
+    parser.add_argument("--poll-interval", type=int, default=DEFAULT_POLL_INTERVAL_SECONDS, help="예약 작업 확인 주기 (초)")
+    parser.add_argument("--grace-minutes", type=int, default=DEFAULT_GRACE_MINUTES, help="놓친 실행을 보충하지 않는 작업의 실행 허용 시간 (분)")
+    parser.add_argument("--once", action="store_true", help="지금 실행할 작업을 큐에 넣고 큐가 빌 때까지 처리한 뒤 종료 (cron 등 외부 스케줄러에서 호출할 때)")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        logger.error("GEMINI_API_KEY가 설정되지 않아 스케줄러 워커를 시작할 수 없습니다.")
+        return 1
+    email_config = analysis_pipeline.load_email_config()
+    database_manager.init_db()
+
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    wake_event = threading.Event() # 확인 주기를 기다리는 중에 작업이 끝나거나 종료 신호가 오면 깨움
+    stopping = threading.Event()
+
+    def request_stop(*_):
+        stopping.set()
+        wake_event.set()
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, request_stop)
+
+    logger.info(f"스케줄러 워커 시작 ({worker_id}, 워커 {args.workers}개, 전체 동시 실행 {args.max_concurrent}개, 확인 주기 {args.poll_interval}초)")
+    in_flight = set()
+    heartbeat_stopped = threading.Event()
+    heartbeat = threading.Thread(target=heartbeat_loop, args=(worker_id, heartbeat_stopped), name="job-heartbeat", daemon=True)
+    heartbeat.start()
+    with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix="scheduled-job") as executor:
+        while not stopping.is_set():
+            wake_event.clear()
+            requeued, failed = database_manager.requeue_stale_jobs()
+            if requeued:
+                logger.warning(f"임대가 만료된 작업 {requeued}개를 다시 대기열에 넣었습니다.")
+            if failed:
+                logger.error(f"임대가 만료된 작업 {failed}개가 최대 시도 횟수에 도달하여 실패로 처리되었습니다.")
+            enqueued = enqueue_due_jobs(grace_minutes=args.grace_minutes)
+            if enqueued:
+                logger.info(f"예약 작업 {enqueued}개를 작업 큐에 추가했습니다.")
+            futures = dispatch_jobs(executor, worker_id, api_key, email_config, in_flight,
+                                    args.workers, args.max_concurrent, on_done=wake_event.set)
+            if args.once and not futures and not in_flight:
+                break
+            wake_event.wait(args.poll_interval)
+    heartbeat_stopped.set() # 실행 중이던 작업이 모두 끝난 뒤(executor 종료 후)에 하트비트를 멈춤
+    heartbeat.join()
+    logger.info("스케줄러 워커 종료")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,8 +1,7 @@
 # modules/trend_analysis_page.py
 
 import streamlit as st
-from datetime import datetime, timedelta
-import time
+from datetime import datetime
 import re
 import os
 import json
@@ -10,13 +9,10 @@ import pandas as pd
 from dotenv import load_dotenv
 from io import BytesIO
 import streamlit.components.v1 as components
-import altair as alt # Altair 임포트
 
 # --- 모듈 임포트 (경로 조정) ---
-from modules import ai_service
+from modules import analysis_pipeline
 from modules import database_manager
-from modules import news_crawler
-from modules import trend_analyzer
 from modules import data_exporter
 from modules import email_sender
 # from modules import report_automation_page # 이 페이지에서는 직접 임포트하지 않습니다. main_app에서 라우팅합니다.
@@ -77,7 +73,7 @@ def trend_analysis_page():
 
         # 데이터베이스 초기화
         database_manager.init_db()
-        all_db_articles = database_manager.get_all_articles()
+        total_db_article_count = database_manager.count_articles()
 
 
         # --- Streamlit Session State 초기화 ---
@@ -101,6 +97,8 @@ def trend_analysis_page():
             st.session_state['prettified_report_for_download'] = ""
         if 'formatted_trend_summary' not in st.session_state:
             st.session_state['formatted_trend_summary'] = ""
+        if 'all_articles_export' not in st.session_state: # 요청 시에만 생성하는 전체 기사 내보내기 데이터
+            st.session_state['all_articles_export'] = None
         if 'formatted_insurance_info' not in st.session_state:
             st.session_state['formatted_insurance_info'] = ""
         if 'email_status_message' not in st.session_state:
@@ -142,6 +140,13 @@ def trend_analysis_page():
         }
         pages_options_reverse = {v: k for k, v in pages_options.items()}
 
+        # --- 트렌드 점수 방식 옵션 (trend_analyzer.SCORING_METHODS) ---
+        scoring_options = {
+            "로그 우도비 (기사 수로 정규화)": "loglik",
+            "z-점수 (기사 수로 정규화)": "zscore",
+            "빈도 증가율 (이전 방식)": "ratio"
+        }
+        scoring_options_reverse = {v: k for k, v in scoring_options.items()}
 
         with col_search_input:
             st.header("🔍 검색 조건 설정")
@@ -236,6 +241,17 @@ def trend_analysis_page():
                 )
                 max_naver_search_pages_per_day = pages_options[selected_max_pages_display] # 선택된 문자열을 정수로 변환
 
+                selected_scoring_display = st.selectbox(
+                    "트렌드 키워드를 어떤 기준으로 고를까요?",
+                    options=list(scoring_options.keys()),
+                    index=list(scoring_options.keys()).index(st.session_state.get(
+                        'scoring_input_display', scoring_options_reverse.get(analysis_pipeline.DEFAULT_TREND_SCORING, "로그 우도비 (기사 수로 정규화)"))),
+                    key="scoring_input_display",
+                    help="정규화 방식은 날짜별 기사 수 차이를 보정하여 최근 기간에 기사 수 대비 언급이 늘어난 키워드를 점수순으로 고릅니다. "
+                         "빈도 증가율은 최근/이전 기간의 단순 언급량 비율을 사용합니다."
+                )
+                trend_scoring = scoring_options[selected_scoring_display]
+
 
                 col_submit, col_save_preset = st.columns([0.7, 0.3]) # 프리셋으로 용어 변경
                 with col_submit:
@@ -285,8 +301,7 @@ def trend_analysis_page():
                 st.session_state['email_status_type'] = ""
 
                 table_placeholder.empty()
-                my_bar = status_message_placeholder.progress(0, text="데이터 수집 및 분석 진행 중...")
-                status_message_placeholder.info("네이버 뉴스 메타데이터 수집 중...")
+                progress_placeholder = st.empty()
 
                 # 유효성 검사: recent_trend_days가 total_search_days보다 작아야 함
                 if recent_trend_days >= total_search_days:
@@ -294,283 +309,33 @@ def trend_analysis_page():
                     st.session_state['analysis_completed'] = False # 분석 실패 상태
                     st.stop() # 더 이상 진행하지 않음
 
-
-                all_collected_news_metadata = []
-
-                today_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-                search_start_date = today_date - timedelta(days=total_search_days - 1)
-
-                total_expected_articles = total_search_days * max_naver_search_pages_per_day * 10
-                processed_article_count = 0
-
-
-                for i in range(total_search_days):
-                    current_search_date = search_start_date + timedelta(days=i)
-                    formatted_search_date = current_search_date.strftime('%Y-%m-%d')
-
-                    daily_articles = news_crawler.crawl_naver_news_metadata(
-                        keyword,
-                        current_search_date,
-                        max_naver_search_pages_per_day
-                    )
-
-                    for article in daily_articles:
-                        processed_article_count += 1
-                        progress_percentage = processed_article_count / total_expected_articles
-                        my_bar.progress(min(progress_percentage, 1.0), text=f"뉴스 메타데이터 수집 중... ({formatted_search_date}, {processed_article_count}개 기사 처리 완료)")
-
-
-                        article_data_for_db = {
-                            "제목": article["제목"],
-                            "링크": article["링크"],
-                            "날짜": article["날짜"].strftime('%Y-%m-%d'),
-                            "내용": article["내용"]
-                        }
-                        database_manager.insert_article(article_data_for_db)
-
-                        all_collected_news_metadata.append(article)
-
-                my_bar.empty()
-                status_message_placeholder.success(f"총 {len(all_collected_news_metadata)}개의 뉴스 메타데이터를 수집했습니다.")
-
-                # --- 2. 키워드 트렌드 분석 실행 ---
-                status_message_placeholder.info("키워드 트렌드 분석 중...")
-                with st.spinner("키워드 트렌드 분석 중..."):
-                    trending_keywords_data = trend_analyzer.analyze_keyword_trends(
-                        all_collected_news_metadata,
-                        recent_days_period=recent_trend_days,
-                        total_days_period=total_search_days
-                    )
-                st.session_state['trending_keywords_data'] = trending_keywords_data
-
-                if trending_keywords_data:
-                    # --- AI가 보험 개발자 관점에서 유의미한 키워드 선별 ---
-                    relevant_keywords_from_ai_raw = []
-                    with st.spinner("AI가 보험 개발자 관점에서 유의미한 키워드를 선별 중..."):
-                        relevant_keywords_from_ai_raw = ai_service.get_relevant_keywords(
-                            trending_keywords_data,
-                            "차량보험사의 보험개발자",
-                            GEMINI_API_KEY
-                        )
-
-                    filtered_trending_keywords = []
-                    if relevant_keywords_from_ai_raw:
-                        filtered_trending_keywords = [
-                            kw_data for kw_data in trending_keywords_data
-                            if kw_data['keyword'] in relevant_keywords_from_ai_raw
-                        ]
-                        filtered_trending_keywords = sorted(filtered_trending_keywords, key=lambda x: x['recent_freq'], reverse=True)
-
-                        status_message_placeholder.info(f"AI가 선별한 보험 개발자 관점의 유의미한 키워드 ({len(filtered_trending_keywords)}개): {[kw['keyword'] for kw in filtered_trending_keywords]}")
-                    else:
-                        status_message_placeholder.warning("AI가 보험 개발자 관점에서 유의미한 키워드를 선별하지 못했습니다. 모든 트렌드 키워드를 표시합니다.")
-                        filtered_trending_keywords = trending_keywords_data
-
-                    top_3_relevant_keywords = filtered_trending_keywords[:3]
-                    st.session_state['displayed_keywords'] = top_3_relevant_keywords
-
-                    if top_3_relevant_keywords:
-                        pass
+                def show_progress(stage, message, fraction=None, level="info"):
+                    if fraction is not None:
+                        progress_placeholder.progress(min(fraction, 1.0), text=message)
                     else:
-                        status_message_placeholder.info("보험 개발자 관점에서 유의미한 트렌드 키워드가 식별되지 않습니다.")
-
-
-                    # --- 3. 트렌드 기사 본문 요약 (Gemini AI 활용) ---
-                    status_message_placeholder.info("트렌드 기사 본문 요약 중 (Gemini AI 호출)...")
-
-                    recent_trending_articles_candidates = [
-                        article for article in all_collected_news_metadata
-                        if article.get("날짜") and today_date - timedelta(days=recent_trend_days) <= article["날짜"]
-                    ]
-
-                    processed_links = set()
-
-                    articles_for_ai_summary = []
-                    for article in recent_trending_articles_candidates:
-                        text_for_trend_check = article["제목"] + " " + article.get("내용", "")
-                        article_keywords_for_trend = trend_analyzer.extract_keywords_from_text(text_for_trend_check)
-
-                        if any(trend_kw['keyword'] in article_keywords_for_trend for trend_kw in top_3_relevant_keywords):
-                            articles_for_ai_summary.append(article)
-
-                    total_ai_articles_to_process = len(articles_for_ai_summary)
-
-                    if total_ai_articles_to_process == 0:
-                        status_message_placeholder.info("선별된 트렌드 키워드를 포함하는 최근 기사가 없거나, AI 요약 대상 기사가 없습니다.")
-                    else:
-                        ai_progress_bar = st.progress(0, text=f"AI가 트렌드 기사를 요약 중... (0/{total_ai_articles_to_process} 완료)")
-                        ai_processed_count = 0
-
-                        temp_collected_articles = []
-                        for article in articles_for_ai_summary:
-                            if article["링크"] in processed_links:
-                                continue
-
-                            article_date_str = article["날짜"].strftime('%Y-%m-%d')
-
-                            ai_processed_content = ai_service.get_article_summary(
-                                article["제목"],
-                                article["링크"],
-                                article_date_str,
-                                article["내용"],
-                                GEMINI_API_KEY,
-                                max_attempts=2
-                            )
-
-                            final_content = ""
-                            if ai_processed_content.startswith("Gemini AI 호출 최종 실패") or \
-                               ai_processed_content.startswith("Gemini AI 호출에서 유효한 응답을 받지 못했습니다."):
-                                final_content = f"본문 요약 실패 (AI 오류): {ai_processed_content}"
-                                status_message_placeholder.error(f"AI 요약 실패: {final_content}")
-                            else:
-                                final_content = ai_service.clean_ai_response_text(ai_processed_content)
-
-                            temp_collected_articles.append({
-                                "제목": article["제목"],
-                                "링크": article["링크"],
-                                "날짜": article_date_str,
-                                "내용": final_content
-                            })
-                            processed_links.add(article["링크"])
-                            ai_processed_count += 1
-                            ai_progress_bar.progress(ai_processed_count / total_ai_articles_to_process, text=f"AI가 트렌드 기사를 요약 중... ({ai_processed_count}/{total_ai_articles_to_process} 완료)")
-                            time.sleep(0.1)
-
-                        ai_progress_bar.empty()
-                        st.session_state['final_collected_articles'] = temp_collected_articles
-
-                        if st.session_state['final_collected_articles']:
-                            status_message_placeholder.success(
-                                f"총 {len(st.session_state['final_collected_articles'])}개의 트렌드 기사 요약을 완료했습니다. "
-                                "AI 트렌드 요약 및 보험 상품 개발 인사이트 보고서는 아래 '데이터 다운로드' 섹션에서 다운로드할 수 있습니다."
-                            )
-
-                            # --- 4. AI가 트렌드 요약 및 보험 상품 개발 인사이트 도출 (분리된 호출) ---
-                            status_message_placeholder.info("AI가 트렌드 요약 및 보험 상품 개발 인사이트를 도출 중 (분리된 호출)...")
-
-                            articles_for_ai_insight_generation = st.session_state['final_collected_articles']
-
-                            with st.spinner("AI가 뉴스 트렌드를 요약 중..."):
-                                trend_summary = ai_service.get_overall_trend_summary(
-                                    articles_for_ai_insight_generation,
-                                    GEMINI_API_KEY
-                                )
-                                st.session_state['ai_trend_summary'] = ai_service.clean_ai_response_text(trend_summary)
-                                if st.session_state['ai_trend_summary'].startswith("요약된 기사가 없어") or \
-                                   st.session_state['ai_trend_summary'].startswith("Gemini AI 호출 최종 실패") or \
-                                   st.session_state['ai_trend_summary'].startswith("Gemini AI 호출에서 유효한 응답을 받지 못했습니다."):
-                                    status_message_placeholder.error(f"AI 트렌드 요약 실패: {st.session_state['ai_trend_summary']}")
-                                else:
-                                    st.session_state['ai_trend_summary_ok'] = True # 성공 플래그
-                                    status_message_placeholder.success("AI 뉴스 트렌드 요약 완료!")
-                                time.sleep(1)
-
-                            with st.spinner("AI가 자동차 보험 산업 관련 정보를 분석 중..."):
-                                insurance_info = ai_service.get_insurance_implications_from_ai(
-                                    st.session_state['ai_trend_summary'],
-                                    GEMINI_API_KEY
-                                )
-                                st.session_state['ai_insurance_info'] = ai_service.clean_ai_response_text(insurance_info)
-                                if st.session_state['ai_insurance_info'].startswith("요약된 기사가 없어") or \
-                                   st.session_state['ai_insurance_info'].startswith("Gemini AI 호출 최종 실패") or \
-                                   st.session_state['ai_insurance_info'].startswith("Gemini AI 호출에서 유효한 응답을 받지 못했습니다.") or \
-                                   st.session_state['ai_insurance_info'].startswith("트렌드 요약문이 없어"):
-                                    status_message_placeholder.error(f"AI 자동차 보험 산업 관련 정보 분석 실패: {st.session_state['ai_insurance_info']}")
-                                else:
-                                    st.session_state['ai_insurance_info_ok'] = True # 성공 플래그
-                                    status_message_placeholder.success("AI 자동차 보험 산업 관련 정보 분석 완료!")
-                                time.sleep(1)
-
-                            # --- 5. AI가 각 섹션별로 포맷팅 (부하 분산) ---
-                            with st.spinner("AI가 뉴스 트렌드 요약 보고서를 포맷팅 중..."):
-                                formatted_trend_summary = ai_service.format_text_with_markdown(
-                                    st.session_state['ai_trend_summary'],
-                                    GEMINI_API_KEY
-                                )
-                                st.session_state['formatted_trend_summary'] = formatted_trend_summary
-                                if formatted_trend_summary.startswith("AI를 통한 보고서 포맷팅 실패"):
-                                    status_message_placeholder.warning("AI 뉴스 트렌드 요약 포맷팅에 실패했습니다. 원본 텍스트가 사용됩니다.")
-                                    st.session_state['formatted_trend_summary'] = st.session_state['ai_trend_summary']
-                                else:
-                                    status_message_placeholder.success("AI 뉴스 트렌드 요약 보고서 포맷팅 완료!")
-                                time.sleep(1)
-
-                            with st.spinner("AI가 자동차 보험 산업 관련 정보 보고서를 포맷팅 중..."):
-                                formatted_insurance_info = ai_service.format_text_with_markdown(
-                                    st.session_state['ai_insurance_info'],
-                                    GEMINI_API_KEY
-                                )
-                                st.session_state['formatted_insurance_info'] = formatted_insurance_info
-                                if formatted_insurance_info.startswith("AI를 통한 보고서 포맷팅 실패"):
-                                    status_message_placeholder.warning("AI 자동차 보험 산업 관련 정보 포맷팅에 실패했습니다. 원본 텍스트가 사용됩니다.")
-                                    st.session_state['formatted_insurance_info'] = st.session_state['ai_insurance_info']
-                                else:
-                                    st.session_state['formatted_insurance_info_ok'] = True # 성공 플래그
-                                    status_message_placeholder.success("AI 자동차 보험 산업 관련 정보 분석 완료!")
-                                time.sleep(1)
-
-                            # --- 6. 최종 보고서 결합 (AI 포맷팅 + 직접 구성 부록) ---
-                            final_prettified_report = ""
-                            final_prettified_report += "# 뉴스 트렌드 분석 및 보험 상품 개발 인사이트\n\n"
-                            final_prettified_report += "## 개요\n\n"
-                            final_prettified_report += "이 보고서는 최근 뉴스 트렌드를 분석하고, 이를 바탕으로 자동차 보험 상품 개발에 필요한 주요 인사이트를 제공합니다.\n\n"
-
-                            if st.session_state['formatted_trend_summary']:
-                                final_prettified_report += "## 뉴스 트렌드 요약\n"
-                                final_prettified_report += st.session_state['formatted_trend_summary'] + "\n\n"
-                            else:
-                                final_prettified_report += "## 뉴스 트렌드 요약 (생성 실패)\n"
-                                final_prettified_report += st.session_state['ai_trend_summary'] + "\n\n"
-
-                            if st.session_state['formatted_insurance_info']:
-                                final_prettified_report += "## 자동차 보험 산업 관련 주요 사실 및 법적 책임\n"
-                                final_prettified_report += st.session_state['formatted_insurance_info'] + "\n\n"
-                            else:
-                                final_prettified_report += "## 자동차 보험 산업 관련 주요 사실 및 법적 책임 (생성 실패)\
-                                \n"
-                                final_prettified_report += st.session_state['ai_insurance_info'] + "\n\n"
-
-                            # --- 부록 섹션 추가 (AI 포맷팅 없이 직접 구성) ---
-                            final_prettified_report += "---\n\n"
-                            final_prettified_report += "## 부록\n\n"
-
-                            final_prettified_report += "### 키워드 산출 근거\n"
-                            if st.session_state['displayed_keywords']:
-                                for kw_data in st.session_state['displayed_keywords']:
-                                    surge_ratio_display = (f'''{kw_data.get('surge_ratio'):.2f}x''' if kw_data.get('surge_ratio') != float('inf') else '새로운 트렌드')
-                                    final_prettified_report += (
-                                        f"- **키워드**: {kw_data['keyword']}\n"
-                                        f"  - 최근 언급량: {kw_data['recent_freq']}회\n"
-                                        f"  - 이전 언급량: {kw_data['past_freq']}회\n"
-                                        f"  - 증가율: {surge_ratio_display}\n\n"
-                                    )
-                            else:
-                                final_prettified_report += "키워드 산출 근거 데이터가 없습니다.\n\n"
-
-                            final_prettified_report += "### 반영된 기사 리스트\n"
-                            if temp_collected_articles:
-                                for i, article in enumerate(temp_collected_articles):
-                                    final_prettified_report += (
-                                        f"{i+1}. **제목**: {article['제목']}\n"
-                                        f"   **날짜**: {article['날짜']}\n"
-                                        f"   **링크**: {article['링크']}\n"
-                                        f"   **요약 내용**: {article['내용'][:150]}...\n\n"
-                                    )
-                            else:
-                                final_prettified_report += "반영된 기사 리스트가 없습니다.\n\n"
-
-                            st.session_state['prettified_report_for_download'] = final_prettified_report
-
-
-                        else:
-                            status_message_placeholder.info("선별된 트렌드 키워드를 포함하는 기사가 없거나, AI 요약에 실패했습니다.")
-
-                else:
-                    status_message_placeholder.info("선택된 기간 내에 유의미한 트렌드 키워드가 없습니다.")
+                        progress_placeholder.empty()
+                        getattr(status_message_placeholder, level)(message)
+
+                # 단계별 결과는 DB에 체크포인트로 저장되므로, 새로고침 등으로 중단된 같은 조건의 분석은 완료된 단계부터 이어서 진행
+                run_params = analysis_pipeline.build_run_params(keyword, total_search_days, recent_trend_days, max_naver_search_pages_per_day,
+                                                                scoring=trend_scoring)
+                analysis_result = analysis_pipeline.run_trend_analysis(run_params, GEMINI_API_KEY, progress_callback=show_progress)
+                progress_placeholder.empty()
+                if analysis_result['resumed_stages']:
+                    st.toast(f"이전 실행에서 완료된 {len(analysis_result['resumed_stages'])}개 단계를 재사용했습니다.", icon="♻️")
+
+                st.session_state['analysis_run_id'] = analysis_result['run_id']
+                st.session_state['trending_keywords_data'] = analysis_result['trending_keywords']
+                st.session_state['displayed_keywords'] = analysis_result['displayed_keywords']
+                st.session_state['final_collected_articles'] = analysis_result['summarized_articles']
+                st.session_state['ai_trend_summary'] = analysis_result['trend_summary']
+                st.session_state['ai_insurance_info'] = analysis_result['insurance_info']
+                st.session_state['formatted_trend_summary'] = analysis_result['formatted_trend_summary']
+                st.session_state['formatted_insurance_info'] = analysis_result['formatted_insurance_info']
+                st.session_state['prettified_report_for_download'] = analysis_result['report']
 
                 st.session_state['submitted_flag'] = False
                 st.session_state['analysis_completed'] = True
-                database_manager.clear_intermediate_summaries() # 중간 요약 DB 초기화
                 st.rerun()
 
             # --- 결과가 이미 세션 상태에 있는 경우 표시 ---
@@ -616,6 +381,7 @@ def trend_analysis_page():
                         'past_freq': '과거 전체 기간 언급량'
                     })
 
+                    import altair as alt # 차트를 그릴 때만 필요하므로 여기서 임포트
                     chart = alt.Chart(df_chart_melted).mark_bar(size=15).encode(
                         # X축: 키워드 (주요 그룹)
                         x=alt.X('keyword:N', title='키워드', axis=alt.Axis(
@@ -668,25 +434,11 @@ def trend_analysis_page():
         # --- 다운로드 섹션 레이아웃 변경 ---
         col_all_news_download, col_ai_summary_download = st.columns(2)
 
-        txt_data_all_crawled = ""
-        excel_data_all_crawled = None
         txt_data_ai_summaries = ""
         excel_data_ai_summaries = None
         txt_data_ai_insights = ""
         excel_data_ai_insights = None
 
-        # all_db_articles가 비어있을 수도 있으므로, DataFrame 생성 전에 확인
-        if all_db_articles:
-            df_all_articles = pd.DataFrame(all_db_articles, columns=['제목', '링크', '날짜', '내용', '수집_시간'])
-            df_all_articles['내용'] = df_all_articles['내용'].fillna('')
-
-            txt_data_all_crawled = data_exporter.export_articles_to_txt(
-                [dict(zip(df_all_articles.columns, row)) for row in df_all_articles.values],
-                file_prefix="all_crawled_news"
-            )
-
-            excel_data_all_crawled = data_exporter.export_articles_to_excel(df_all_articles, sheet_name='All_Crawled_News')
-
 
         df_ai_summaries = pd.DataFrame(st.session_state['final_collected_articles'],
                                        columns=['제목', '링크', '날짜', '내용'])
@@ -717,27 +469,44 @@ def trend_analysis_page():
 
         with col_all_news_download:
             st.markdown("### 📊 수집된 전체 뉴스 데이터")
-            # TXT 다운로드 버튼의 너비를 위해 컬럼 비율 조정 (0.2, 0.8)
-            col_all_data_txt, col_all_data_excel = st.columns([0.2, 0.8])
-            with col_all_data_txt:
-                st.download_button(
-                    label="📄 TXT 다운로드",
-                    data=txt_data_all_crawled,
-                    file_name=data_exporter.generate_filename("all_crawled_news", "txt"),
-                    mime="text/plain",
-                    help="데이터베이스에 저장된 모든 뉴스를 텍스트 파일로 다운로드합니다."
-                )
-            with col_all_data_excel:
-                if excel_data_all_crawled:
+            # 전체 기사 내보내기는 버튼을 누를 때만 DB에서 스트리밍으로 읽어 생성 (매 rerun마다 전체 테이블을 읽지 않음)
+            if st.button("📦 전체 뉴스 내보내기 파일 생성", help=f"데이터베이스에 저장된 {total_db_article_count}개의 뉴스로 다운로드 파일을 만듭니다."):
+                if total_db_article_count:
+                    with st.spinner("전체 뉴스 내보내기 파일을 생성 중..."):
+                        txt_data_all_crawled = data_exporter.export_articles_to_txt(
+                            dict(zip(database_manager.ARTICLE_COLUMNS, row)) for row in database_manager.iter_articles()
+                        )
+                        df_all_articles = pd.DataFrame.from_records(database_manager.iter_articles(), columns=database_manager.ARTICLE_COLUMNS)
+                        df_all_articles['내용'] = df_all_articles['내용'].fillna('')
+                        excel_data_all_crawled = data_exporter.export_articles_to_excel(df_all_articles, sheet_name='All_Crawled_News')
+                    st.session_state['all_articles_export'] = {
+                        "txt": txt_data_all_crawled,
+                        "excel": excel_data_all_crawled.getvalue()
+                    }
+                else:
+                    st.session_state['all_articles_export'] = None
+                    st.info("데이터베이스에 저장된 뉴스가 없습니다.")
+
+            all_articles_export = st.session_state['all_articles_export']
+            if all_articles_export:
+                # TXT 다운로드 버튼의 너비를 위해 컬럼 비율 조정 (0.2, 0.8)
+                col_all_data_txt, col_all_data_excel = st.columns([0.2, 0.8])
+                with col_all_data_txt:
+                    st.download_button(
+                        label="📄 TXT 다운로드",
+                        data=all_articles_export["txt"],
+                        file_name=data_exporter.generate_filename("all_crawled_news", "txt"),
+                        mime="text/plain",
+                        help="데이터베이스에 저장된 모든 뉴스를 텍스트 파일로 다운로드합니다."
+                    )
+                with col_all_data_excel:
                     st.download_button(
                         label="📊 엑셀 다운로드",
-                        data=excel_data_all_crawled.getvalue(),
+                        data=all_articles_export["excel"],
                         file_name=data_exporter.generate_filename("all_crawled_news", "xlsx"),
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                         help="데이터베이스에 저장된 모든 뉴스를 엑셀 파일(.xlsx)로 다운로드합니다. (한글 깨짐 없음)"
                     )
-                else:
-                    st.info("엑셀 다운로드 데이터가 없습니다.")
 
         with col_ai_summary_download:
             if not df_ai_summaries.empty:
@@ -861,7 +630,7 @@ def trend_analysis_page():
         st.markdown("---")
         col_db_info, col_db_clear = st.columns([2, 1])
         with col_db_info:
-            st.info(f"현재 데이터베이스에 총 {len(all_db_articles)}개의 기사가 저장되어 있습니다.")
+            st.info(f"현재 데이터베이스에 총 {total_db_article_count}개의 기사가 저장되어 있습니다.")
             if st.session_state['db_status_message']:
                 if st.session_state['db_status_type'] == "success":
                     st.success(st.session_state['db_status_message'])
@@ -872,7 +641,8 @@ def trend_analysis_page():
             st.markdown("💡 **CSV 파일이 엑셀에서 깨질 경우:** 엑셀에서 '데이터' 탭 -> '텍스트/CSV 가져오기'를 클릭한 후, '원본 파일' 인코딩을 'UTF-8'로 선택하여 가져오세요.")
         with col_db_clear:
             if st.button("데이터베이스 초기화", help="데이터베이스의 모든 저장된 뉴스를 삭제합니다.", type="secondary"):
-                database_manager.clear_db_content()
+                db_cleared, st.session_state['db_status_message'] = database_manager.clear_db_content()
+                st.session_state['db_status_type'] = "success" if db_cleared else "error"
                 st.session_state['trending_keywords_data'] = []
                 st.session_state['displayed_keywords'] = []
                 st.session_state['final_collected_articles'] = []
@@ -884,10 +654,10 @@ def trend_analysis_page():
                 st.session_state['prettified_report_for_download'] = ""
                 st.session_state['formatted_trend_summary'] = ""
                 st.session_state['formatted_insurance_info'] = ""
+                st.session_state['all_articles_export'] = None
                 st.session_state['email_status_message'] = ""
                 st.session_state['email_status_type'] = ""
                 st.session_state['search_profiles'] = database_manager.get_search_profiles() # 프로필 목록 새로고침
-                st.session_state['scheduled_task'] = database_manager.get_scheduled_task() # 예약 정보 새로고침
                 database_manager.save_generated_endorsement("") # 데이터베이스 특약도 초기화 (새로 추가)
                 database_manager.save_document_text("") # 문서 텍스트도 초기화
                 st.rerun()
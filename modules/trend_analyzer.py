@@ -1,96 +1,446 @@
 # modules/trend_analyzer.py
 
+import heapq
+import os
+import random
 import re
+import math
+import threading
+import time
 from collections import Counter
-from datetime import datetime, timedelta
-import streamlit as st # Streamlit의 st.warning 등을 사용하기 위해 임시로 import.
-                        # 실제 프로덕션에서는 이 로깅 부분을 다른 방식으로 처리하는 것이 좋습니다.
-from konlpy.tag import Okt # konlpy의 Okt 형태소 분석기 임포트
-
-# Okt 형태소 분석기 초기화 (한 번만 수행)
-# Streamlit 환경에서는 전역 변수로 선언하거나, 함수 내에서 한 번만 초기화되도록 캐싱하는 것이 좋습니다.
-# 여기서는 간단히 전역 변수로 선언하지만, 실제 앱에서는 st.cache_resource 등을 고려할 수 있습니다.
-try:
-    okt = Okt()
-    KONLPY_AVAILABLE = True
-except Exception as e:
-    st.error(f"🚨 Konlpy (Okt) 초기화 실패: {e}. 한국어 형태소 분석 없이 키워드를 추출합니다.")
-    st.info("💡 Konlpy를 사용하려면 Java Development Kit (JDK) 1.8 이상이 설치되어 있어야 합니다.")
-    KONLPY_AVAILABLE = False
-    okt = None # 초기화 실패 시 None으로 설정
+from datetime import date, datetime, timedelta
+from loguru import logger
+
+# Okt 형태소 분석기는 JVM을 띄우므로 모듈 임포트 시가 아니라 처음 토큰화할 때 한 번만 초기화합니다. (get_okt 참고)
+_okt = None
+_okt_initialized = False
+_okt_lock = threading.Lock()
+
+
+def get_okt():
+    """
+    konlpy Okt 형태소 분석기를 처음 호출될 때 한 번만 초기화하여 반환합니다.
+    konlpy가 없거나 JVM을 시작할 수 없으면 None을 반환하며, 이때는 정규식 토크나이저로 키워드를 추출합니다.
+    """
+    global _okt, _okt_initialized
+    if not _okt_initialized:
+        with _okt_lock:
+            if not _okt_initialized:
+                try:
+                    from konlpy.tag import Okt # JVM 시작 비용이 있어 필요할 때만 임포트
+                    _okt = Okt()
+                except Exception as e:
+                    logger.error(f"Konlpy (Okt) 초기화 실패: {e}. 한국어 형태소 분석 없이 키워드를 추출합니다.")
+                    logger.info("Konlpy를 사용하려면 Java Development Kit (JDK) 1.8 이상이 설치되어 있어야 합니다.")
+                    _okt = None
+                _okt_initialized = True
+    return _okt
+
+# 불용어 사전 파일 경로 (환경 변수로 교체 가능)
+STOPWORDS_FILE = os.getenv("TREND_STOPWORDS_FILE", os.path.join(os.path.dirname(os.path.abspath(__file__)), "stopwords_ko.txt"))
+
+
+def load_stopwords(path: str = STOPWORDS_FILE) -> frozenset[str]:
+    """
+    불용어 파일을 읽어 frozenset으로 반환합니다.
+    한 줄에 하나의 단어를 적으며, 빈 줄과 '#'으로 시작하는 줄은 무시합니다.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return frozenset(
+                line.strip().lower() for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            )
+    except OSError as e:
+        logger.warning(f"불용어 파일을 읽을 수 없습니다 ({path}): {e}. 불용어 제거 없이 진행합니다.")
+        return frozenset()
+
+
+# n-gram을 만들 때 구간을 나누는 문장 부호 (정규식 토크나이저용, Okt는 품사 정보로 구간을 나눔)
+_SEGMENT_BOUNDARY_PATTERN = re.compile(r'[.!?…·,;:|/"\'“”‘’()\[\]<>\n]+')
+
+
+class RegexTokenizer:
+    """한글/영문/숫자 이외의 문자를 제거한 뒤 공백 기준으로 분리하는 단순 토크나이저입니다."""
+    name = "regex"
+    _non_word_pattern = re.compile(r'[^가-힣a-zA-Z0-9\s]')
+
+    def tokenize(self, text: str) -> list[str]:
+        return self._non_word_pattern.sub('', text).lower().split()
+
+    def segments(self, text: str) -> list[list[str]]:
+        """문장 부호로 나눈 구간별 토큰 목록을 반환합니다. (n-gram은 한 구간 안에서만 만듦)"""
+        return [tokens for tokens in (self.tokenize(part) for part in _SEGMENT_BOUNDARY_PATTERN.split(text)) if tokens]
+
+
+class OktTokenizer:
+    """konlpy Okt 형태소 분석기로 명사만 추출하는 토크나이저입니다."""
+    name = "okt"
+
+    def __init__(self, okt_instance):
+        self.okt = okt_instance
+
+    def tokenize(self, text: str) -> list[str]:
+        return [word.lower() for word in self.okt.nouns(text)]
+
+    def segments(self, text: str) -> list[list[str]]:
+        """
+        바로 이어지는 명사끼리 묶은 구간 목록을 반환합니다. (예: "전기차 화재가 잇따라" -> [["전기", "차", "화재"]])
+        조사, 동사, 문장 부호 등 명사가 아닌 형태소가 나오면 구간이 끝나므로, 떨어져 있는 명사로 n-gram을 만들지 않습니다.
+        """
+        segments = []
+        current = []
+        for word, tag in self.okt.pos(text):
+            if tag == "Noun":
+                current.append(word.lower())
+            elif current:
+                segments.append(current)
+                current = []
+        if current:
+            segments.append(current)
+        return segments
+
+
+def _tokenizer_segments(tokenizer, text: str) -> list[list[str]]:
+    if hasattr(tokenizer, "segments"):
+        return tokenizer.segments(text)
+    tokens = tokenizer.tokenize(text)
+    return [tokens] if tokens else []
+
+
+class TokenizerPipeline:
+    """
+    토크나이저 + 불용어 제거 + 최소 길이 필터를 묶은 키워드 추출 파이프라인입니다.
+    tokenizer는 tokenize(text) -> list[str] 메서드를 가진 객체이면 무엇이든 사용할 수 있습니다.
+    segments(text) -> list[list[str]] 메서드가 있으면 n-gram을 그 구간 안에서만 만들고, 없으면 텍스트 전체를 한 구간으로 봅니다.
+    기본 토크나이저가 실패하면 fallback_tokenizer로 대체합니다.
+    """
+
+    def __init__(self, tokenizer, stopwords: frozenset[str] = frozenset(), fallback_tokenizer=None, min_length: int = 2):
+        self.tokenizer = tokenizer
+        self.stopwords = frozenset(stopwords)
+        self.fallback_tokenizer = fallback_tokenizer
+        self.min_length = min_length
+
+    def tokenize(self, text: str) -> list[str]:
+        try:
+            return self.tokenizer.tokenize(text)
+        except Exception as e:
+            if self.fallback_tokenizer is None:
+                raise
+            logger.warning(f"{self.tokenizer.name} 토큰화 중 오류 발생: {e}. {self.fallback_tokenizer.name} 토큰화로 대체합니다.")
+            return self.fallback_tokenizer.tokenize(text)
+
+    def extract_keywords(self, text: str) -> list[str]:
+        if not text:
+            return []
+        stopwords = self.stopwords
+        min_length = self.min_length
+        return [word for word in self.tokenize(text) if len(word) >= min_length and word not in stopwords]
+
+    def segments(self, text: str) -> list[list[str]]:
+        """n-gram을 만들 구간별 토큰 목록(불용어/길이 필터 전)을 반환합니다."""
+        if not text:
+            return []
+        try:
+            return _tokenizer_segments(self.tokenizer, text)
+        except Exception as e:
+            if self.fallback_tokenizer is None:
+                raise
+            logger.warning(f"{self.tokenizer.name} 토큰화 중 오류 발생: {e}. {self.fallback_tokenizer.name} 토큰화로 대체합니다.")
+            return _tokenizer_segments(self.fallback_tokenizer, text)
+
+    def filter_ngrams(self, ngrams: list[str]) -> list[str]:
+        """
+        완성된 n-gram 중 키워드로 쓸 것만 남깁니다.
+        단일 명사는 min_length 이상이고 불용어가 아니어야 하며, 여러 명사 조합은 불용어를 포함하지 않고
+        공백을 뺀 길이가 min_length 이상이어야 합니다. (한 글자 명사도 조합 안에서는 유지: "전기 차 화재")
+        """
+        stopwords = self.stopwords
+        min_length = self.min_length
+        kept = []
+        for gram in ngrams:
+            words = gram.split(" ")
+            if len(words) == 1:
+                if len(gram) >= min_length and gram not in stopwords:
+                    kept.append(gram)
+            elif not any(word in stopwords for word in words) and len(gram) - len(words) + 1 >= min_length:
+                kept.append(gram)
+        return kept
+
+
+_default_pipeline = None
+
+
+def get_default_pipeline() -> TokenizerPipeline:
+    """Okt 사용 가능 여부에 따라 기본 키워드 추출 파이프라인을 한 번만 생성하여 반환합니다."""
+    global _default_pipeline
+    if _default_pipeline is None:
+        stopwords = load_stopwords()
+        okt = get_okt()
+        if okt:
+            _default_pipeline = TokenizerPipeline(OktTokenizer(okt), stopwords, fallback_tokenizer=RegexTokenizer())
+        else:
+            _default_pipeline = TokenizerPipeline(RegexTokenizer(), stopwords)
+    return _default_pipeline
+
 
 def extract_keywords_from_text(text: str) -> list[str]:
     """
     텍스트에서 키워드를 추출합니다.
     konlpy Okt 형태소 분석기를 사용하여 명사를 추출하고, 불용어 제거를 수행합니다.
+    (Okt를 사용할 수 없거나 오류가 나면 정규식 기반 토큰화로 대체합니다.)
     """
-    if not text:
-        return []
+    return get_default_pipeline().extract_keywords(text)
 
-    keywords = []
-    if KONLPY_AVAILABLE and okt:
-        try:
-            # Okt를 사용하여 명사만 추출
-            nouns = okt.nouns(text)
-            
-            # 일반적인 불용어 목록 (확장 가능)
-            # 형태소 분석 후의 명사 형태를 고려하여 불용어 목록 조정
-            stopwords = [
-                "은", "는", "이", "가", "을", "를", "와", "과", "도", "만", "고", "에", "의", "한", "그", "저", "것", "수", "등", "및",
-                "대한", "통해", "이번", "지난", "다", "있다", "없다", "한다", "된다", "밝혔다", "말했다", "했다", "위해", "으로", "에서",
-                "으로", "로부터", "까지", "부터", "으로", "하여", "에게", "처럼", "만큼", "듯이", "보다", "아니라", "아니면", "그리고",
-                "그러나", "하지만", "따라서", "때문에", "대해", "관련", "최근", "이날", "오전", "오후", "기자", "뉴스", "연합뉴스",
-                "조선비즈", "한겨레", "ytn", "mbn", "뉴시스", "매일경제", "한국경제", # 언론사명 소문자 처리
-                "년", "월", "일", "때", "곳", "점", "분", "명", "개", "위", "말", "뒤", "전", "중", "측", "내", "밖", "고", "데", "바"
-            ]
-
-            # 두 글자 이상인 명사만 포함하고 불용어 제거
-            # 명사 추출 후 소문자 변환하여 불용어와 비교
-            keywords = [
-                word.lower() for word in nouns
-                if len(word) > 1 and word.lower() not in stopwords
-            ]
-        except Exception as e:
-            st.warning(f"⚠️ Konlpy 명사 추출 중 오류 발생: {e}. 일반 토큰화로 대체합니다.")
-            # 오류 발생 시 기존의 간단한 토큰화 방식으로 대체
-            text = re.sub(r'[^가-힣a-zA-Z0-9\s]', '', text)
-            tokens = text.lower().split()
-            stopwords = [
-                "은", "는", "이", "가", "을", "를", "와", "과", "도", "만", "고", "에", "의", "한", "그", "저", "것", "수", "등", "및",
-                "대한", "통해", "이번", "지난", "다", "있다", "없다", "한다", "된다", "밝혔다", "말했다", "했다", "위해", "으로", "에서",
-                "으로", "로부터", "까지", "부터", "으로", "하여", "에게", "처럼", "만큼", "듯이", "보다", "아니라", "아니면", "그리고",
-                "그러나", "하지만", "따라서", "때문에", "대해", "관련", "지난", "최근", "이번", "이날", "오전", "오후", "오후", "오전",
-                "기자", "뉴스", "연합뉴스", "조선비즈", "한겨레", "ytn", "mbn", "뉴시스", "매일경제", "한국경제"
-            ]
-            keywords = [word for word in tokens if len(word) > 1 and word not in stopwords]
+
+def benchmark_tokenizer_throughput(articles: list[dict] | None = None, pipeline: TokenizerPipeline | None = None, repeat: int = 3) -> dict:
+    """
+    키워드 추출 파이프라인의 처리량(기사/초)을 측정합니다.
+    articles가 없으면 예시 기사 1,000건을 생성하여 사용합니다.
+    반환 값: {tokenizer: str, articles: int, seconds: float, articles_per_sec: float} (repeat회 중 최고 기록)
+    """
+    if articles is None:
+        sample_titles = ["자율 주행 차량 보험 사고 책임 논란", "전기차 화재 잇따라… 배터리 안전 기준 강화", "고령 운전자 면허 반납 지원 확대"]
+        sample_snippet = "최근 관련 사고가 늘면서 보험업계는 새로운 특약 상품 개발을 검토하고 있다고 연합뉴스 기자가 밝혔다."
+        articles = [{"제목": sample_titles[i % len(sample_titles)], "내용": sample_snippet} for i in range(1000)]
+    pipeline = pipeline or get_default_pipeline()
+    texts = [article["제목"] + " " + article.get("내용", "") for article in articles]
+
+    best_seconds = float('inf')
+    for _ in range(max(repeat, 1)):
+        start = time.perf_counter()
+        for text in texts:
+            pipeline.extract_keywords(text)
+        best_seconds = min(best_seconds, time.perf_counter() - start)
+
+    return {
+        "tokenizer": pipeline.tokenizer.name,
+        "articles": len(texts),
+        "seconds": best_seconds,
+        "articles_per_sec": len(texts) / best_seconds if best_seconds > 0 else float('inf')
+    }
+
+# 페이지에서 사용하는 기본 n-gram 범위 (단일 명사 ~ 3개 명사 조합)
+DEFAULT_NGRAM_RANGE = (1, 3)
+# analyze_keyword_trends의 scoring 값 ("ratio": 원시 빈도 비율, "loglik"/"zscore": 기사 수로 정규화한 버스트 점수)
+SCORING_METHODS = ("ratio", "loglik", "zscore")
+
+
+def extract_ngrams(tokens: list[str], ngram_range: tuple[int, int] = (1, 1)) -> list[str]:
+    """
+    한 구간의 연속된 토큰 목록에서 n-gram을 생성합니다. (예: ["자율", "주행"] -> "자율 주행")
+    ngram_range: (최소 n, 최대 n). (1, 1)이면 단일 토큰만 반환합니다. 불용어/길이 필터는 TokenizerPipeline.filter_ngrams에서 적용합니다.
+    """
+    min_n, max_n = ngram_range
+    ngrams = []
+    for n in range(max(min_n, 1), max_n + 1):
+        if n == 1:
+            ngrams.extend(tokens)
+        else:
+            ngrams.extend(" ".join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return ngrams
+
+
+def _segment_ngrams(segments: list[list[str]], ngram_range: tuple[int, int], pipeline: TokenizerPipeline) -> list[str]:
+    return pipeline.filter_ngrams([gram for tokens in segments for gram in extract_ngrams(tokens, ngram_range)])
+
+
+def extract_ngrams_from_text(text: str, ngram_range: tuple[int, int] = (1, 1)) -> list[str]:
+    """텍스트를 구간별로 토큰화하여 각 구간 안에서 n-gram을 만들고, 키워드로 쓸 n-gram만 반환합니다."""
+    pipeline = get_default_pipeline()
+    return _segment_ngrams(pipeline.segments(text), ngram_range, pipeline)
+
+
+def _article_segments(article: dict) -> list[list[str]]:
+    # 제목과 미리보기 스니펫은 따로 토큰화 (제목 끝 명사와 스니펫 첫 명사로 n-gram을 만들지 않도록)
+    pipeline = get_default_pipeline()
+    return pipeline.segments(article["제목"]) + pipeline.segments(article.get("내용", ""))
+
+
+def article_ngrams(article: dict, ngram_range: tuple[int, int], token_cache: dict | None = None) -> list[str]:
+    """
+    기사(제목 + 미리보기 스니펫)의 n-gram 키워드를 반환합니다.
+    token_cache(링크 -> 구간별 토큰 목록)가 주어지면 같은 기사는 한 번만 토큰화합니다.
+    """
+    if token_cache is None:
+        segments = _article_segments(article)
     else:
-        # konlpy를 사용할 수 없는 경우 기존의 간단한 토큰화 방식 사용
-        text = re.sub(r'[^가-힣a-zA-Z0-9\s]', '', text)
-        tokens = text.lower().split()
-        stopwords = [
-            "은", "는", "이", "가", "을", "를", "와", "과", "도", "만", "고", "에", "의", "한", "그", "저", "것", "수", "등", "및",
-            "대한", "통해", "이번", "지난", "다", "있다", "없다", "한다", "된다", "밝혔다", "말했다", "했다", "위해", "으로", "에서",
-            "으로", "로부터", "까지", "부터", "으로", "하여", "에게", "처럼", "만큼", "듯이", "보다", "아니라", "아니면", "그리고",
-            "그러나", "하지만", "따라서", "때문에", "대해", "관련", "지난", "최근", "이번", "이날", "오전", "오후", "오후", "오전",
-            "기자", "뉴스", "연합뉴스", "조선비즈", "한겨레", "ytn", "mbn", "뉴시스", "매일경제", "한국경제"
-        ]
-        keywords = [word for word in tokens if len(word) > 1 and word not in stopwords]
-
-    return keywords
-
-def analyze_keyword_trends(articles_metadata: list[dict], recent_days_period: int = 2, total_days_period: int = 15, min_surge_ratio: float = 1.5, min_recent_freq: int = 3) -> list[dict]:
+        cache_key = article.get("링크") or article["제목"] + " " + article.get("내용", "")
+        segments = token_cache.get(cache_key)
+        if segments is None:
+            segments = token_cache[cache_key] = _article_segments(article)
+    return _segment_ngrams(segments, ngram_range, get_default_pipeline())
+
+
+def _misra_gries_prune(counter: Counter, max_size: int):
+    """
+    Misra-Gries 요약: 항목 수가 max_size의 두 배를 넘으면 (max_size + 1)번째로 큰 빈도만큼 모든 빈도를 빼고 0 이하인 항목을 버립니다.
+    남은 항목 수는 max_size 이하이며, 전체 빈도 N 중 N / (max_size + 1)보다 많이 나온 항목은 반드시 남습니다.
+    (정리를 항목이 두 배가 될 때까지 미루므로 정리 비용은 추가한 항목 수에 대해 상각 O(log max_size))
+    """
+    if len(counter) <= 2 * max_size:
+        return
+    threshold = heapq.nlargest(max_size + 1, counter.values())[-1]
+    survivors = {item: count - threshold for item, count in counter.items() if count > threshold}
+    counter.clear()
+    counter.update(survivors)
+
+
+class StreamingTrendScorer:
+    """
+    일별 키워드 빈도와 기사 수를 add_day()로 받아 최근/과거 기간별로 누적하고 트렌드 점수를 계산합니다.
+    상태를 저장하지 않으므로 분석을 실행할 때마다 그 실행의 기사로 새로 만들어 계산합니다.
+
+    점수는 기간별 기사 수로 정규화하며, metric에 따라 다음을 사용합니다.
+    - "loglik": 기사 수 비율을 기대값으로 하는 로그 우도비(G²), 감소 추세는 음수
+    - "zscore": (최근 빈도 - 기대 빈도) / sqrt(기대 빈도)
+    surge_ratio는 기사 수로 정규화하고 smoothing을 더한 비율이므로 신규 키워드도 유한한 값을 가집니다.
+    """
+
+    def __init__(self, recent_days_period: int = 2, total_days_period: int = 15, metric: str = "loglik", smoothing: float = 0.5,
+                 reference_date: date | None = None):
+        if metric not in ("loglik", "zscore"):
+            raise ValueError(f"지원하지 않는 점수 방식입니다: {metric}")
+        self.recent_days_period = recent_days_period
+        self.total_days_period = total_days_period
+        self.metric = metric
+        self.smoothing = smoothing
+        self.today = _reference_day(reference_date) # 기간을 나누는 기준일 (분석 기간의 마지막 날)
+        self.window_counts = {"recent": Counter(), "past": Counter()}
+        self.window_articles = {"recent": 0, "past": 0}
+
+    def _window_of(self, day: date) -> str | None:
+        days_ago = (self.today - day).days
+        if days_ago < 0:
+            return None # 기준일 이후 날짜
+        if days_ago <= self.recent_days_period:
+            return "recent"
+        if days_ago <= self.total_days_period:
+            return "past"
+        return None # 분석 기간을 벗어난 날짜
+
+    def add_day(self, day: date, keyword_counts: Counter, article_count: int):
+        """하루치 키워드 빈도와 기사 수를 해당 기간 집계에 더합니다. 같은 날짜가 다시 들어오면 누적합니다."""
+        if isinstance(day, datetime):
+            day = day.date()
+        window = self._window_of(day)
+        if window is None:
+            return
+        self.window_counts[window].update(keyword_counts)
+        self.window_articles[window] += article_count
+
+    def _score(self, recent_freq: int, past_freq: int) -> float:
+        recent_articles = self.window_articles["recent"]
+        past_articles = self.window_articles["past"]
+        total_articles = recent_articles + past_articles
+        if total_articles == 0:
+            return 0.0
+        total_freq = recent_freq + past_freq
+        expected_recent = total_freq * recent_articles / total_articles
+        expected_past = total_freq * past_articles / total_articles
+        if self.metric == "zscore":
+            return (recent_freq - expected_recent) / math.sqrt(expected_recent) if expected_recent > 0 else 0.0
+
+        g2 = 0.0
+        for observed, expected in ((recent_freq, expected_recent), (past_freq, expected_past)):
+            if observed > 0 and expected > 0:
+                g2 += observed * math.log(observed / expected)
+        g2 *= 2
+        return g2 if recent_freq >= expected_recent else -g2
+
+    def score(self, min_surge_ratio: float = 1.5, min_recent_freq: int = 3) -> list[dict]:
+        """
+        현재 누적 상태로 트렌드 키워드를 계산합니다.
+        반환 값: [{keyword: str, recent_freq: int, past_freq: int, surge_ratio: float, score: float}] (score 내림차순)
+        """
+        recent_articles = self.window_articles["recent"]
+        past_articles = self.window_articles["past"]
+        past_counts = self.window_counts["past"]
+
+        trending_keywords_list = []
+        for keyword, recent_freq in self.window_counts["recent"].items():
+            if recent_freq < min_recent_freq:
+                continue
+            past_freq = past_counts.get(keyword, 0)
+            recent_rate = (recent_freq + self.smoothing) / (recent_articles + self.smoothing)
+            past_rate = (past_freq + self.smoothing) / (past_articles + self.smoothing)
+            surge_ratio = recent_rate / past_rate
+            if surge_ratio < min_surge_ratio:
+                continue
+            trend_score = self._score(recent_freq, past_freq)
+            if trend_score <= 0:
+                continue
+            trending_keywords_list.append({
+                "keyword": keyword,
+                "recent_freq": recent_freq,
+                "past_freq": past_freq,
+                "surge_ratio": surge_ratio,
+                "score": trend_score
+            })
+        return sorted(trending_keywords_list, key=lambda x: x['score'], reverse=True)
+
+
+def _reference_day(reference_date: date | None) -> date:
+    """기준일(datetime/date, 없으면 오늘)을 date로 변환합니다."""
+    if reference_date is None:
+        return datetime.now().date()
+    return reference_date.date() if isinstance(reference_date, datetime) else reference_date
+
+
+def build_daily_keyword_counts(articles_metadata: list[dict], ngram_range: tuple[int, int] = (1, 1), token_cache: dict | None = None,
+                               reference_date: date | None = None) -> dict[date, tuple[Counter, int]]:
+    """
+    기사 목록을 날짜별로 묶어 (키워드 빈도, 기사 수)를 집계합니다.
+    StreamingTrendScorer.add_day()에 그대로 전달할 수 있습니다.
+    token_cache: 링크 -> 구간별 토큰 목록 캐시 (여러 분석에서 같은 기사를 한 번만 토큰화)
+    reference_date: 날짜를 알 수 없는 기사를 넣을 날 (기본값 오늘)
+    """
+    today = _reference_day(reference_date)
+    daily = {}
+    for article in articles_metadata:
+        article_date = article.get("날짜")
+        if isinstance(article_date, datetime):
+            article_day = article_date.date()
+        else:
+            logger.warning(f"'{article['제목']}' 기사의 날짜 파싱 실패. 기준일 날짜로 간주하여 분석에 포함합니다.")
+            article_day = today
+        counts, article_count = daily.get(article_day, (Counter(), 0))
+        counts.update(article_ngrams(article, ngram_range, token_cache))
+        daily[article_day] = (counts, article_count + 1)
+    return daily
+
+
+def analyze_keyword_trends(articles_metadata: list[dict], recent_days_period: int = 2, total_days_period: int = 15, min_surge_ratio: float = 1.5, min_recent_freq: int = 3,
+                           ngram_range: tuple[int, int] = (1, 1), approximate: bool = False, max_candidates: int = 5000,
+                           scoring: str = "ratio", token_cache: dict | None = None, reference_date: date | None = None) -> list[dict]:
     """
     기사 메타데이터를 기반으로 키워드 트렌드를 분석합니다.
     recent_days_period: 트렌드를 감지할 최근 기간 (예: 2일)
     total_days_period: 비교할 전체 기간 (예: 15일)
     min_surge_ratio: 최근 기간 빈도 / 과거 기간 빈도 비율이 이 값 이상일 때 트렌드로 간주
     min_recent_freq: 최근 기간에 최소한 이 횟수 이상 언급되어야 트렌드로 간주
+    ngram_range: 집계할 n-gram 범위 (예: (1, 3)이면 "자율 주행", "전기 차 화재" 같은 복합 명사도 집계)
+    approximate: True이면 메모리 사용량이 max_candidates로 제한되는 근사 집계를 사용합니다. (기본값 False, 정확 집계)
+                 최근 기간 빈도 상위 후보를 Misra-Gries 요약으로 고른 뒤, 후보 키워드의 빈도만 다시 정확히 셉니다.
+                 최근 기간 n-gram 총 개수 N 중 N / (max_candidates + 1)번 넘게 나온 키워드는 결과가 정확 집계와 같습니다.
+    max_candidates: 근사 모드에서 유지할 최근 기간 후보 키워드 수의 상한
+    scoring: "ratio"(기존 원시 빈도 비율), "loglik" 또는 "zscore"(기사 수로 정규화한 버스트 점수, StreamingTrendScorer 사용).
+             "loglik"/"zscore"는 정확 집계를 사용하며 결과에 score 항목이 추가되고 score 순으로 정렬됩니다.
+    token_cache: 링크 -> 구간별 토큰 목록 캐시. 여러 프로필을 일괄 분석할 때 같은 기사를 한 번만 토큰화하기 위해 사용합니다.
+    reference_date: 최근/과거 기간을 나누는 기준일 (분석 기간의 마지막 날, 기본값 오늘). 지난 기간을 분석하거나 다른 날 이어서 실행할 때 지정합니다.
     반환 값: [{keyword: str, recent_freq: int, past_freq: int, surge_ratio: float}]
     """
     if not articles_metadata:
         return []
 
-    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    if scoring != "ratio":
+        scorer = StreamingTrendScorer(recent_days_period, total_days_period, metric=scoring, reference_date=reference_date)
+        for day, (counts, article_count) in build_daily_keyword_counts(articles_metadata, ngram_range, token_cache, reference_date).items():
+            scorer.add_day(day, counts, article_count)
+        return scorer.score(min_surge_ratio, min_recent_freq)
+
+    today = datetime.combine(_reference_day(reference_date), datetime.min.time())
 
     recent_articles = []
     past_articles = []
@@ -98,27 +448,47 @@ def analyze_keyword_trends(articles_metadata: list[dict], recent_days_period: in
     for article in articles_metadata:
         article_date = article.get("날짜")
         if not isinstance(article_date, datetime):
-            # 날짜 파싱 실패한 경우, 오늘 날짜로 간주하여 처리 (정확도 낮음)
-            st.warning(f"경고: '{article['제목']}' 기사의 날짜 파싱 실패. 오늘 날짜로 간주하여 분석에 포함합니다.")
+            # 날짜 파싱 실패한 경우, 기준일 날짜로 간주하여 처리 (정확도 낮음)
+            logger.warning(f"'{article['제목']}' 기사의 날짜 파싱 실패. 기준일 날짜로 간주하여 분석에 포함합니다.")
             article_date = today
 
+        if article_date >= today + timedelta(days=1):
+            continue # 기준일 이후 기사는 분석 기간 밖
         if today - timedelta(days=recent_days_period) <= article_date:
             recent_articles.append(article)
         elif today - timedelta(days=total_days_period) <= article_date < today - timedelta(days=recent_days_period):
             past_articles.append(article)
 
     # 각 기간의 키워드 빈도 계산
-    recent_keywords = Counter()
-    for article in recent_articles:
-        # 트렌드 분석 시 제목과 미리보기 스니펫 모두 활용
-        text_for_keywords = article["제목"] + " " + article.get("내용", "") # '내용'이 이제 미리보기 스니펫
-        recent_keywords.update(extract_keywords_from_text(text_for_keywords)) # 함수명 변경 적용
-
-    past_keywords = Counter()
-    for article in past_articles:
-        # 트렌드 분석 시 제목과 미리보기 스니펫 모두 활용
-        text_for_keywords = article["제목"] + " " + article.get("내용", "") # '내용'이 이제 미리보기 스니펫
-        past_keywords.update(extract_keywords_from_text(text_for_keywords)) # 함수명 변경 적용
+    # 트렌드 분석 시 제목과 미리보기 스니펫 모두 활용 ('내용'이 미리보기 스니펫)
+    if approximate:
+        # 근사 모드: 1단계에서 크기가 제한된 Misra-Gries 요약으로 최근 기간 후보를 고르고,
+        # 2단계에서 후보 키워드만 최근/과거 빈도를 정확히 셈 (카운터 크기가 항상 max_candidates의 두 배 이하)
+        # 두 번 읽는 최근 기간 기사의 토큰화 결과만 보관하고, 한 번만 읽는 과거 기간 기사는 캐시에 넣지 않음
+        recent_cache = {} if token_cache is None else token_cache
+        summary = Counter()
+        for article in recent_articles:
+            summary.update(article_ngrams(article, ngram_range, recent_cache))
+            _misra_gries_prune(summary, max_candidates)
+        is_candidate = set(summary).__contains__
+        summary = None
+
+        recent_keywords = Counter()
+        for article in recent_articles:
+            recent_keywords.update(filter(is_candidate, article_ngrams(article, ngram_range, recent_cache)))
+        recent_cache = None
+
+        past_keywords = Counter()
+        for article in past_articles:
+            past_keywords.update(filter(is_candidate, article_ngrams(article, ngram_range, token_cache)))
+    else:
+        recent_keywords = Counter()
+        for article in recent_articles:
+            recent_keywords.update(article_ngrams(article, ngram_range, token_cache))
+
+        past_keywords = Counter()
+        for article in past_articles:
+            past_keywords.update(article_ngrams(article, ngram_range, token_cache))
 
     trending_keywords_list = [] # 리스트 형태로 변경
     for keyword, recent_freq in recent_keywords.items():
@@ -149,3 +519,65 @@ def analyze_keyword_trends(articles_metadata: list[dict], recent_days_period: in
     trending_keywords_list = sorted(trending_keywords_list, key=lambda x: x['recent_freq'], reverse=True)
 
     return trending_keywords_list
+
+
+def benchmark_trend_modes(article_count: int = 50_000, vocabulary_size: int = 20_000, total_days_period: int = 15, recent_days_period: int = 2,
+                          ngram_range: tuple[int, int] = DEFAULT_NGRAM_RANGE, max_candidates: int = 5000, surge_keywords: int = 20, seed: int = 0) -> dict:
+    """
+    정확 집계와 근사 집계(approximate=True)의 트렌드 분석 시간과 최대 메모리 사용량을 비교합니다.
+    합성 기사(Zipf 분포로 뽑은 명사 구간 + 최근 기간에만 자주 나오는 surge_keywords개 키워드)를 사용하며,
+    실제 실행처럼 token_cache 없이 토큰화부터 집계까지 전체를 측정합니다. (근사 모드가 내부에 보관하는 토큰화 결과도 메모리에 포함)
+    반환 값: {"articles", "exact_seconds", "approximate_seconds", "exact_peak_mb", "approximate_peak_mb", "same_top"}
+             (same_top: 최근 빈도 상위 surge_keywords개 트렌드 키워드와 빈도가 두 방식에서 같은지)
+    """
+    import tracemalloc
+
+    rng = random.Random(seed)
+    vocabulary = [chr(0xAC00 + rng.randrange(11172)) + chr(0xAC00 + rng.randrange(11172)) for _ in range(vocabulary_size)]
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, vocabulary_size + 1):
+        total += 1 / rank
+        cum_weights.append(total)
+
+    surging = [f"급증{i}" for i in range(surge_keywords)]
+
+    now = datetime.now()
+    articles = []
+    for i in range(article_count):
+        days_ago = rng.randrange(total_days_period)
+        segments = [rng.choices(vocabulary, cum_weights=cum_weights, k=rng.randint(1, 4)) for _ in range(6)]
+        if surging and rng.random() < (0.5 if days_ago < recent_days_period else 0.02):
+            segments.append([rng.choice(surging)])
+        text = ", ".join(" ".join(words) for words in segments) # 쉼표가 n-gram 구간 경계
+        articles.append({"제목": text, "내용": "", "링크": f"https://news.example.com/{i}", "날짜": now - timedelta(days=days_ago)})
+
+    def run(approximate):
+        return analyze_keyword_trends(articles, recent_days_period, total_days_period, ngram_range=ngram_range,
+                                      approximate=approximate, max_candidates=max_candidates)
+
+    results = {}
+    for mode, approximate in (("exact", False), ("approximate", True)):
+        started = time.perf_counter()
+        trends = run(approximate)
+        results[f"{mode}_seconds"] = time.perf_counter() - started
+        tracemalloc.start()
+        run(approximate)
+        results[f"{mode}_peak_mb"] = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+        ranked = sorted(trends, key=lambda kw: (-kw["recent_freq"], kw["keyword"]))[:surge_keywords] # 빈도가 같으면 키워드 순
+        results[f"{mode}_top"] = [(kw["keyword"], kw["recent_freq"], kw["past_freq"]) for kw in ranked]
+
+    return {
+        "articles": article_count,
+        "exact_seconds": results["exact_seconds"],
+        "approximate_seconds": results["approximate_seconds"],
+        "exact_peak_mb": results["exact_peak_mb"],
+        "approximate_peak_mb": results["approximate_peak_mb"],
+        "same_top": results["exact_top"] == results["approximate_top"]
+    }
+
+
+if __name__ == "__main__":
+    result = benchmark_tokenizer_throughput()
+    print(f"[{result['tokenizer']}] {result['articles']}개 기사 / {result['seconds']:.3f}초 = {result['articles_per_sec']:.0f} articles/sec")
@@ -0,0 +1,75 @@
+# modules/upload_ingestion.py
+# 업로드된 파일을 텍스트 추출 단계(document_extraction)에 넘기기 위해 준비합니다.
+# 이전에는 업로드 파일을 원래 이름 그대로 현재 작업 디렉터리에 저장했기 때문에, 같은 이름의 파일을 올린
+# 다른 사용자의 파일을 덮어쓰거나 처리 후에도 파일이 남았습니다.
+# 이제 메모리에서 바로 읽을 수 있는 형식(PDF, DOCX, TXT)의 작은 파일은 내용(bytes)을 그대로 넘기고,
+# 경로가 필요한 형식(PPTX)이나 큰 파일은 요청마다 따로 만든 임시 디렉터리에 써서 경로를 넘긴 뒤 처리가 끝나면 삭제합니다.
+# (SpooledTemporaryFile처럼 UPLOAD_SPOOL_MAX_MB까지는 메모리, 넘으면 디스크를 사용. 추출 프로세스로 보내는 내용의 크기를 제한함)
+# 환경 변수:
+#   UPLOAD_SPOOL_MAX_MB  메모리에서 바로 처리할 최대 파일 크기 (MB, 기본값 8)
+#   UPLOAD_TEMP_DIR      임시 파일을 만들 디렉터리 (기본값: 시스템 임시 디렉터리)
+
+import contextlib
+import os
+import shutil
+import tempfile
+from loguru import logger
+
+UPLOAD_SPOOL_MAX_MB = int(os.getenv("UPLOAD_SPOOL_MAX_MB", "8"))
+UPLOAD_TEMP_DIR = os.getenv("UPLOAD_TEMP_DIR") or None
+IN_MEMORY_EXTENSIONS = (".pdf", ".docx", ".txt") # document_extraction.load_file이 bytes로 읽을 수 있는 형식
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+def upload_size(uploaded_file) -> int:
+    """업로드 파일의 크기(바이트)를 내용을 복사하지 않고 구합니다."""
+    size = getattr(uploaded_file, "size", None) # Streamlit UploadedFile
+    if size is not None:
+        return size
+    return len(uploaded_file.getvalue())
+
+
+def _write_upload(uploaded_file, path: str):
+    """업로드 파일을 path에 씁니다. 파일 객체이면 COPY_BUFFER_SIZE 단위로 나눠 복사합니다."""
+    with open(path, "wb") as f:
+        if hasattr(uploaded_file, "read") and hasattr(uploaded_file, "seek"):
+            uploaded_file.seek(0)
+            shutil.copyfileobj(uploaded_file, f, COPY_BUFFER_SIZE)
+            uploaded_file.seek(0)
+        else:
+            f.write(uploaded_file.getvalue())
+
+
+@contextlib.contextmanager
+def stage_uploads(uploaded_files, spool_max_mb: int = UPLOAD_SPOOL_MAX_MB):
+    """
+    업로드 파일 목록을 [(파일 이름, 내용 bytes 또는 임시 파일 경로), ...]로 준비합니다. with 블록을 벗어나면 임시 파일을 모두 삭제합니다.
+    임시 파일은 호출마다 새로 만든 디렉터리에 "<순번><확장자>"로 저장하므로 같은 이름의 파일이 동시에 올라와도 겹치지 않습니다.
+    저장하지 못한 파일은 오류를 기록하고 목록에서 뺍니다.
+    """
+    max_bytes = spool_max_mb * 1024 * 1024
+    temp_dir = None
+    staged = []
+    try:
+        for number, uploaded_file in enumerate(uploaded_files):
+            file_name = uploaded_file.name
+            size = upload_size(uploaded_file)
+            if file_name.endswith(IN_MEMORY_EXTENSIONS) and size <= max_bytes:
+                staged.append((file_name, uploaded_file.getvalue()))
+                continue
+            try:
+                if temp_dir is None:
+                    temp_dir = tempfile.mkdtemp(prefix="upload_", dir=UPLOAD_TEMP_DIR)
+                path = os.path.join(temp_dir, f"{number:04d}{os.path.splitext(file_name)[1]}")
+                _write_upload(uploaded_file, path)
+            except OSError as e:
+                logger.error(f"업로드 파일을 임시 파일로 저장하지 못했습니다 ({file_name}): {e}")
+                continue
+            staged.append((file_name, path))
+        if staged:
+            in_memory = sum(isinstance(content, bytes) for _, content in staged)
+            logger.info(f"업로드 파일 준비: 메모리 {in_memory}개, 임시 파일 {len(staged) - in_memory}개")
+        yield staged
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
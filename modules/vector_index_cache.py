@@ -0,0 +1,156 @@
+# modules/vector_index_cache.py
+# 문서 처리 결과(분할된 문서 + FAISS 색인)를 디스크에 저장해 두고, 같은 문서를 다시 처리할 때 불러와 재사용합니다.
+# 캐시 키는 업로드 파일 내용의 해시 + 청크 분할 설정 + 임베딩 모델 설정으로 만들므로,
+# 다른 사용자가 같은 파일(예: 표준약관 PDF)을 올려도 분할/임베딩 없이 바로 색인을 불러옵니다.
+# 저장 위치: VECTOR_INDEX_CACHE_DIR/<캐시 키>/ (index.faiss, index.pkl, documents.json, meta.json)
+# 전체 크기(VECTOR_INDEX_CACHE_MAX_MB)나 개수(VECTOR_INDEX_CACHE_MAX_ENTRIES)를 넘으면 가장 오래 사용하지 않은 항목부터 삭제합니다.
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from loguru import logger
+
+VECTOR_INDEX_CACHE_DIR = os.getenv("VECTOR_INDEX_CACHE_DIR", "vector_index_cache")
+VECTOR_INDEX_CACHE_MAX_MB = int(os.getenv("VECTOR_INDEX_CACHE_MAX_MB", "2048"))
+VECTOR_INDEX_CACHE_MAX_ENTRIES = int(os.getenv("VECTOR_INDEX_CACHE_MAX_ENTRIES", "50"))
+META_FILE = "meta.json" # 수정 시각(mtime)을 마지막 사용 시각으로 사용 (LRU)
+DOCUMENTS_FILE = "documents.json"
+
+
+def hash_file_content(data: bytes) -> str:
+    """파일 내용의 SHA-256 해시를 반환합니다."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def make_cache_key(content_hashes: list[str], params: dict) -> str:
+    """
+    업로드 순서대로의 파일 내용 해시 목록과 처리 설정(청크 크기, 임베딩 모델 등)으로 캐시 키를 만듭니다.
+    설정이 하나라도 다르면 다른 색인이 만들어지므로 키도 달라집니다.
+    """
+    key_source = json.dumps({"files": content_hashes, "params": params}, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+
+
+def _entry_dir(key: str) -> str:
+    return os.path.join(VECTOR_INDEX_CACHE_DIR, key)
+
+
+def _dir_size(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+def contains(key: str) -> bool:
+    """캐시에 해당 키의 색인이 있는지 여부를 반환합니다. (불러오지 않고 확인만 함)"""
+    return os.path.exists(os.path.join(_entry_dir(key), META_FILE))
+
+
+def load(key: str, embeddings):
+    """
+    캐시된 (문서 목록, FAISS 색인)을 불러옵니다. 없거나 읽을 수 없으면 None을 반환합니다.
+    불러오는 데 성공하면 마지막 사용 시각을 갱신합니다.
+    """
+    entry_dir = _entry_dir(key)
+    if not os.path.exists(os.path.join(entry_dir, META_FILE)):
+        return None
+    try:
+        from langchain.schema import Document
+        from langchain.vectorstores import FAISS
+
+        try:
+            # index.pkl은 이 모듈이 직접 저장한 파일이므로 역직렬화를 허용
+            vectordb = FAISS.load_local(entry_dir, embeddings, allow_dangerous_deserialization=True)
+        except TypeError: # allow_dangerous_deserialization 인자가 없는 이전 langchain 버전
+            vectordb = FAISS.load_local(entry_dir, embeddings)
+        with open(os.path.join(entry_dir, DOCUMENTS_FILE), encoding="utf-8") as f:
+            docs = [Document(page_content=doc["page_content"], metadata=doc["metadata"]) for doc in json.load(f)]
+        os.utime(os.path.join(entry_dir, META_FILE))
+        return docs, vectordb
+    except Exception as e:
+        logger.warning(f"캐시된 문서 색인을 불러오지 못했습니다 ({key[:12]}): {e}. 새로 처리합니다.")
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return None
+
+
+def save(key: str, docs: list, vectordb, params: dict, file_names: list[str]):
+    """
+    문서 목록과 FAISS 색인을 캐시에 저장한 뒤 용량/개수 제한에 맞게 오래된 항목을 정리합니다.
+    임시 디렉터리에 먼저 쓰고 이름을 바꾸므로, 읽는 쪽에서 쓰다 만 색인을 보는 일이 없습니다.
+    """
+    entry_dir = _entry_dir(key)
+    if os.path.exists(entry_dir):
+        return
+    os.makedirs(VECTOR_INDEX_CACHE_DIR, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(prefix=".tmp_", dir=VECTOR_INDEX_CACHE_DIR)
+    try:
+        vectordb.save_local(temp_dir)
+        with open(os.path.join(temp_dir, DOCUMENTS_FILE), "w", encoding="utf-8") as f:
+            json.dump([{"page_content": doc.page_content, "metadata": doc.metadata} for doc in docs], f, ensure_ascii=False, default=str)
+        with open(os.path.join(temp_dir, META_FILE), "w", encoding="utf-8") as f:
+            json.dump({
+                "params": params,
+                "file_names": file_names,
+                "created_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+                "size_bytes": _dir_size(temp_dir)
+            }, f, ensure_ascii=False, indent=2)
+        os.rename(temp_dir, entry_dir)
+        logger.info(f"문서 색인을 캐시에 저장했습니다: {key[:12]} ({', '.join(file_names)})")
+    except OSError as e:
+        if os.path.exists(os.path.join(entry_dir, META_FILE)):
+            logger.info(f"같은 문서 색인이 이미 저장되어 있습니다: {key[:12]}") # 다른 세션/프로세스가 먼저 저장함
+        else:
+            logger.error(f"문서 색인 캐시 저장 실패 ({key[:12]}): {e}")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return
+    except Exception as e:
+        logger.error(f"문서 색인 캐시 저장 실패 ({key[:12]}): {e}")
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        return
+    evict()
+
+
+def list_entries() -> list[dict]:
+    """캐시 항목 목록을 마지막 사용 시각이 최근인 순으로 반환합니다."""
+    entries = []
+    if not os.path.isdir(VECTOR_INDEX_CACHE_DIR):
+        return entries
+    for key in os.listdir(VECTOR_INDEX_CACHE_DIR):
+        meta_path = os.path.join(VECTOR_INDEX_CACHE_DIR, key, META_FILE)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            last_used = os.path.getmtime(meta_path)
+        except (OSError, ValueError):
+            continue # 임시 디렉터리 또는 손상된 항목
+        entries.append({
+            "key": key,
+            "file_names": meta.get("file_names", []),
+            "created_at": meta.get("created_at"),
+            "last_used": last_used,
+            "size_bytes": meta.get("size_bytes", 0)
+        })
+    return sorted(entries, key=lambda entry: entry["last_used"], reverse=True)
+
+
+def evict(max_entries: int = VECTOR_INDEX_CACHE_MAX_ENTRIES, max_mb: int = VECTOR_INDEX_CACHE_MAX_MB) -> int:
+    """가장 오래 사용하지 않은 항목부터 삭제하여 개수/용량 제한을 맞추고, 삭제한 항목 수를 반환합니다."""
+    entries = list_entries()
+    max_bytes = max_mb * 1024 * 1024
+    total_bytes = sum(entry["size_bytes"] for entry in entries)
+    removed = 0
+    while entries and (len(entries) > max_entries or total_bytes > max_bytes):
+        oldest = entries.pop()
+        shutil.rmtree(_entry_dir(oldest["key"]), ignore_errors=True)
+        total_bytes -= oldest["size_bytes"]
+        removed += 1
+        logger.info(f"오래 사용하지 않은 문서 색인 캐시를 삭제했습니다: {oldest['key'][:12]} ({', '.join(oldest['file_names'])})")
+    return removed